@@ -13,6 +13,7 @@ Required files in OUTPUT_DIR:
 
 Outputs:
   jira-source-merged.json
+  jira-source-merged.jgraph
   itpt-links.csv
 USAGE
 }
@@ -27,13 +28,16 @@ EVALUATION_REPORT="${EVALUATION_REPORT:-0}"
 YEAR="${YEAR:-}"
 ROLE_MODE="${ROLE_MODE:-dev}"
 DEVSTATUS_CACHE="${DEVSTATUS_CACHE:-$OUTPUT_DIR/devstatus-cache.json}"
+DEVSTATUS_CONCURRENCY="${DEVSTATUS_CONCURRENCY:-8}"
 BASE_JSON="${OUTPUT_DIR}/jira-source.json"
 SUPP_JSON="${OUTPUT_DIR}/jira-source-supplement.json"
 MERGED_JSON="${OUTPUT_DIR}/jira-source-merged.json"
+MERGED_GRAPH="${OUTPUT_DIR}/jira-source-merged.jgraph"
 ROOTS_TXT="${OUTPUT_DIR}/roots.txt"
 CSV_OUT="${OUTPUT_DIR}/itpt-links.csv"
 
 MERGE_SCRIPT="${HOME}/.codex/skills/jira-source-export/scripts/jira-merge-source.py"
+GRAPH_SCRIPT="${HOME}/.codex/skills/jira-source-export/scripts/jira-compile-graph.py"
 TRAVERSE_SCRIPT="${HOME}/.codex/skills/jira-itpt-report/scripts/jira-traverse-root-itpt.py"
 
 for f in "$BASE_JSON" "$SUPP_JSON" "$ROOTS_TXT"; do
@@ -44,11 +48,12 @@ for f in "$BASE_JSON" "$SUPP_JSON" "$ROOTS_TXT"; do
 done
 
 python3 "$MERGE_SCRIPT" "$BASE_JSON" "$SUPP_JSON" "$MERGED_JSON"
+python3 "$GRAPH_SCRIPT" "$MERGED_JSON" "$MERGED_GRAPH"
 MERGE_START="${MERGE_START:-}"
 MERGE_END="${MERGE_END:-}"
 
 args=(
-  "$MERGED_JSON"
+  "$MERGED_GRAPH"
   --batch-file "$ROOTS_TXT"
   --csv-output "$CSV_OUT"
   --env-file "${ENV_FILE:-$HOME/.codex/jira_env}"
@@ -56,7 +61,7 @@ args=(
 )
 
 if [[ "$ROLE_MODE" == "dev" ]]; then
-  args+=(--include-master-merge --devstatus-cache "$DEVSTATUS_CACHE")
+  args+=(--include-master-merge --devstatus-cache "$DEVSTATUS_CACHE" --devstatus-concurrency "$DEVSTATUS_CONCURRENCY")
 fi
 
 if [[ "$ROLE_MODE" == "dev" && -n "$MERGE_START" ]]; then
@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import sys
 from pathlib import Path
 
+SHARED_SCRIPTS = Path(__file__).resolve().parents[2] / "jira-source-export" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
 
-def main():
+from jira_records import iter_issues
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Build root key list from Jira source JSON.")
     parser.add_argument("input_json")
     parser.add_argument("output_txt")
     parser.add_argument("--prefix", default="")
     parser.add_argument("--prefixes", default="")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    data = json.loads(Path(args.input_json).read_text(encoding="utf-8"))
+    data = iter_issues(args.input_json)
     prefixes = []
     if args.prefixes:
         prefixes = [p.strip() for p in args.prefixes.split(",") if p.strip()]
@@ -5,10 +5,13 @@ import csv
 import datetime as dt
 import json
 import os
-import urllib.error
-import urllib.parse
-import urllib.request
-import time
+import sys
+from pathlib import Path
+
+SHARED_SCRIPTS = Path(__file__).resolve().parents[2] / "jira-source-export" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
+
+from jira_http import request_json
 
 
 def load_env_file(path):
@@ -28,35 +31,6 @@ def load_env_file(path):
                 os.environ[env_key] = env_value
 
 
-def request_json(url, headers, params=None, data=None, timeout=30, max_retries=5, backoff=2.0):
-    if params:
-        url = url + "?" + urllib.parse.urlencode(params, doseq=True)
-    attempt = 0
-    delay = backoff
-    while True:
-        req = urllib.request.Request(url, headers=headers, data=data)
-        try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as err:
-            if err.code in (429, 503) and attempt < max_retries:
-                retry_after = err.headers.get("Retry-After")
-                sleep_for = float(retry_after) if retry_after else delay
-                time.sleep(sleep_for)
-                if not retry_after:
-                    delay *= 2
-                attempt += 1
-                continue
-            raise
-        except urllib.error.URLError:
-            if attempt < max_retries:
-                time.sleep(delay)
-                delay *= 2
-                attempt += 1
-                continue
-            raise
-
-
 def build_headers(base_url, email, token):
     auth = base64.b64encode(f"{email}:{token}".encode("utf-8")).decode("ascii")
     return {
@@ -163,7 +137,7 @@ def paginate_search(base_url, headers, jql, fields, max_results, max_pages, time
             break
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Export Jira issues to CSV seed.")
     parser.add_argument("--out", required=True)
     parser.add_argument("--env-file", required=True)
@@ -174,7 +148,7 @@ def main():
     parser.add_argument("--max-results", type=int, default=100)
     parser.add_argument("--max-pages", type=int, default=0)
     parser.add_argument("--timeout", type=int, default=30)
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     load_env_file(args.env_file)
     base_url = os.environ.get("JIRA_BASE_URL", "").rstrip("/")
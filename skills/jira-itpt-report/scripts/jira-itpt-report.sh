@@ -28,6 +28,13 @@ Optional env:
   YEAR            Year for month-based export (e.g. 2026)
   MONTH           Month for month-based export (1-12)
   WEEKLY_SPLIT    Split range into 7-day chunks (default: 1 for YEAR+MONTH, else 0)
+  WINDOW_PLAN     fixed (SPLIT_DAYS chunks) or density (windows sized by the export's own population:
+                  CSV seed keys, or an approximate count of the MATCH_MODE JQL) (default: fixed)
+  WINDOW_TARGET   Issues per window for WINDOW_PLAN=density (default: 400)
+  WINDOW_MAX_DAYS Longest merged window for WINDOW_PLAN=density (default: 31)
+  SHARED_SOURCE   Reuse jira-source.json/.jgraph/roots.txt from this dir instead of exporting
+  EXPORT_ONLY     Stop after building jira-source.json/.jgraph/roots.txt (default: 0)
+  EXPORT_JOURNAL  Resume an interrupted export from its journal on rerun (default: 1)
 USAGE
 }
 
@@ -56,6 +63,11 @@ CSV_SEED_JQL="${CSV_SEED_JQL:-}"
 DEVELOPMENT_FIELD_ID="${DEVELOPMENT_FIELD_ID:-}"
 CSV_SEED_SCRIPT="${HOME}/.codex/skills/jira-itpt-report/scripts/jira-seed-from-csv.py"
 CSV_EXPORT_SCRIPT="${HOME}/.codex/skills/jira-itpt-report/scripts/jira-export-csv-seed.py"
+PLAN_SCRIPT="${HOME}/.codex/skills/jira-itpt-report/scripts/jira-plan-windows.py"
+WINDOW_PLAN="${WINDOW_PLAN:-fixed}"
+SHARED_SOURCE="${SHARED_SOURCE:-}"
+EXPORT_ONLY="${EXPORT_ONLY:-0}"
+export EXPORT_JOURNAL="${EXPORT_JOURNAL:-1}"
 
 RANGE_START="${START_DATE:-}"
 RANGE_END="${END_DATE:-}"
@@ -98,6 +110,7 @@ fi
 
 
 SOURCE_JSON="${OUTPUT_DIR}/jira-source.json"
+SOURCE_GRAPH="${OUTPUT_DIR}/jira-source.jgraph"
 ROOTS_TXT="${OUTPUT_DIR}/roots.txt"
 MISSING_TXT="${OUTPUT_DIR}/missing-keys.txt"
 CSV_OUT="${OUTPUT_DIR}/itpt-links.csv"
@@ -106,6 +119,16 @@ OUTPUT_TIMESTAMP="${OUTPUT_TIMESTAMP:-1}"
 EXPORT_SCRIPT="${HOME}/.codex/skills/jira-source-export/scripts/jira-source-export-fast.py"
 TRAVERSE_SCRIPT="${HOME}/.codex/skills/jira-itpt-report/scripts/jira-traverse-root-itpt.py"
 ROOTS_SCRIPT="${HOME}/.codex/skills/jira-itpt-report/scripts/jira-build-roots.py"
+GRAPH_SCRIPT="${HOME}/.codex/skills/jira-source-export/scripts/jira-compile-graph.py"
+
+if [[ -n "$SHARED_SOURCE" ]]; then
+  for f in jira-source.json jira-source.jgraph roots.txt; do
+    if [[ ! -f "${SHARED_SOURCE}/${f}" ]]; then
+      echo "SHARED_SOURCE is missing $f: $SHARED_SOURCE" >&2
+      exit 1
+    fi
+  done
+fi
 
 if [[ -n "$CSV_SEED" && ! -f "$CSV_SEED" ]]; then
   echo "CSV_SEED not found: $CSV_SEED" >&2
@@ -125,10 +148,31 @@ elif [[ "$CSV_SEED_AUTO" == "1" ]]; then
   MATCH_MODE="assignee"
 fi
 
-if [[ "$WEEKLY_SPLIT" == "1" ]]; then
+MERGE_START="${MERGE_START:-$RANGE_START}"
+MERGE_END="${MERGE_END:-$RANGE_END}"
+DEVSTATUS_CACHE="${DEVSTATUS_CACHE:-$OUTPUT_DIR/devstatus-cache.json}"
+SEED_MERGE_DONE=0
+
+if [[ -n "$SHARED_SOURCE" ]]; then
+  cp "${SHARED_SOURCE}/jira-source.json" "$SOURCE_JSON"
+  cp "${SHARED_SOURCE}/jira-source.jgraph" "$SOURCE_GRAPH"
+  cp "${SHARED_SOURCE}/roots.txt" "$ROOTS_TXT"
+elif [[ "$WEEKLY_SPLIT" == "1" ]]; then
   SPLIT_DAYS="${SPLIT_DAYS:-7}"
   RANGES_FILE="${OUTPUT_DIR}/weekly-ranges.txt"
-  RANGE_START="$RANGE_START" RANGE_END="$RANGE_END" SPLIT_DAYS="$SPLIT_DAYS" python3 - <<'PY' > "$RANGES_FILE"
+  if [[ "$WINDOW_PLAN" == "density" ]]; then
+    PLAN_ARGS=(--start "$RANGE_START" --end "$RANGE_END" --out "$RANGES_FILE" --env-file "$ENV_FILE" --projects "$PROJECTS")
+    PLAN_ARGS+=(--target "${WINDOW_TARGET:-400}" --initial-days "$SPLIT_DAYS" --max-days "${WINDOW_MAX_DAYS:-31}")
+    PLAN_ARGS+=(--match-mode "$MATCH_MODE" --jql-extra "${JQL_EXTRA:-}" --comment-jql "${COMMENT_JQL:-}")
+    if [[ -n "${COMMENT_JQL_TEMPLATE:-}" ]]; then
+      PLAN_ARGS+=(--jql-template "$COMMENT_JQL_TEMPLATE")
+    fi
+    if [[ -n "$CSV_SEED" ]]; then
+      PLAN_ARGS+=(--seed-csv "$CSV_SEED" --seed-mode "$ROLE_MODE")
+    fi
+    python3 "$PLAN_SCRIPT" "${PLAN_ARGS[@]}"
+  else
+    RANGE_START="$RANGE_START" RANGE_END="$RANGE_END" SPLIT_DAYS="$SPLIT_DAYS" python3 - <<'PY' > "$RANGES_FILE"
 import datetime as dt
 import os
 
@@ -141,6 +185,16 @@ while cur < end:
   print(cur.strftime("%Y/%m/%d"), nxt.strftime("%Y/%m/%d"))
   cur = nxt
 PY
+  fi
+
+  if [[ -n "$CSV_SEED" ]]; then
+    PARTITION_ARGS=(--csv "$CSV_SEED" --projects "$PROJECTS" --mode "$ROLE_MODE" --ranges-file "$RANGES_FILE" --partition-dir "$OUTPUT_DIR")
+    if [[ "$ROLE_MODE" == "dev" ]]; then
+      PARTITION_ARGS+=(--start "$MERGE_START" --end "$MERGE_END" --out-keys "${OUTPUT_DIR}/seed-keys-merge.txt" --out-merge "$DEVSTATUS_CACHE")
+      SEED_MERGE_DONE=1
+    fi
+    python3 "$CSV_SEED_SCRIPT" "${PARTITION_ARGS[@]}"
+  fi
 
   WEEK_SOURCES=()
   PARALLEL_RANGES="${PARALLEL_RANGES:-1}"
@@ -151,12 +205,9 @@ PY
       WEEK_SOURCE="${WEEK_DIR}/jira-source.json"
       if [[ -n "$CSV_SEED" ]]; then
         WEEK_KEYS="${WEEK_DIR}/seed-keys.txt"
-        CSV_ARGS=(--csv "$CSV_SEED" --start "$WEEK_START" --end "$WEEK_END" --projects "$PROJECTS" --mode "$ROLE_MODE" --out-keys "$WEEK_KEYS")
-        python3 "$CSV_SEED_SCRIPT" "${CSV_ARGS[@]}"
         if [[ ! -s "$WEEK_KEYS" ]]; then
           echo "[]" > "$WEEK_SOURCE"
         else
-          ASSIGNEE_JQL="$(python3 -c "import sys; from pathlib import Path; keys=[line.strip() for line in Path(sys.argv[1]).read_text().splitlines() if line.strip()]; print(\"\" if not keys else \"key in (\" + \",\".join(keys) + \")\")" "$WEEK_KEYS")"
           ENV_FILE="$ENV_FILE" \
           START_DATE="$WEEK_START" END_DATE="$WEEK_END" \
           PROJECTS="$PROJECTS" MATCH_MODE="$MATCH_MODE" CONCURRENCY="$CONCURRENCY" \
@@ -166,7 +217,7 @@ PY
           COMMENT_JQL_TEMPLATE="${COMMENT_JQL_TEMPLATE:-}" \
           COMMENT_JQL="${COMMENT_JQL:-}" \
           COMMENT_MATCH="${COMMENT_MATCH:-}" \
-          ASSIGNEE_JQL="$ASSIGNEE_JQL" \
+          SEED_KEYS_FILE="$WEEK_KEYS" \
           python3 "$EXPORT_SCRIPT" "$WEEK_SOURCE"
         fi
       else
@@ -188,7 +239,7 @@ PY
     export OUTPUT_DIR ENV_FILE PROJECTS MATCH_MODE CONCURRENCY MAX_PAGES MAX_RESULTS
     export NO_DATE_FILTER COMMENT_AUTHOR_DISPLAY COMMENT_JQL_TEMPLATE COMMENT_JQL
     export COMMENT_MATCH ASSIGNEE_JQL EXPORT_SCRIPT
-    export CSV_SEED CSV_SEED_SCRIPT ROLE_MODE
+    export CSV_SEED ROLE_MODE
     while read -r WEEK_START WEEK_END; do
       WEEK_SOURCES+=("${OUTPUT_DIR}/week-${WEEK_START//\//}-${WEEK_END//\//}/jira-source.json")
     done < "$RANGES_FILE"
@@ -206,13 +257,10 @@ PY
       fi
       if [[ -n "$CSV_SEED" ]]; then
         WEEK_KEYS="${WEEK_DIR}/seed-keys.txt"
-        CSV_ARGS=(--csv "$CSV_SEED" --start "$WEEK_START" --end "$WEEK_END" --projects "$PROJECTS" --mode "$ROLE_MODE" --out-keys "$WEEK_KEYS")
-        python3 "$CSV_SEED_SCRIPT" "${CSV_ARGS[@]}"
         if [[ ! -s "$WEEK_KEYS" ]]; then
           echo "[]" > "$WEEK_SOURCE"
           exit 0
         fi
-        ASSIGNEE_JQL="$(python3 -c "import sys; from pathlib import Path; keys=[line.strip() for line in Path(sys.argv[1]).read_text().splitlines() if line.strip()]; print(\"\" if not keys else \"key in (\" + \",\".join(keys) + \")\")" "$WEEK_KEYS")"
         ENV_FILE="$ENV_FILE" \
         START_DATE="$WEEK_START" END_DATE="$WEEK_END" \
         PROJECTS="$PROJECTS" MATCH_MODE="$MATCH_MODE" CONCURRENCY="$CONCURRENCY" \
@@ -222,7 +270,7 @@ PY
         COMMENT_JQL_TEMPLATE="$COMMENT_JQL_TEMPLATE" \
         COMMENT_JQL="$COMMENT_JQL" \
         COMMENT_MATCH="$COMMENT_MATCH" \
-        ASSIGNEE_JQL="$ASSIGNEE_JQL" \
+        SEED_KEYS_FILE="$WEEK_KEYS" \
         python3 "$EXPORT_SCRIPT" "$WEEK_SOURCE"
       else
         ENV_FILE="$ENV_FILE" \
@@ -241,41 +289,13 @@ PY
   fi
 
   python3 - "$SOURCE_JSON" "${WEEK_SOURCES[@]}" <<'PY'
-import json
+import os
 import sys
 
-out = sys.argv[1]
-paths = sys.argv[2:]
-by_key = {}
-
-def merge_issue(dst, src):
-  for k, v in src.items():
-    if k not in dst or dst[k] in (None, "", [], {}):
-      dst[k] = v
-  if "issuelinks" in src:
-    dst_links = dst.get("issuelinks") or []
-    seen = {(l.get("issue_key"), l.get("type"), l.get("inward"), l.get("outward")) for l in dst_links}
-    for l in src.get("issuelinks") or []:
-      sig = (l.get("issue_key"), l.get("type"), l.get("inward"), l.get("outward"))
-      if sig not in seen:
-        dst_links.append(l)
-        seen.add(sig)
-    dst["issuelinks"] = dst_links
-
-for path in paths:
-  with open(path, "r", encoding="utf-8") as f:
-    data = json.load(f)
-  for issue in data:
-    key = issue.get("issue_key")
-    if not key:
-      continue
-    if key not in by_key:
-      by_key[key] = issue
-    else:
-      merge_issue(by_key[key], issue)
-
-with open(out, "w", encoding="utf-8") as f:
-  json.dump(list(by_key.values()), f, ensure_ascii=False, indent=2)
+sys.path.insert(0, os.path.expanduser("~/.codex/skills/jira-source-export/scripts"))
+from jira_merge import merge_sources
+
+merge_sources(sys.argv[1], sys.argv[2:])
 PY
 else
   if [[ -n "$CSV_SEED" ]]; then
@@ -285,14 +305,13 @@ else
     if [[ ! -s "$SEED_KEYS" ]]; then
       echo "[]" > "$SOURCE_JSON"
     else
-      ASSIGNEE_JQL="$(python3 -c "import sys; from pathlib import Path; keys=[line.strip() for line in Path(sys.argv[1]).read_text().splitlines() if line.strip()]; print(\"\" if not keys else \"key in (\" + \",\".join(keys) + \")\")" "$SEED_KEYS")"
       ENV_FILE="$ENV_FILE" \
       START_DATE="$RANGE_START" END_DATE="$RANGE_END" \
       PROJECTS="$PROJECTS" MATCH_MODE="$MATCH_MODE" CONCURRENCY="$CONCURRENCY" \
       MAX_PAGES="$MAX_PAGES" MAX_RESULTS="$MAX_RESULTS" \
       NO_DATE_FILTER="$NO_DATE_FILTER" \
       COMMENT_AUTHOR_DISPLAY="$COMMENT_AUTHOR_DISPLAY" \
-      ASSIGNEE_JQL="$ASSIGNEE_JQL" \
+      SEED_KEYS_FILE="$SEED_KEYS" \
       python3 "$EXPORT_SCRIPT" "$SOURCE_JSON"
     fi
   else
@@ -306,13 +325,19 @@ else
   fi
 fi
 
-ROOT_PREFIXES="${ROOT_PREFIXES:-MGTT-,ITPT-}"
-python3 "$ROOTS_SCRIPT" "$SOURCE_JSON" "$ROOTS_TXT" --prefixes "$ROOT_PREFIXES"
+if [[ -z "$SHARED_SOURCE" ]]; then
+  ROOT_PREFIXES="${ROOT_PREFIXES:-MGTT-,ITPT-}"
+  python3 "$ROOTS_SCRIPT" "$SOURCE_JSON" "$ROOTS_TXT" --prefixes "$ROOT_PREFIXES"
+  python3 "$GRAPH_SCRIPT" "$SOURCE_JSON" "$SOURCE_GRAPH"
+fi
+
+if [[ "$EXPORT_ONLY" == "1" ]]; then
+  echo "Source exported: $SOURCE_JSON"
+  exit 0
+fi
 
-MERGE_START="${MERGE_START:-$RANGE_START}"
-MERGE_END="${MERGE_END:-$RANGE_END}"
-DEVSTATUS_CACHE="${DEVSTATUS_CACHE:-$OUTPUT_DIR/devstatus-cache.json}"
-if [[ -n "$CSV_SEED" && "$ROLE_MODE" == "dev" ]]; then
+DEVSTATUS_CONCURRENCY="${DEVSTATUS_CONCURRENCY:-8}"
+if [[ -n "$CSV_SEED" && "$ROLE_MODE" == "dev" && "$SEED_MERGE_DONE" != "1" ]]; then
   CSV_MERGE_KEYS="${OUTPUT_DIR}/seed-keys-merge.txt"
   python3 "$CSV_SEED_SCRIPT" \
     --csv "$CSV_SEED" \
@@ -325,7 +350,7 @@ if [[ -n "$CSV_SEED" && "$ROLE_MODE" == "dev" ]]; then
 fi
 
 TRAVERSE_ARGS=(
-  "$SOURCE_JSON"
+  "$SOURCE_GRAPH"
   --batch-file "$ROOTS_TXT"
   --max-depth "$MAX_DEPTH"
   --csv-output "$CSV_OUT"
@@ -338,7 +363,7 @@ if [[ "$ROLE_MODE" == "dev" ]]; then
   if [[ -n "$CSV_SEED" ]]; then
     TRAVERSE_ARGS+=(--merge-map "$DEVSTATUS_CACHE")
   else
-    TRAVERSE_ARGS+=(--devstatus-cache "$DEVSTATUS_CACHE")
+    TRAVERSE_ARGS+=(--devstatus-cache "$DEVSTATUS_CACHE" --devstatus-concurrency "$DEVSTATUS_CONCURRENCY")
   fi
 fi
 
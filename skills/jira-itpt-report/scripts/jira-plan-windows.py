@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import datetime as dt
+import importlib.util
+import json
+import os
+import sys
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SHARED_SCRIPTS = Path(__file__).resolve().parents[2] / "jira-source-export" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
+
+from jira_http import request_json
+from jira_jql import combine_jql, match_jql
+
+SEED_SCRIPT = Path(__file__).resolve().parent / "jira-seed-from-csv.py"
+
+
+def load_env_file(path):
+    if not path:
+        return
+    if not os.path.exists(path):
+        raise SystemExit(f"ENV_FILE not found: {path}")
+    with open(path, "r", encoding="utf-8") as handle:
+        for raw_line in handle:
+            line = raw_line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            env_key = key.strip()
+            env_value = value.strip().strip('"').strip("'")
+            if env_key and env_key not in os.environ:
+                os.environ[env_key] = env_value
+
+
+def build_headers(email, token):
+    auth = base64.b64encode(f"{email}:{token}".encode("utf-8")).decode("ascii")
+    return {
+        "Authorization": f"Basic {auth}",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+
+
+def parse_date(value):
+    return dt.datetime.strptime(value, "%Y/%m/%d").date()
+
+
+def format_date(value):
+    return value.strftime("%Y/%m/%d")
+
+
+def fixed_windows(start, end, days):
+    windows = []
+    cur = start
+    while cur < end:
+        nxt = min(cur + dt.timedelta(days=days), end)
+        windows.append((cur, nxt))
+        cur = nxt
+    return windows
+
+
+def window_days(window):
+    return (window[1] - window[0]).days
+
+
+def bisect(window):
+    mid = window[0] + dt.timedelta(days=window_days(window) // 2)
+    return [(window[0], mid), (mid, window[1])]
+
+
+def load_seed_module():
+    spec = importlib.util.spec_from_file_location("jira_seed_from_csv", SEED_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def population_jql(args, window):
+    comment_jql, assignee_jql = match_jql(
+        format_date(window[0]),
+        format_date(window[1]),
+        args.account_id,
+        args.projects,
+        args.jql_extra,
+        args.comment_jql,
+        args.jql_template,
+    )
+    if args.match_mode == "assignee":
+        return assignee_jql
+    if args.match_mode == "comment":
+        return comment_jql
+    operator = "OR" if args.match_mode == "any" else "AND"
+    return combine_jql(comment_jql, assignee_jql, operator) or comment_jql
+
+
+class WindowCounter:
+    def __init__(self, base_url, headers, jql, timeout, pool):
+        self.url = f"{base_url}/rest/api/3/search/approximate-count"
+        self.headers = headers
+        self.jql = jql
+        self.timeout = timeout
+        self.pool = pool
+        self.counts = {}
+
+    def count_one(self, window):
+        payload = json.dumps({"jql": self.jql(window)}).encode("utf-8")
+        data = request_json(self.url, self.headers, data=payload, timeout=self.timeout)
+        return int(data.get("count") or 0)
+
+    def count(self, windows):
+        pending = [w for w in dict.fromkeys(windows) if w not in self.counts]
+        for window, value in zip(pending, self.pool.map(self.count_one, pending)):
+            self.counts[window] = value
+        return [self.counts[w] for w in windows]
+
+
+class SeedCounter:
+    def __init__(self, csv_path, mode, projects):
+        seed = load_seed_module()
+        project_filter = {p.strip() for p in projects.split(",") if p.strip()}
+        self.days = {}
+        for issue_key, day, _ in seed.iter_seed_rows(Path(csv_path), mode, project_filter):
+            self.days.setdefault(day, set()).add(issue_key)
+        self.counts = {}
+
+    def count_one(self, window):
+        keys = set()
+        for day, day_keys in self.days.items():
+            if window[0] <= day < window[1]:
+                keys |= day_keys
+        return len(keys)
+
+    def count(self, windows):
+        for window in windows:
+            if window not in self.counts:
+                self.counts[window] = self.count_one(window)
+        return [self.counts[w] for w in windows]
+
+
+def refine(counter, windows, target):
+    counter.count(windows)
+    while True:
+        dense = [w for w in windows if counter.counts[w] > target and window_days(w) > 1]
+        if not dense:
+            return windows
+        dense = set(dense)
+        refined = []
+        for window in windows:
+            refined.extend(bisect(window) if window in dense else [window])
+        windows = refined
+        counter.count(windows)
+
+
+def merge_sparse(windows, counts, target, max_days, count_union=None):
+    # Without count_union the merged count is the sum of the parts, an upper
+    # bound when one issue can match several windows (assignee WAS ... DURING).
+    plan = []
+    for window in windows:
+        count = counts[window]
+        if plan:
+            last, last_count = plan[-1]
+            merged = (last[0], window[1])
+            if (merged[1] - merged[0]).days <= max_days:
+                merged_count = last_count + count
+                if merged_count > target and count_union:
+                    merged_count = count_union(merged)
+                if merged_count <= target:
+                    plan[-1] = (merged, merged_count)
+                    continue
+        plan.append((window, count))
+    return plan
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Plan export windows with roughly equal issue volume."
+    )
+    parser.add_argument("--start", required=True, help="YYYY/MM/DD (inclusive)")
+    parser.add_argument("--end", required=True, help="YYYY/MM/DD (exclusive)")
+    parser.add_argument("--out", required=True, help="Ranges file (START END per line)")
+    parser.add_argument("--env-file", required=True)
+    parser.add_argument("--projects", default="")
+    parser.add_argument("--jql-template", default="", help="JQL with {start_date}/{end_date}")
+    parser.add_argument("--jql-extra", default="")
+    parser.add_argument("--comment-jql", default="", help="COMMENT_JQL override of the export")
+    parser.add_argument(
+        "--match-mode", choices=["any", "comment", "assignee", "both"], default="any"
+    )
+    parser.add_argument("--account-id", default="", help="Default: JIRA_ACCOUNT_ID or currentUser()")
+    parser.add_argument("--seed-csv", default="", help="Count seed keys from this CSV instead of Jira")
+    parser.add_argument("--seed-mode", choices=["dev", "plan_qa"], default="dev")
+    parser.add_argument("--target", type=int, default=400, help="Issues per window")
+    parser.add_argument("--initial-days", type=int, default=7)
+    parser.add_argument("--max-days", type=int, default=31)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    load_env_file(args.env_file)
+    start = parse_date(args.start)
+    end = parse_date(args.end)
+    initial = fixed_windows(start, end, max(1, args.initial_days))
+
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        if args.seed_csv:
+            counter = SeedCounter(args.seed_csv, args.seed_mode, args.projects)
+        else:
+            base_url = os.environ.get("JIRA_BASE_URL", "").rstrip("/")
+            email = os.environ.get("JIRA_EMAIL", "")
+            token = os.environ.get("JIRA_API_TOKEN", "")
+            if not base_url or not email or not token:
+                raise SystemExit("Missing JIRA_* env for window planning.")
+            args.account_id = args.account_id or os.environ.get("JIRA_ACCOUNT_ID", "")
+            counter = WindowCounter(
+                base_url,
+                build_headers(email, token),
+                lambda window: population_jql(args, window),
+                args.timeout,
+                pool,
+            )
+        try:
+            windows = refine(counter, initial, max(1, args.target))
+        except urllib.error.HTTPError as err:
+            if err.code not in (400, 404, 405):
+                raise
+            print(
+                f"approximate-count unavailable (HTTP {err.code}); using fixed {args.initial_days}-day windows",
+                file=sys.stderr,
+            )
+            plan = [(window, None) for window in initial]
+        else:
+            plan = merge_sparse(
+                windows,
+                counter.counts,
+                max(1, args.target),
+                max(1, args.max_days),
+                counter.count_one if args.seed_csv else None,
+            )
+
+    with open(args.out, "w", encoding="utf-8") as handle:
+        for window, _ in plan:
+            handle.write(f"{format_date(window[0])} {format_date(window[1])}\n")
+
+    counts = [count for _, count in plan if count is not None]
+    if counts:
+        print(
+            f"window plan: {len(plan)} windows (was {len(initial)} fixed), "
+            f"{min(counts)}-{max(counts)} issues each, {len(counter.counts)} count queries"
+        )
+    for window, count in plan:
+        label = "?" if count is None else count
+        print(f"  {format_date(window[0])} {format_date(window[1])} {label}")
+
+
+if __name__ == "__main__":
+    main()
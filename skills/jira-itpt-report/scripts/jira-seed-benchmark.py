@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import importlib.util
+import json
+import random
+import time
+from pathlib import Path
+
+SEED_SCRIPT = Path(__file__).resolve().parent / "jira-seed-from-csv.py"
+DEV_COLUMNS = [
+    "\uc0ac\uc6a9\uc790\uc815\uc758 \ud544\ub4dc (development)",
+    "Custom field (development)",
+    "Development",
+]
+
+
+def load_seed_module():
+    spec = importlib.util.spec_from_file_location("jira_seed_from_csv", SEED_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_extract_json_blob(raw):
+    if not raw:
+        return None
+    text = raw.strip()
+    if not text:
+        return None
+    idx = text.find("json=")
+    if idx == -1:
+        if text.startswith("{") and "cachedValue" in text:
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError:
+                return None
+        return None
+    start = text.find("{", idx)
+    if start == -1:
+        return None
+    depth = 0
+    end = None
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                end = i + 1
+                break
+    if end is None:
+        return None
+    try:
+        return json.loads(text[start:end])
+    except json.JSONDecodeError:
+        return None
+
+
+def legacy_extract_merge_last_updated(dev_field):
+    data = legacy_extract_json_blob(dev_field)
+    if not data:
+        return ""
+    overall = (
+        data.get("cachedValue", {})
+        .get("summary", {})
+        .get("pullrequest", {})
+        .get("overall", {})
+    )
+    if (overall.get("state") or "").upper() != "MERGED":
+        return ""
+    return overall.get("lastUpdated") or ""
+
+
+def synthetic_field(rng):
+    roll = rng.random()
+    if roll < 0.3:
+        return ""
+    if roll < 0.4:
+        return "{}"
+    state = "MERGED" if roll < 0.8 else rng.choice(["OPEN", "DECLINED"])
+    updated = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00.000+0000"
+    payload = {
+        "cachedValue": {
+            "errors": [],
+            "summary": {
+                "pullrequest": {
+                    "overall": {
+                        "count": 1,
+                        "lastUpdated": updated,
+                        "stateCount": 1,
+                        "state": state,
+                        "dataType": "pullrequest",
+                        "open": state == "OPEN",
+                    },
+                    "byInstanceType": {},
+                },
+                "repository": {
+                    "overall": {"count": rng.randint(1, 20), "dataType": "repository"},
+                    "byInstanceType": {},
+                },
+            },
+        },
+        "isStale": False,
+    }
+    return (
+        f"{{pullrequest={{dataType=pullrequest, state={state}, stateCount=1}}, "
+        f"json={json.dumps(payload, separators=(',', ':'))}}}"
+    )
+
+
+def read_fields(csv_path):
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as handle:
+        reader = csv.DictReader(handle)
+        dev_col = next((name for name in DEV_COLUMNS if name in (reader.fieldnames or [])), "")
+        if not dev_col:
+            raise SystemExit("Missing development column in CSV.")
+        return [row.get(dev_col, "") for row in reader]
+
+
+def measure(func, fields, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [func(field) for field in fields]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare development-field parsing speed (legacy brace scan vs raw_decode)."
+    )
+    parser.add_argument("--csv", default="", help="Jira CSV export (default: synthetic rows)")
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic row count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.csv:
+        fields = read_fields(args.csv)
+    else:
+        rng = random.Random(args.seed)
+        fields = [synthetic_field(rng) for _ in range(args.rows)]
+    if not fields:
+        raise SystemExit("No rows to benchmark.")
+
+    seed = load_seed_module()
+    legacy, legacy_time = measure(legacy_extract_merge_last_updated, fields, args.repeat)
+    current, current_time = measure(seed.extract_merge_last_updated, fields, args.repeat)
+    if legacy != current:
+        mismatched = sum(1 for a, b in zip(legacy, current) if a != b)
+        raise SystemExit(f"Parsers disagree on {mismatched} rows.")
+
+    merged = sum(1 for value in current if value)
+    print(f"rows: {len(fields)} ({merged} merged)")
+    print(f"legacy brace scan: {len(fields) / legacy_time:,.0f} rows/s")
+    print(f"raw_decode + fast path: {len(fields) / current_time:,.0f} rows/s")
+    print(f"speedup: {legacy_time / current_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
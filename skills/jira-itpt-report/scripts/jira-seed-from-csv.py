@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 import argparse
+import bisect
 import csv
 import datetime as dt
 import json
 from pathlib import Path
 
+JSON_DECODER = json.JSONDecoder()
+
 
 def parse_date(value):
     if not value:
@@ -60,26 +63,16 @@ def extract_json_blob(raw):
     start = text.find("{", idx)
     if start == -1:
         return None
-    depth = 0
-    end = None
-    for i in range(start, len(text)):
-        if text[i] == "{":
-            depth += 1
-        elif text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                end = i + 1
-                break
-    if end is None:
-        return None
-    blob = text[start:end]
     try:
-        return json.loads(blob)
+        data, _ = JSON_DECODER.raw_decode(text, start)
     except json.JSONDecodeError:
         return None
+    return data
 
 
 def extract_merge_last_updated(dev_field):
+    if not dev_field or "merged" not in dev_field.lower() or "pullrequest" not in dev_field:
+        return ""
     data = extract_json_blob(dev_field)
     if not data:
         return ""
@@ -102,29 +95,7 @@ def pick_column(fieldnames, candidates):
     return ""
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Filter Jira CSV by date and emit key list.")
-    parser.add_argument("--csv", required=True, help="Jira CSV export path")
-    parser.add_argument("--start", required=True, help="YYYY/MM/DD inclusive")
-    parser.add_argument("--end", required=True, help="YYYY/MM/DD exclusive")
-    parser.add_argument("--projects", default="", help="Comma-separated project keys")
-    parser.add_argument("--mode", choices=["dev", "plan_qa"], default="dev")
-    parser.add_argument("--out-keys", required=True)
-    parser.add_argument("--out-merge", default="")
-    args = parser.parse_args()
-
-    start_date = dt.datetime.strptime(args.start, "%Y/%m/%d").date()
-    end_date = dt.datetime.strptime(args.end, "%Y/%m/%d").date()
-    project_filter = {p.strip() for p in args.projects.split(",") if p.strip()}
-
-    csv_path = Path(args.csv)
-    if not csv_path.exists():
-        raise SystemExit(f"CSV not found: {csv_path}")
-
-    keys = []
-    seen = set()
-    merge_map = {}
-
+def iter_seed_rows(csv_path, mode, project_filter):
     with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
         reader = csv.DictReader(handle)
         if not reader.fieldnames:
@@ -144,7 +115,7 @@ def main():
 
         if not key_col:
             raise SystemExit("Missing issue key column in CSV.")
-        if args.mode == "dev" and not dev_col:
+        if mode == "dev" and not dev_col:
             raise SystemExit("Missing development column for dev mode.")
 
         for row in reader:
@@ -155,39 +126,131 @@ def main():
             if project_filter and project_key and project_key not in project_filter:
                 continue
 
-            if args.mode == "dev":
+            if mode == "dev":
                 last_updated = extract_merge_last_updated(row.get(dev_col, ""))
                 if not last_updated:
                     continue
                 merge_dt = parse_iso(last_updated)
                 if not merge_dt:
                     continue
-                merge_date = merge_dt.date()
-                if not (start_date <= merge_date < end_date):
-                    continue
-                if issue_key not in seen:
-                    keys.append(issue_key)
-                    seen.add(issue_key)
-                merge_map[issue_key] = last_updated
+                yield issue_key, merge_dt.date(), last_updated
             else:
                 updated_val = row.get(updated_col, "") if updated_col else ""
                 created_val = row.get(created_col, "") if created_col else ""
                 candidate_dt = parse_date(updated_val) or parse_date(created_val)
                 if not candidate_dt:
                     continue
-                day = candidate_dt.date()
-                if not (start_date <= day < end_date):
-                    continue
-                if issue_key not in seen:
-                    keys.append(issue_key)
-                    seen.add(issue_key)
-
-    Path(args.out_keys).write_text("\n".join(keys) + ("\n" if keys else ""), encoding="utf-8")
-    if args.out_merge:
-        Path(args.out_merge).write_text(
-            json.dumps(merge_map, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+                yield issue_key, candidate_dt.date(), ""
+
+
+class SeedWindow:
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.keys = []
+        self.seen = set()
+        self.merge_map = {}
+
+    def add(self, issue_key, last_updated):
+        if issue_key not in self.seen:
+            self.keys.append(issue_key)
+            self.seen.add(issue_key)
+        if last_updated:
+            self.merge_map[issue_key] = last_updated
+
+    def write(self, out_keys, out_merge=""):
+        Path(out_keys).write_text(
+            "\n".join(self.keys) + ("\n" if self.keys else ""), encoding="utf-8"
         )
+        if out_merge:
+            Path(out_merge).write_text(
+                json.dumps(self.merge_map, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+
+
+def read_ranges(path):
+    windows = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        windows.append(
+            SeedWindow(
+                dt.datetime.strptime(parts[0], "%Y/%m/%d").date(),
+                dt.datetime.strptime(parts[1], "%Y/%m/%d").date(),
+            )
+        )
+    windows.sort(key=lambda window: window.start_date)
+    return windows
+
+
+def window_for(windows, starts, day):
+    idx = bisect.bisect_right(starts, day) - 1
+    if idx >= 0 and day < windows[idx].end_date:
+        return windows[idx]
+    return None
+
+
+def window_dir(partition_dir, window):
+    start = window.start_date.strftime("%Y%m%d")
+    end = window.end_date.strftime("%Y%m%d")
+    return Path(partition_dir) / f"week-{start}-{end}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filter Jira CSV by date and emit key list.")
+    parser.add_argument("--csv", required=True, help="Jira CSV export path")
+    parser.add_argument("--start", default="", help="YYYY/MM/DD inclusive")
+    parser.add_argument("--end", default="", help="YYYY/MM/DD exclusive")
+    parser.add_argument("--projects", default="", help="Comma-separated project keys")
+    parser.add_argument("--mode", choices=["dev", "plan_qa"], default="dev")
+    parser.add_argument("--out-keys", default="")
+    parser.add_argument("--out-merge", default="")
+    parser.add_argument("--ranges-file", default="", help="START END per line; partition in one pass")
+    parser.add_argument(
+        "--partition-dir",
+        default="",
+        help="Write week-YYYYMMDD-YYYYMMDD/seed-keys.txt per range",
+    )
+    args = parser.parse_args(argv)
+
+    if bool(args.ranges_file) != bool(args.partition_dir):
+        raise SystemExit("--ranges-file and --partition-dir must be used together.")
+    single = None
+    if args.start or args.end or args.out_keys:
+        if not (args.start and args.end and args.out_keys):
+            raise SystemExit("--start, --end and --out-keys must be used together.")
+        single = SeedWindow(
+            dt.datetime.strptime(args.start, "%Y/%m/%d").date(),
+            dt.datetime.strptime(args.end, "%Y/%m/%d").date(),
+        )
+    elif not args.ranges_file:
+        raise SystemExit("Provide --start/--end/--out-keys or --ranges-file/--partition-dir.")
+    project_filter = {p.strip() for p in args.projects.split(",") if p.strip()}
+
+    csv_path = Path(args.csv)
+    if not csv_path.exists():
+        raise SystemExit(f"CSV not found: {csv_path}")
+
+    windows = read_ranges(args.ranges_file) if args.ranges_file else []
+    starts = [window.start_date for window in windows]
+
+    for issue_key, day, last_updated in iter_seed_rows(csv_path, args.mode, project_filter):
+        if single is not None and single.start_date <= day < single.end_date:
+            single.add(issue_key, last_updated)
+        window = window_for(windows, starts, day)
+        if window is not None:
+            window.add(issue_key, "")
+
+    if single is not None:
+        single.write(args.out_keys, args.out_merge)
+    for window in windows:
+        out_dir = window_dir(args.partition_dir, window)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        window.write(out_dir / "seed-keys.txt")
+    if windows:
+        print(f"seed partition: {len(windows)} windows, {sum(len(w.keys) for w in windows)} keys")
 
 
 if __name__ == "__main__":
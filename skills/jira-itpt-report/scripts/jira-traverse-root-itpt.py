@@ -3,23 +3,24 @@ import argparse
 import base64
 import csv
 import datetime as dt
+import fcntl
 import json
 import os
-import time
+import sys
+import threading
+import urllib.error
 import urllib.parse
-import urllib.request
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+SHARED_SCRIPTS = Path(__file__).resolve().parents[2] / "jira-source-export" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
 
-def load_data(path):
-    with open(path, "r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    index = {}
-    for item in data:
-        key = item.get("issue_key")
-        if key:
-            index[key] = item
-    return index
+from jira_graph import load_graph
+from jira_http import request_json
+
+DEFAULT_ISSUE_ID_CACHE = "~/.codex/cache/jira-issue-ids.json"
 
 
 def load_cache(path):
@@ -38,12 +39,43 @@ def load_cache(path):
 def save_cache(path, cache):
     if not path:
         return
-    tmp_path = path + ".tmp"
+    # Quarters of a shared yearly run save the same cache from parallel stages.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     with open(tmp_path, "w", encoding="utf-8") as handle:
         json.dump(cache, handle, ensure_ascii=False, indent=2)
     os.replace(tmp_path, path)
 
 
+def load_issue_id_cache(path, base_url):
+    data = load_cache(path)
+    scoped = data.get(base_url)
+    return dict(scoped) if isinstance(scoped, dict) else {}
+
+
+def save_issue_id_cache(path, base_url, ids):
+    ids = {key: value for key, value in ids.items() if value}
+    if not path or not ids:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a", encoding="utf-8") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = load_cache(path)
+            scoped = data.get(base_url)
+            if not isinstance(scoped, dict):
+                scoped = {}
+            if all(scoped.get(key) == value for key, value in ids.items()):
+                return
+            scoped.update(ids)
+            data[base_url] = scoped
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
 def load_env_file(path):
     if not path:
         return
@@ -61,56 +93,57 @@ def load_env_file(path):
                 os.environ[env_key] = env_value
 
 
-def request_json(url, headers, timeout, max_retries=5, backoff=2.0):
-    attempt = 0
-    delay = backoff
-    while True:
-        req = urllib.request.Request(url, headers=headers)
-        try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as err:
-            if err.code in (429, 503) and attempt < max_retries:
-                retry_after = err.headers.get("Retry-After")
-                sleep_for = float(retry_after) if retry_after else delay
-                time.sleep(sleep_for)
-                if not retry_after:
-                    delay *= 2
-                attempt += 1
-                continue
-            raise
-        except urllib.error.URLError:
-            if attempt < max_retries:
-                time.sleep(delay)
-                delay *= 2
-                attempt += 1
-                continue
-            raise
-
-
-def neighbors(issue):
-    rels = []
-    parent = issue.get("parent_key")
-    if parent:
-        rels.append((parent, "parent"))
-    for link in issue.get("issuelinks", []) or []:
-        link_key = link.get("issue_key")
-        if link_key:
-            rels.append((link_key, "relates"))
-    return rels
-
-
 def infer_project_key(issue_key):
     if not issue_key or "-" not in issue_key:
         return None
     return issue_key.split("-", 1)[0]
 
 
-def find_first_itpt(index, root_key, max_depth):
-    root_issue = index.get(root_key) or {}
-    root_summary = root_issue.get("summary") or ""
-    root_desc = root_issue.get("description_summary") or ""
-    root_project = root_issue.get("project_key") or infer_project_key(root_key)
+def label_nearest_itpt(graph, max_depth):
+    itpt = graph.project_id("ITPT")
+    dist = [-1] * len(graph)
+    queue = deque()
+    if itpt >= 0:
+        for node, project in enumerate(graph.node_project):
+            if project == itpt:
+                dist[node] = 0
+                queue.append(node)
+    order = []
+    while queue:
+        current = queue.popleft()
+        depth = dist[current]
+        if depth:
+            order.append(current)
+        if depth >= max_depth:
+            continue
+        for prev in graph.predecessors(current):
+            if dist[prev] < 0:
+                dist[prev] = depth + 1
+                queue.append(prev)
+
+    labels = {}
+    for node in order:
+        depth = dist[node]
+        for nxt, relation in graph.neighbors(node):
+            if dist[nxt] != depth - 1:
+                continue
+            if depth == 1:
+                labels[node] = (node, nxt, relation, 1)
+            else:
+                from_node, upper_node, upper_relation, _ = labels[nxt]
+                labels[node] = (from_node, upper_node, upper_relation, depth)
+            break
+    return labels
+
+
+def nearest_itpt_row(graph, root_key, labels):
+    root = graph.find(root_key)
+    if root < 0:
+        root_summary = ""
+        root_project = infer_project_key(root_key)
+    else:
+        root_summary = graph.summaries[root]
+        root_project = graph.project_key(root)
     if root_project == "ITPT":
         return {
             "root_key": root_key,
@@ -118,50 +151,32 @@ def find_first_itpt(index, root_key, max_depth):
             "from_key": "",
             "upper_key": root_key,
             "upper_summary": root_summary,
-            "upper_description": root_desc,
+            "upper_description": graph.descriptions[root] if root >= 0 else "",
             "relation_type": "self",
             "depth": 0,
         }
-    visited = set()
-    queue = deque([(root_key, 0)])
-    visited.add(root_key)
-
-    while queue:
-        current, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
-        issue = index.get(current)
-        if not issue:
-            continue
-        for nxt, relation in neighbors(issue):
-            if nxt in visited:
-                continue
-            visited.add(nxt)
-            to_project_key = (index.get(nxt) or {}).get("project_key")
-            if not to_project_key:
-                to_project_key = infer_project_key(nxt)
-            if to_project_key == "ITPT":
-                itpt_issue = index.get(nxt) or {}
-                return {
-                    "root_key": root_key,
-                    "root_summary": root_summary,
-                    "from_key": current,
-                    "upper_key": nxt,
-                    "upper_summary": itpt_issue.get("summary") or "",
-                    "upper_description": itpt_issue.get("description_summary") or "",
-                    "relation_type": relation,
-                    "depth": depth + 1,
-                }
-            queue.append((nxt, depth + 1))
+    label = labels.get(root)
+    if not label:
+        return {
+            "root_key": root_key,
+            "root_summary": root_summary,
+            "from_key": "",
+            "upper_key": "",
+            "upper_summary": "",
+            "upper_description": "",
+            "relation_type": "",
+            "depth": "",
+        }
+    from_node, upper_node, relation, depth = label
     return {
         "root_key": root_key,
         "root_summary": root_summary,
-        "from_key": "",
-        "upper_key": "",
-        "upper_summary": "",
-        "upper_description": "",
-        "relation_type": "",
-        "depth": "",
+        "from_key": graph.keys[from_node],
+        "upper_key": graph.keys[upper_node],
+        "upper_summary": graph.summaries[upper_node],
+        "upper_description": graph.descriptions[upper_node],
+        "relation_type": relation,
+        "depth": depth,
     }
 
 
@@ -169,12 +184,46 @@ def get_issue_id(issue_key, base_url, headers, timeout, cache):
     if issue_key in cache:
         return cache[issue_key]
     url = f"{base_url}/rest/api/3/issue/{urllib.parse.quote(issue_key)}?fields="
-    data = request_json(url, headers, timeout)
+    data = request_json(url, headers, timeout=timeout)
     issue_id = data.get("id", "")
     cache[issue_key] = issue_id
     return issue_id
 
 
+def search_issue_ids(keys, base_url, headers, timeout):
+    payload = {
+        "jql": "key in (" + ", ".join(keys) + ")",
+        "fields": ["key"],
+        "maxResults": len(keys),
+    }
+    try:
+        data = request_json(
+            f"{base_url}/rest/api/3/search/jql",
+            {**headers, "Content-Type": "application/json"},
+            data=json.dumps(payload).encode("utf-8"),
+            timeout=timeout,
+        )
+    except urllib.error.HTTPError as err:
+        # Jira rejects the whole query when one key no longer exists; split the
+        # chunk until the stale keys are isolated and leave them to per-key lookups.
+        if err.code != 400:
+            raise
+        if len(keys) == 1:
+            return {}
+        mid = len(keys) // 2
+        found = search_issue_ids(keys[:mid], base_url, headers, timeout)
+        found.update(search_issue_ids(keys[mid:], base_url, headers, timeout))
+        return found
+    return {issue.get("key"): issue.get("id", "") for issue in data.get("issues", []) or []}
+
+
+def resolve_issue_ids(keys, base_url, headers, timeout, cache, pool, chunk_size=100):
+    pending = [key for key in dict.fromkeys(keys) if key not in cache]
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    for found in pool.map(lambda chunk: search_issue_ids(chunk, base_url, headers, timeout), chunks):
+        cache.update({key: issue_id for key, issue_id in found.items() if key and issue_id})
+
+
 def pick_merge_timestamp(pull):
     for key in (
         "mergedTimestamp",
@@ -262,7 +311,7 @@ def get_master_merge_date(issue_key, base_url, headers, timeout, id_cache, cache
         }
     )
     url = f"{base_url}/rest/dev-status/1.0/issue/detail?{params}"
-    data = request_json(url, headers, timeout)
+    data = request_json(url, headers, timeout=timeout)
     pull_requests = []
     for detail in data.get("detail", []) or []:
         prs = detail.get("pullRequests") or detail.get("pullrequests") or []
@@ -273,6 +322,25 @@ def get_master_merge_date(issue_key, base_url, headers, timeout, id_cache, cache
     return merged_at
 
 
+def prefetch_master_merge_dates(keys, base_url, headers, timeout, id_cache, cache, concurrency):
+    def resolve(issue_key):
+        try:
+            return get_master_merge_date(issue_key, base_url, headers, timeout, id_cache, None)
+        except Exception:
+            return ""
+
+    pending = [key for key in keys if key not in cache]
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending)))) as pool:
+        try:
+            resolve_issue_ids(pending, base_url, headers, timeout, id_cache, pool)
+        except urllib.error.URLError as err:
+            print(f"issue id batch lookup failed ({err}); resolving ids per key", file=sys.stderr)
+        for issue_key, merged_at in zip(pending, pool.map(resolve, pending)):
+            cache[issue_key] = merged_at or ""
+
+
 def unique_roots(path):
     seen = set()
     ordered = []
@@ -306,11 +374,11 @@ def parse_range(value):
     return dt.datetime.strptime(value, "%Y/%m/%d").date()
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Find first ITPT parent per root and emit one row per root."
     )
-    parser.add_argument("input_json", help="Path to jira-source JSON file")
+    parser.add_argument("input_json", help="Path to jira-source JSON/NDJSON or compiled .jgraph file")
     parser.add_argument("--batch-file", required=True, help="roots.txt path")
     parser.add_argument("--max-depth", type=int, default=5)
     parser.add_argument("--csv-output", required=True)
@@ -322,9 +390,15 @@ def main():
     parser.add_argument("--devstatus-cache", default="")
     parser.add_argument("--merge-map", default="")
     parser.add_argument("--http-timeout", type=int, default=60)
-    args = parser.parse_args()
+    parser.add_argument("--devstatus-concurrency", type=int, default=0)
+    parser.add_argument("--issue-id-cache", default=None)
+    parser.add_argument(
+        "--prefetch-only",
+        action="store_true",
+        help="Fill --devstatus-cache for every root and exit without writing the CSV",
+    )
+    args = parser.parse_args(argv)
 
-    index = load_data(args.input_json)
     roots = unique_roots(args.batch_file)
 
     rows = []
@@ -337,6 +411,7 @@ def main():
     headers = {}
     base_url = ""
     id_cache = {}
+    id_cache_path = ""
     cache_path = args.devstatus_cache or os.environ.get("DEVSTATUS_CACHE", "")
     dev_cache = load_cache(cache_path) if include_master_merge else {}
     merge_map = load_cache(args.merge_map) if args.merge_map and include_master_merge else {}
@@ -368,8 +443,30 @@ def main():
             return f"{base_url}/browse/{key}"
         return key
 
+    if include_master_merge and not use_merge_map:
+        id_cache_path = args.issue_id_cache
+        if id_cache_path is None:
+            id_cache_path = os.environ.get("ISSUE_ID_CACHE", DEFAULT_ISSUE_ID_CACHE)
+        id_cache = load_issue_id_cache(os.path.expanduser(id_cache_path), base_url)
+        prefetch_master_merge_dates(
+            roots,
+            base_url,
+            headers,
+            args.http_timeout,
+            id_cache,
+            dev_cache,
+            args.devstatus_concurrency or int(os.environ.get("DEVSTATUS_CONCURRENCY", "8")),
+        )
+    if args.prefetch_only:
+        if include_master_merge and not use_merge_map:
+            save_cache(cache_path, dev_cache)
+            save_issue_id_cache(os.path.expanduser(id_cache_path), base_url, id_cache)
+        return
+
+    graph = load_graph(args.input_json)
+    labels = label_nearest_itpt(graph, args.max_depth)
     for root_key in roots:
-        row = find_first_itpt(index, root_key, args.max_depth)
+        row = nearest_itpt_row(graph, root_key, labels)
         if include_master_merge:
             if use_merge_map:
                 row["master_merged_at"] = merge_map.get(root_key, "")
@@ -425,6 +522,7 @@ def main():
 
     if include_master_merge and not use_merge_map:
         save_cache(cache_path, dev_cache)
+        save_issue_id_cache(os.path.expanduser(id_cache_path), base_url, id_cache)
 
 
 if __name__ == "__main__":
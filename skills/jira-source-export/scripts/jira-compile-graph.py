@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+import argparse
+
+from jira_graph import write_graph
+from jira_records import iter_issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compile Jira source JSON into a memory-mapped graph index."
+    )
+    parser.add_argument("input_json", help="Path to jira-source JSON/NDJSON file")
+    parser.add_argument("output_graph", help="Output graph path (e.g., jira-source.jgraph)")
+    args = parser.parse_args(argv)
+
+    write_graph(iter_issues(args.input_json), args.output_graph)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,749 @@
+#!/usr/bin/env python3
+import argparse
+import datetime as dt
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEV_FIELD_ID = "customfield_10000"
+ACCOUNT_ID = "acct-me"
+ETAG_ENDPOINTS = ("issue", "comment", "changelog")
+OTHER_ACCOUNTS = ["acct-a", "acct-b", "acct-c"]
+
+
+def parse_ts(value):
+    if not value:
+        return None
+    raw = value.strip()
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return dt.datetime.strptime(raw, fmt).astimezone(dt.timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_jql_date(value):
+    raw = value.strip()
+    for fmt in ("%Y/%m/%d %H:%M", "%Y-%m-%d %H:%M", "%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return dt.datetime.strptime(raw, fmt).replace(tzinfo=dt.timezone.utc)
+        except ValueError:
+            continue
+    raise JqlError(f"Date value '{value}' for field is invalid.")
+
+
+def format_ts(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def dev_field_value(state, last_updated):
+    blob = {
+        "cachedValue": {
+            "errors": [],
+            "summary": {
+                "pullrequest": {
+                    "overall": {
+                        "count": 1,
+                        "lastUpdated": last_updated,
+                        "stateCount": 1,
+                        "state": state,
+                        "dataType": "pullrequest",
+                        "open": state == "OPEN",
+                    },
+                    "byInstanceType": {},
+                }
+            },
+        },
+        "isStale": False,
+    }
+    return (
+        "{pullrequest={dataType=pullrequest, state="
+        + state
+        + ", stateCount=1}, json="
+        + json.dumps(blob, separators=(",", ":"))
+        + "}"
+    )
+
+
+def generate_dataset(issue_count, seed, start, end):
+    rng = random.Random(seed)
+    span = (end - start).total_seconds()
+    issues = []
+
+    def random_ts():
+        return start + dt.timedelta(seconds=rng.uniform(0, span))
+
+    itpt_count = max(1, issue_count // 10)
+    next_id = 10000
+    for number in range(1, itpt_count + 1):
+        created = random_ts()
+        next_id += 1
+        issues.append(
+            {
+                "id": str(next_id),
+                "key": f"ITPT-{number}",
+                "fields": {
+                    "summary": f"ITPT initiative {number}",
+                    "description": f"Initiative {number} description",
+                    "issuetype": {"name": "Epic"},
+                    "project": {"key": "ITPT"},
+                    "created": format_ts(created),
+                    "updated": format_ts(created + dt.timedelta(days=rng.randint(0, 60))),
+                    "assignee": {"accountId": rng.choice(OTHER_ACCOUNTS)},
+                    "issuelinks": [],
+                },
+            }
+        )
+    mgtt_keys = []
+    for number in range(1, issue_count - itpt_count + 1):
+        key = f"MGTT-{number}"
+        created = random_ts()
+        updated = created + dt.timedelta(days=rng.randint(0, 30), hours=rng.randint(0, 23))
+        if updated > end:
+            updated = end - dt.timedelta(minutes=1)
+        assignee = ACCOUNT_ID if rng.random() < 0.5 else rng.choice(OTHER_ACCOUNTS)
+        fields = {
+            "summary": f"MGTT task {number}",
+            "description": {
+                "type": "doc",
+                "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": f"Task {number} body"}]}
+                ],
+            },
+            "issuetype": {"name": "Task"},
+            "project": {"key": "MGTT"},
+            "created": format_ts(created),
+            "updated": format_ts(updated),
+            "assignee": {"accountId": assignee},
+            "issuelinks": [],
+        }
+        roll = rng.random()
+        if roll < 0.4:
+            fields["parent"] = {"key": f"ITPT-{rng.randint(1, itpt_count)}"}
+        elif roll < 0.7 and mgtt_keys:
+            fields["parent"] = {"key": rng.choice(mgtt_keys)}
+        if rng.random() < 0.3:
+            target = rng.choice(mgtt_keys + [f"ITPT-{rng.randint(1, itpt_count)}"]) if mgtt_keys else "ITPT-1"
+            fields["issuelinks"].append(
+                {
+                    "type": {"name": "Relates", "inward": "relates to", "outward": "relates to"},
+                    "outwardIssue": {"key": target},
+                }
+            )
+        merged_at = updated - dt.timedelta(hours=rng.randint(1, 48))
+        state = "MERGED" if rng.random() < 0.6 else "OPEN"
+        fields[DEV_FIELD_ID] = dev_field_value(state, format_ts(merged_at))
+        comments = []
+        for _ in range(rng.randint(0, 5)):
+            comment_ts = created + (updated - created) * rng.random()
+            author = ACCOUNT_ID if rng.random() < 0.3 else rng.choice(OTHER_ACCOUNTS)
+            comments.append(
+                {
+                    "author": {"accountId": author, "displayName": author},
+                    "created": format_ts(comment_ts),
+                    "body": "comment",
+                }
+            )
+        comments.sort(key=lambda item: item["created"])
+        changelog = []
+        for _ in range(rng.randint(0, 300 if rng.random() < 0.05 else 12)):
+            history_ts = created + (updated - created) * rng.random()
+            author = ACCOUNT_ID if rng.random() < 0.2 else rng.choice(OTHER_ACCOUNTS)
+            changelog.append(
+                {
+                    "author": {"accountId": author, "displayName": author},
+                    "created": format_ts(history_ts),
+                    "items": [{"field": "status"}],
+                }
+            )
+        changelog.sort(key=lambda item: item["created"])
+        next_id += 1
+        issues.append(
+            {
+                "id": str(next_id),
+                "key": key,
+                "fields": fields,
+                "assignee_history": [
+                    {"accountId": assignee, "from": format_ts(created), "to": None}
+                ],
+                "comments": comments,
+                "changelog": changelog,
+                "pullRequests": [
+                    {
+                        "status": state,
+                        "destination": {"branch": {"name": "master"}},
+                        "mergedTimestamp": format_ts(merged_at),
+                    }
+                ],
+            }
+        )
+        mgtt_keys.append(key)
+    return {
+        "myself": {"accountId": ACCOUNT_ID, "displayName": "Me"},
+        "fields": [
+            {"id": "summary", "name": "Summary"},
+            {"id": DEV_FIELD_ID, "name": "development"},
+        ],
+        "issues": issues,
+    }
+
+
+class JqlError(Exception):
+    pass
+
+
+TOKEN_RE = re.compile(
+    r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')'
+    r"|(?P<op>!=|>=|<=|=|<|>|~)"
+    r"|(?P<punct>[(),])"
+    r"|(?P<word>[A-Za-z0-9_.\-/:@]+))"
+)
+
+
+def tokenize(jql):
+    tokens = []
+    pos = 0
+    text = jql.strip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise JqlError(f"Error in the JQL Query near position {pos}.")
+        pos = match.end()
+        if match.group("string") is not None:
+            tokens.append(("str", match.group("string")[1:-1]))
+        elif match.group("op"):
+            tokens.append(("op", match.group("op")))
+        elif match.group("punct"):
+            tokens.append(("punct", match.group("punct")))
+        else:
+            tokens.append(("word", match.group("word")))
+    return tokens
+
+
+class JqlParser:
+    def __init__(self, jql, myself, known_keys=None):
+        self.tokens = tokenize(jql)
+        self.pos = 0
+        self.myself = myself
+        self.known_keys = known_keys
+
+    def peek(self, offset=0):
+        idx = self.pos + offset
+        if idx < len(self.tokens):
+            return self.tokens[idx]
+        return (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def word_is(self, *values, offset=0):
+        kind, value = self.peek(offset)
+        return kind == "word" and value.upper() in values
+
+    def expect(self, kind, value=None):
+        token = self.take()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise JqlError(f"Error in the JQL Query: expecting {value or kind}.")
+        return token
+
+    def parse(self):
+        if not self.tokens or self.word_is("ORDER"):
+            return lambda issue: True
+        expr = self.parse_or()
+        if self.word_is("ORDER"):
+            self.pos = len(self.tokens)
+        if self.pos != len(self.tokens):
+            raise JqlError("Error in the JQL Query: unexpected trailing input.")
+        return expr
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.word_is("OR"):
+            self.take()
+            right = self.parse_and()
+            left = (lambda a, b: lambda issue: a(issue) or b(issue))(left, right)
+        return left
+
+    def parse_and(self):
+        left = self.parse_not()
+        while self.word_is("AND"):
+            self.take()
+            right = self.parse_not()
+            left = (lambda a, b: lambda issue: a(issue) and b(issue))(left, right)
+        return left
+
+    def parse_not(self):
+        if self.word_is("NOT"):
+            self.take()
+            inner = self.parse_not()
+            return lambda issue: not inner(issue)
+        if self.peek() == ("punct", "("):
+            self.take()
+            expr = self.parse_or()
+            self.expect("punct", ")")
+            return expr
+        return self.parse_clause()
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind == "str":
+            return value
+        if kind != "word":
+            raise JqlError("Error in the JQL Query: expecting a value.")
+        if self.peek() == ("punct", "("):
+            self.take()
+            args = []
+            while self.peek() != ("punct", ")"):
+                args.append(self.parse_value())
+                if self.peek() == ("punct", ","):
+                    self.take()
+            self.take()
+            if value == "currentUser":
+                return self.myself
+            if value == "accountId" and args:
+                return args[0]
+            raise JqlError(f"Unsupported JQL function: {value}()")
+        return value
+
+    def check_keys(self, field, values):
+        if field not in ("key", "issuekey", "issue") or self.known_keys is None:
+            return
+        for value in values:
+            if value not in self.known_keys:
+                raise JqlError(f"An issue with key '{value}' does not exist for field '{field}'.")
+
+    def parse_list(self):
+        self.expect("punct", "(")
+        values = []
+        while self.peek() != ("punct", ")"):
+            values.append(self.parse_value())
+            if self.peek() == ("punct", ","):
+                self.take()
+        self.take()
+        return values
+
+    def parse_clause(self):
+        kind, field = self.take()
+        if kind not in ("word", "str"):
+            raise JqlError("Error in the JQL Query: expecting a field.")
+        field = field.lower()
+        if self.word_is("WAS"):
+            self.take()
+            negate = False
+            if self.word_is("NOT"):
+                self.take()
+                negate = True
+            if self.word_is("IN"):
+                self.take()
+                values = set(self.parse_list())
+            else:
+                values = {self.parse_value()}
+            window = None
+            if self.word_is("DURING"):
+                self.take()
+                bounds = self.parse_list()
+                window = (parse_jql_date(bounds[0]), parse_jql_date(bounds[1]))
+            if field != "assignee":
+                raise JqlError(f"Field '{field}' does not support WAS.")
+
+            def was(issue):
+                hit = assignee_was(issue, values, window)
+                return not hit if negate else hit
+
+            return was
+        if self.word_is("NOT") and self.word_is("IN", offset=1):
+            self.take()
+            self.take()
+            values = set(self.parse_list())
+            return lambda issue: field_value(issue, field) not in values
+        if self.word_is("IN"):
+            self.take()
+            values = set(self.parse_list())
+            self.check_keys(field, values)
+            return lambda issue: field_value(issue, field) in values
+        kind, op = self.take()
+        if kind != "op":
+            raise JqlError("Error in the JQL Query: expecting an operator.")
+        value = self.parse_value()
+        if field in ("updated", "created"):
+            bound = parse_jql_date(value)
+
+            def compare(issue):
+                current = parse_ts(issue["fields"].get(field))
+                if current is None:
+                    return False
+                return {
+                    ">=": current >= bound,
+                    ">": current > bound,
+                    "<=": current <= bound,
+                    "<": current < bound,
+                    "=": current == bound,
+                    "!=": current != bound,
+                }.get(op, False)
+
+            return compare
+        if op == "=":
+            self.check_keys(field, [value])
+            return lambda issue: field_value(issue, field) == value
+        if op == "!=":
+            return lambda issue: field_value(issue, field) != value
+        raise JqlError(f"Operator '{op}' is not supported for field '{field}'.")
+
+
+def field_value(issue, field):
+    if field in ("key", "issuekey", "issue"):
+        return issue["key"]
+    if field == "project":
+        return (issue["fields"].get("project") or {}).get("key")
+    if field == "assignee":
+        return (issue["fields"].get("assignee") or {}).get("accountId")
+    if field == "parent":
+        return (issue["fields"].get("parent") or {}).get("key")
+    raise JqlError(f"Field '{field}' does not exist or you do not have permission to view it.")
+
+
+def assignee_was(issue, values, window):
+    history = issue.get("assignee_history")
+    if history is None:
+        history = [{"accountId": field_value(issue, "assignee"), "from": None, "to": None}]
+    for entry in history:
+        if entry.get("accountId") not in values:
+            continue
+        if window is None:
+            return True
+        start = parse_ts(entry.get("from")) or dt.datetime.min.replace(tzinfo=dt.timezone.utc)
+        end = parse_ts(entry.get("to")) or dt.datetime.max.replace(tzinfo=dt.timezone.utc)
+        if start < window[1] and end > window[0]:
+            return True
+    return False
+
+
+class FakeJira:
+    def __init__(self, dataset, options):
+        self.options = options
+        self.myself = dataset.get("myself") or {"accountId": ACCOUNT_ID}
+        self.fields = dataset.get("fields") or []
+        self.issues = dataset.get("issues") or []
+        self.by_key = {issue["key"]: issue for issue in self.issues}
+        self.by_id = {issue["id"]: issue for issue in self.issues}
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.request_count = 0
+        self.rng = random.Random(options.seed)
+        self.tokens = float(options.rate_limit)
+        self.refilled = time.monotonic()
+
+    def record(self, endpoint):
+        with self.lock:
+            self.stats[endpoint] = self.stats.get(endpoint, 0) + 1
+            self.request_count += 1
+            count = self.request_count
+            roll = self.rng.random()
+            throttled = None
+            if self.options.rate_limit > 0:
+                now = time.monotonic()
+                rate = self.options.rate_limit
+                self.tokens = min(rate, self.tokens + (now - self.refilled) * rate)
+                self.refilled = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                else:
+                    throttled = max(1, math.ceil((1 - self.tokens) / rate))
+            if throttled is None and self.options.throttle_every and count % self.options.throttle_every == 0:
+                throttled = self.options.retry_after
+            if throttled is None and self.options.throttle_rate > 0 and roll < self.options.throttle_rate:
+                throttled = self.options.retry_after
+            if throttled is not None:
+                self.stats["throttled"] = self.stats.get("throttled", 0) + 1
+        return throttled
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def search(self, jql):
+        predicate = JqlParser(jql, self.myself.get("accountId"), self.by_key).parse()
+        return [issue for issue in self.issues if predicate(issue)]
+
+    def project(self, issue, fields):
+        wanted = [f.strip() for f in fields if f and f.strip()]
+        if not wanted or "*all" in wanted or "*navigable" in wanted:
+            selected = dict(issue["fields"])
+        else:
+            selected = {name: issue["fields"][name] for name in wanted if name in issue["fields"]}
+        return {"id": issue["id"], "key": issue["key"], "fields": selected}
+
+    def page_size(self, requested):
+        size = requested if requested > 0 else 50
+        return min(size, self.options.max_page_size)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeJira/1.0"
+
+    def log_message(self, fmt, *args):
+        if self.server.jira.options.verbose:
+            super().log_message(fmt, *args)
+
+    def send_json(self, status, payload, headers=None, etag=False):
+        body = json.dumps(payload).encode("utf-8")
+        if etag and status == 200:
+            tag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            headers = dict(headers or {}, ETag=tag)
+            if self.headers.get("If-None-Match") == tag:
+                self.server.jira.count("not-modified")
+                self.send_response(304)
+                self.send_header("ETag", tag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        jira = self.server.jira
+        parts = urllib.parse.urlsplit(self.path)
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(parts.query).items()}
+        path = parts.path.rstrip("/")
+        try:
+            body = self.read_body() if method == "POST" else {}
+        except json.JSONDecodeError:
+            self.send_json(400, {"errorMessages": ["Invalid JSON body."]})
+            return
+        if path == "/__stats":
+            with jira.lock:
+                self.send_json(200, {"requests": jira.request_count, "endpoints": dict(jira.stats)})
+            return
+        route = self.route(method, path)
+        if route is None:
+            self.send_json(404, {"errorMessages": [f"No route for {method} {path}"]})
+            return
+        endpoint, handler, args = route
+        latency = jira.options.latency + jira.rng.uniform(0, jira.options.jitter)
+        if latency > 0:
+            time.sleep(latency / 1000.0)
+        retry_after = jira.record(endpoint)
+        if retry_after is not None:
+            self.send_json(
+                429,
+                {"errorMessages": ["Rate limit exceeded."]},
+                {"Retry-After": str(retry_after)},
+            )
+            return
+        try:
+            status, payload = handler(jira, params, body, *args)
+        except JqlError as err:
+            status, payload = 400, {"errorMessages": [str(err)]}
+        self.send_json(status, payload, etag=jira.options.etag and endpoint in ETAG_ENDPOINTS)
+
+    def route(self, method, path):
+        if path == "/rest/api/3/search/jql":
+            return ("search", search_get if method == "GET" else search_post, ())
+        if path == "/rest/api/3/search/approximate-count" and method == "POST":
+            return ("approximate-count", approximate_count, ())
+        if path == "/rest/api/3/issue/bulkfetch" and method == "POST" and self.server.jira.options.bulkfetch:
+            return ("bulkfetch", bulk_fetch, ())
+        if path == "/rest/api/3/field" and method == "GET":
+            return ("field", lambda jira, params, body: (200, jira.fields), ())
+        if path == "/rest/api/3/myself" and method == "GET":
+            return ("myself", lambda jira, params, body: (200, jira.myself), ())
+        if path == "/rest/dev-status/1.0/issue/detail" and method == "GET":
+            return ("dev-status", dev_status, ())
+        match = re.fullmatch(r"/rest/api/3/issue/([^/]+)(?:/(comment|changelog))?", path)
+        if match and method == "GET":
+            key = urllib.parse.unquote(match.group(1))
+            sub = match.group(2)
+            if sub == "comment":
+                return ("comment", issue_comments, (key,))
+            if sub == "changelog":
+                return ("changelog", issue_changelog, (key,))
+            return ("issue", get_issue, (key,))
+        return None
+
+
+def paged_search(jira, jql, fields, start_at, max_results, token_mode):
+    matched = jira.search(jql)
+    size = jira.page_size(max_results)
+    page = matched[start_at : start_at + size]
+    payload = {"issues": [jira.project(issue, fields) for issue in page]}
+    end = start_at + len(page)
+    if token_mode:
+        payload["isLast"] = end >= len(matched)
+        if not payload["isLast"]:
+            payload["nextPageToken"] = str(end)
+    else:
+        payload.update({"startAt": start_at, "maxResults": size})
+        if jira.options.total:
+            payload["total"] = len(matched)
+        if end < len(matched):
+            payload["nextPageToken"] = str(end)
+        payload["isLast"] = end >= len(matched)
+    return 200, payload
+
+
+def search_get(jira, params, body):
+    fields = (params.get("fields") or "").split(",")
+    token = params.get("nextPageToken")
+    start_at = int(token) if token else int(params.get("startAt") or 0)
+    return paged_search(jira, params.get("jql", ""), fields, start_at, int(params.get("maxResults") or 50), False)
+
+
+def search_post(jira, params, body):
+    fields = body.get("fields") or []
+    token = body.get("nextPageToken")
+    start_at = int(token) if token else 0
+    return paged_search(jira, body.get("jql", ""), fields, start_at, int(body.get("maxResults") or 50), True)
+
+
+def approximate_count(jira, params, body):
+    return 200, {"count": len(jira.search(body.get("jql", "")))}
+
+
+def bulk_fetch(jira, params, body):
+    keys = body.get("issueIdsOrKeys") or []
+    if len(keys) > 100:
+        return 400, {"errorMessages": ["Maximum of 100 issues can be requested."]}
+    fields = body.get("fields") or []
+    issues = []
+    errors = []
+    for key in keys:
+        issue = jira.by_key.get(key) or jira.by_id.get(str(key))
+        if issue is None:
+            errors.append(f"Issue does not exist or you do not have permission to see it: {key}")
+            continue
+        issues.append(jira.project(issue, fields))
+    return 200, {"issues": issues, "issueErrors": errors}
+
+
+def get_issue(jira, params, body, key):
+    issue = jira.by_key.get(key) or jira.by_id.get(key)
+    if issue is None:
+        return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}
+    fields = params.get("fields")
+    fields = fields.split(",") if fields else ["*all"]
+    if fields == [""]:
+        return 200, {"id": issue["id"], "key": issue["key"], "fields": {}}
+    return 200, jira.project(issue, fields)
+
+
+def paged_values(items, params, size_cap, name):
+    start_at = int(params.get("startAt") or 0)
+    size = min(int(params.get("maxResults") or 50), size_cap)
+    page = items[start_at : start_at + size]
+    return {
+        "startAt": start_at,
+        "maxResults": size,
+        "total": len(items),
+        "isLast": start_at + len(page) >= len(items),
+        name: page,
+    }
+
+
+def issue_comments(jira, params, body, key):
+    issue = jira.by_key.get(key)
+    if issue is None:
+        return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}
+    return 200, paged_values(issue.get("comments") or [], params, jira.options.max_page_size, "comments")
+
+
+def issue_changelog(jira, params, body, key):
+    issue = jira.by_key.get(key)
+    if issue is None:
+        return 404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]}
+    return 200, paged_values(issue.get("changelog") or [], params, jira.options.max_page_size, "values")
+
+
+def dev_status(jira, params, body):
+    issue = jira.by_id.get(params.get("issueId", ""))
+    if issue is None:
+        return 200, {"errors": [], "detail": []}
+    return 200, {"errors": [], "detail": [{"pullRequests": issue.get("pullRequests") or []}]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Jira REST server for offline runs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--dataset", default="", help="JSON dataset (issues/fields/myself)")
+    parser.add_argument("--issues", type=int, default=500, help="Synthetic issue count")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--start", default="2025/01/01", help="Synthetic range start YYYY/MM/DD")
+    parser.add_argument("--end", default="2026/01/01", help="Synthetic range end YYYY/MM/DD")
+    parser.add_argument("--dump-dataset", default="", help="Write the dataset JSON and exit")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in ms")
+    parser.add_argument("--max-page-size", type=int, default=100)
+    parser.add_argument("--no-total", dest="total", action="store_false")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Return 429 every Nth request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of 429")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="Server-wide requests/second before 429"
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument(
+        "--no-bulkfetch", dest="bulkfetch", action="store_false", help="Answer issue/bulkfetch with 404"
+    )
+    parser.add_argument(
+        "--etag", action="store_true", help="Send ETags on issue/comment/changelog and honor If-None-Match"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.dataset:
+        with open(args.dataset, "r", encoding="utf-8") as handle:
+            dataset = json.load(handle)
+    else:
+        start = dt.datetime.strptime(args.start, "%Y/%m/%d").replace(tzinfo=dt.timezone.utc)
+        end = dt.datetime.strptime(args.end, "%Y/%m/%d").replace(tzinfo=dt.timezone.utc)
+        dataset = generate_dataset(args.issues, args.seed, start, end)
+    if args.dump_dataset:
+        with open(args.dump_dataset, "w", encoding="utf-8") as handle:
+            json.dump(dataset, handle, ensure_ascii=False, indent=2)
+        print(f"Wrote dataset: {args.dump_dataset}")
+        return
+
+    server = Server((args.host, args.port), Handler)
+    server.jira = FakeJira(dataset, args)
+    print(f"Fake Jira listening on http://{args.host}:{server.server_address[1]} ({len(server.jira.issues)} issues)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps({"requests": server.jira.request_count, "endpoints": server.jira.stats}))
+
+
+if __name__ == "__main__":
+    main()
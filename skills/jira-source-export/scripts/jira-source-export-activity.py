@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import base64
-import json
+import contextlib
 import os
-import time
 import urllib.error
-import urllib.parse
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from jira_async import run_session
+from jira_cache import cache_from_env
+from jira_http import cached_request_json, json_payload, limiter_from_env, request_json
+from jira_journal import journal_from_env, journaled
+from jira_records import IssueWriter, output_format
+from jira_steps import Batch, call, run, search_keys
+
+ISSUE_FIELDS = ["summary", "issuetype", "project", "parent", "issuelinks"]
+CHANGELOG_PAGE_SIZE = 100
+CHANGELOG_SCANS = ("tail", "forward")
 
 
 def get_env(name, default=None, required=False):
@@ -47,88 +55,91 @@ def build_date_range():
 
 
 class JiraClient:
-    def __init__(self, base_url, email, token, max_retries=5, backoff=2.0):
+    def __init__(
+        self, base_url, email, token, max_retries=5, backoff=2.0, limiter=None, cache=None
+    ):
         self.base_url = base_url.rstrip("/")
         auth = base64.b64encode(f"{email}:{token}".encode("utf-8")).decode("ascii")
         self.headers = {"Authorization": f"Basic {auth}", "Accept": "application/json"}
         self.max_retries = max_retries
         self.backoff = backoff
+        self.limiter = limiter
+        self.cache = cache
+        self.updated = {}
+        self.timeout = int(get_env("HTTP_TIMEOUT", "30"))
 
-    def _request(self, url, params=None):
-        if params:
-            url = url + "?" + urllib.parse.urlencode(params, doseq=True)
-        attempt = 0
-        backoff = self.backoff
-        while True:
-            req = urllib.request.Request(url, headers=self.headers)
-            try:
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    return json.loads(resp.read().decode("utf-8"))
-            except urllib.error.HTTPError as err:
-                if err.code in (429, 503) and attempt < self.max_retries:
-                    retry_after = err.headers.get("Retry-After")
-                    wait = float(retry_after) if retry_after else backoff
-                    time.sleep(wait)
-                    if not retry_after:
-                        backoff *= 2
-                    attempt += 1
-                    continue
-                raise
-            except urllib.error.URLError:
-                if attempt < self.max_retries:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    attempt += 1
-                    continue
-                raise
+    # endpoint is unused here; it keeps the signature of jira_async.AsyncJiraClient,
+    # which sizes its concurrency per endpoint.
+    def _request(self, endpoint, url, params=None, data=None):
+        headers, body = json_payload(self.headers, data)
+        return request_json(
+            url,
+            headers,
+            params=params,
+            data=body,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            limiter=self.limiter,
+        )
+
+    def _cached(self, endpoint, key, url, params):
+        return cached_request_json(
+            self.cache,
+            url,
+            self.headers,
+            params=params,
+            updated=self.updated.get(key),
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            limiter=self.limiter,
+        )
+
+    def remember(self, issues):
+        if self.cache is None:
+            return
+        for item in issues:
+            updated = (item.get("fields") or {}).get("updated")
+            if item.get("key") and updated:
+                self.updated[item["key"]] = updated
 
     def search(self, jql, start_at=0, max_results=100):
         return self._request(
+            "search",
             f"{self.base_url}/rest/api/3/search/jql",
             {
                 "jql": jql,
-                "fields": "key",
+                "fields": "key,updated" if self.cache is not None else "key",
                 "startAt": str(start_at),
                 "maxResults": str(max_results),
             },
         )
 
     def issue(self, key):
-        return self._request(
+        return self._cached(
+            "issue",
+            key,
             f"{self.base_url}/rest/api/3/issue/{key}",
-            {"fields": "summary,issuetype,project,parent,issuelinks"},
+            {"fields": ",".join(ISSUE_FIELDS)},
         )
 
-    def changelog(self, key, start_at=0, max_results=100):
+    def bulk_issues(self, keys):
         return self._request(
+            "issue",
+            f"{self.base_url}/rest/api/3/issue/bulkfetch",
+            data={"issueIdsOrKeys": list(keys), "fields": ISSUE_FIELDS},
+        )
+
+    def changelog(self, key, start_at=0, max_results=100):
+        return self._cached(
+            "changelog",
+            key,
             f"{self.base_url}/rest/api/3/issue/{key}/changelog",
             {"startAt": str(start_at), "maxResults": str(max_results)},
         )
 
 
-def paginate_search(client, jql, max_results, max_pages=0):
-    keys = []
-    start_at = 0
-    pages = 0
-    while True:
-        resp = client.search(jql, start_at=start_at, max_results=max_results)
-        issues = resp.get("issues", [])
-        keys.extend([item.get("key") for item in issues if item.get("key")])
-        total = resp.get("total")
-        pages += 1
-        if max_pages and pages >= max_pages:
-            break
-        if isinstance(total, int):
-            start_at += max_results
-            if start_at >= total:
-                break
-        else:
-            if len(issues) < max_results:
-                break
-            start_at += max_results
-    return keys
-
-
 def normalize_issue(issue):
     fields = issue.get("fields", {})
     issuelinks = []
@@ -156,43 +167,145 @@ def normalize_issue(issue):
     }
 
 
-def activity_match(client, key, account_id, name_contains, start_ts, end_ts):
-    start_at = 0
-    max_results = 100
-    while True:
-        resp = client.changelog(key, start_at=start_at, max_results=max_results)
-        histories = resp.get("values", [])
-        for history in histories:
-            author = history.get("author", {})
-            if account_id and author.get("accountId") == account_id:
-                created = history.get("created")
-                if created and start_ts <= created < end_ts:
-                    return True
-            if name_contains:
-                name = author.get("displayName", "")
-                if name_contains in name:
-                    created = history.get("created")
-                    if created and start_ts <= created < end_ts:
-                        return True
-        total = resp.get("total")
-        if isinstance(total, int):
-            start_at += max_results
-            if start_at >= total:
-                break
-        else:
-            if len(histories) < max_results:
-                break
-            start_at += max_results
-    return False
+def author_matches(author, account_id, name_contains):
+    if account_id and author.get("accountId") == account_id:
+        return True
+    return bool(name_contains) and name_contains in author.get("displayName", "")
 
 
-def fetch_if_activity(client, key, account_id, name_contains, start_ts, end_ts):
-    if activity_match(client, key, account_id, name_contains, start_ts, end_ts):
-        issue = client.issue(key)
-        return normalize_issue(issue)
+def scan_forward(histories, account_id, name_contains, start_ts, end_ts):
+    for history in histories:
+        created = history.get("created")
+        if not created or created < start_ts:
+            continue
+        if created >= end_ts:
+            return False
+        if author_matches(history.get("author", {}), account_id, name_contains):
+            return True
     return None
 
 
+def scan_newest_first(histories, account_id, name_contains, start_ts, end_ts):
+    for history in reversed(histories):
+        created = history.get("created")
+        if not created or created >= end_ts:
+            continue
+        if created < start_ts:
+            return False
+        if author_matches(history.get("author", {}), account_id, name_contains):
+            return True
+    return None
+
+
+def tail_offsets(first, end_ts):
+    total = first.get("total")
+    histories = first.get("values", [])
+    if not isinstance(total, int):
+        return None
+    if histories and (histories[-1].get("created") or "") >= end_ts:
+        return []
+    step = first.get("maxResults") or CHANGELOG_PAGE_SIZE
+    return list(range(step, total, step))[::-1]
+
+
+def changelog_batches(offsets, page_concurrency):
+    return [offsets[:1]] + chunked(offsets[1:], max(1, page_concurrency)) if offsets else []
+
+
+def next_offset(resp, start_at):
+    histories = resp.get("values", [])
+    step = resp.get("maxResults") or CHANGELOG_PAGE_SIZE
+    total = resp.get("total")
+    start_at += step
+    if isinstance(total, int):
+        return start_at if start_at < total else None
+    return start_at if len(histories) >= step else None
+
+
+def activity_match(key, account_id, name_contains, start_ts, end_ts, scan="tail", page_concurrency=1):
+    first = yield from call("changelog", key, 0, CHANGELOG_PAGE_SIZE)
+    offsets = tail_offsets(first, end_ts) if scan == "tail" else None
+    if offsets is None:
+        resp = first
+        start_at = 0
+        while True:
+            found = scan_forward(resp.get("values", []), account_id, name_contains, start_ts, end_ts)
+            if found is not None:
+                return found
+            start_at = next_offset(resp, start_at)
+            if start_at is None:
+                return False
+            resp = yield from call("changelog", key, start_at, CHANGELOG_PAGE_SIZE)
+
+    for batch in changelog_batches(offsets, page_concurrency):
+        pages = yield Batch(
+            [("changelog", (key, start_at, CHANGELOG_PAGE_SIZE)) for start_at in batch], len(batch)
+        )
+        for page in pages:
+            found = scan_newest_first(page.get("values", []), account_id, name_contains, start_ts, end_ts)
+            if found is not None:
+                return found
+    return bool(scan_newest_first(first.get("values", []), account_id, name_contains, start_ts, end_ts))
+
+
+def chunked(items, size):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def fetch_issue_chunk(keys, journal=None):
+    return journaled(journal, "issues", keys, fetch_issues(keys))
+
+
+def fetch_issues(keys):
+    try:
+        resp = yield from call("bulk_issues", keys)
+    except urllib.error.HTTPError as err:
+        if err.code not in (404, 405):
+            raise
+        return (yield Batch([("issue", (key,)) for key in keys], len(keys)))
+    return resp.get("issues", [])
+
+
+def export_activity(
+    client,
+    writer,
+    jql,
+    account_id,
+    name_contains,
+    start_ts,
+    end_ts,
+    max_results,
+    max_pages,
+    max_issues,
+    bulk_size,
+    scan,
+    page_concurrency,
+    concurrency,
+    journal=None,
+):
+    keys = yield from search_keys(client, jql, max_results, max_pages, 1, journal, max_issues)
+    found = yield Batch(
+        [
+            journaled(
+                journal,
+                "changelog",
+                key,
+                activity_match(
+                    key, account_id, name_contains, start_ts, end_ts, scan, page_concurrency
+                ),
+            )
+            for key in keys
+        ],
+        concurrency,
+    )
+    matched = [key for key, ok in zip(keys, found) if ok]
+    yield Batch(
+        [fetch_issue_chunk(chunk, journal) for chunk in chunked(matched, bulk_size)],
+        concurrency,
+        lambda issues: writer.write_many(normalize_issue(issue) for issue in issues),
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Export Jira issues by activity history.")
     parser.add_argument("output", nargs="?", default="jira-source-activity.json")
@@ -209,11 +322,26 @@ def main():
     max_pages = int(get_env("MAX_PAGES", "0"))
     max_issues = int(get_env("MAX_ISSUES", "0"))
     concurrency = int(get_env("CONCURRENCY", "8"))
+    bulk_size = max(1, min(100, int(get_env("BULK_FETCH_SIZE", "100"))))
+    engine = get_env("ENGINE", "thread")
+    async_concurrency = int(get_env("ASYNC_CONCURRENCY", "64"))
+    scan = get_env("CHANGELOG_SCAN", "tail")
+    page_concurrency = int(get_env("CHANGELOG_PAGE_CONCURRENCY", "4"))
+    fmt = output_format(args.output, get_env("OUTPUT_FORMAT", ""))
+
+    if engine not in ("thread", "async"):
+        raise SystemExit("ENGINE must be one of: thread, async.")
+    if scan not in CHANGELOG_SCANS:
+        raise SystemExit("CHANGELOG_SCAN must be one of: tail, forward.")
 
     start_date, end_date, start_ts, end_ts = build_date_range()
     print(f"date range: {start_date} to {end_date}")
 
-    client = JiraClient(base_url, email, token)
+    limiter = limiter_from_env(concurrency)
+    if limiter is not None:
+        concurrency = limiter.ceiling
+    cache = cache_from_env()
+    client = JiraClient(base_url, email, token, limiter=limiter, cache=cache)
 
     project_list = [p.strip() for p in projects.split(",") if p.strip()]
     project_filter = "project in (" + ", ".join(project_list) + ")"
@@ -221,24 +349,48 @@ def main():
     if jql_extra:
         jql += f" AND {jql_extra}"
 
-    keys = paginate_search(client, jql, max_results, max_pages)
-    if max_issues:
-        keys = keys[:max_issues]
+    journal = journal_from_env(
+        args.output,
+        {
+            "jql": jql,
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+            "account_id": account_id or "",
+            "name_contains": name_contains,
+        },
+    )
 
-    results = []
-    with ThreadPoolExecutor(max_workers=concurrency) as pool:
-        tasks = {
-            pool.submit(fetch_if_activity, client, key, account_id, name_contains, start_ts, end_ts): key
-            for key in keys
-        }
-        for future in as_completed(tasks):
-            item = future.result()
-            if item:
-                results.append(item)
-
-    with open(args.output, "w", encoding="utf-8") as handle:
-        json.dump(results, handle, ensure_ascii=True, indent=2)
-    print(f"Wrote: {args.output} ({len(results)} issues)")
+    with journal or contextlib.nullcontext(), IssueWriter(args.output, fmt) as writer:
+        steps = export_activity(
+            client,
+            writer,
+            jql,
+            account_id,
+            name_contains,
+            start_ts,
+            end_ts,
+            max_results,
+            max_pages,
+            max_issues,
+            bulk_size,
+            scan,
+            page_concurrency,
+            concurrency,
+            journal,
+        )
+        if engine == "async":
+            limits = {"search": 1, "changelog": async_concurrency, "issue": async_concurrency}
+            asyncio.run(run_session(steps, client, limits))
+        else:
+            run(steps, client)
+    print(f"Wrote: {args.output} ({writer.count} issues)")
+    if journal is not None:
+        print(journal.summary())
+    if limiter is not None:
+        print(limiter.summary())
+    if cache is not None:
+        print(cache.summary())
+        cache.close()
 
 
 if __name__ == "__main__":
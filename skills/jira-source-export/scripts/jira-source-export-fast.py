@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import base64
-import concurrent.futures as futures
-import json
+import contextlib
+import datetime as dt
 import os
-import time
 import urllib.error
-import urllib.parse
-import urllib.request
+
+from jira_async import run_session
+from jira_cache import cache_from_env
+from jira_http import cached_request_json, json_payload, limiter_from_env, request_json
+from jira_journal import journal_from_env, journaled
+from jira_jql import combine_jql, match_jql
+from jira_records import IssueWriter, output_format
+from jira_steps import Batch, call, paginate, run, search_keys
+from jira_store import SYNC_OVERLAP, IssueStore, jql_datetime, parse_timestamp
+
+SOURCE_FIELDS = ["summary", "description", "issuetype", "project", "parent", "issuelinks"]
 
 
 def extract_text(value):
@@ -64,11 +73,11 @@ def get_env(name, default=None, required=False):
     return value
 
 
-def build_date_range():
-    year = int(get_env("YEAR", "2025"))
-    month = get_env("MONTH", "")
-    start_override = get_env("START_DATE", "")
-    end_override = get_env("END_DATE", "")
+def build_date_range(setting=get_env):
+    year = int(setting("YEAR", "2025"))
+    month = setting("MONTH", "")
+    start_override = setting("START_DATE", "")
+    end_override = setting("END_DATE", "")
 
     if start_override and end_override:
         start_date = start_override
@@ -94,48 +103,62 @@ def build_date_range():
 
 
 class JiraClient:
-    def __init__(self, base_url, email, token, max_retries=5, backoff=2.0):
+    def __init__(
+        self, base_url, email, token, max_retries=5, backoff=2.0, limiter=None, cache=None
+    ):
         self.base_url = base_url.rstrip("/")
         auth = base64.b64encode(f"{email}:{token}".encode("utf-8")).decode("ascii")
         self.headers = {"Authorization": f"Basic {auth}", "Accept": "application/json"}
         self.max_retries = max_retries
         self.backoff = backoff
+        self.limiter = limiter
+        self.cache = cache
+        self.updated = {}
         self.timeout = int(get_env("HTTP_TIMEOUT", "30"))
 
-    def _request(self, url, params=None):
-        if params:
-            url = url + "?" + urllib.parse.urlencode(params, doseq=True)
-        attempt = 0
-        backoff = self.backoff
-        while True:
-            req = urllib.request.Request(url, headers=self.headers)
-            try:
-                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                    return json.loads(resp.read().decode("utf-8"))
-            except urllib.error.HTTPError as err:
-                if err.code in (429, 503) and attempt < self.max_retries:
-                    retry_after = err.headers.get("Retry-After")
-                    wait = float(retry_after) if retry_after else backoff
-                    time.sleep(wait)
-                    if not retry_after:
-                        backoff *= 2
-                    attempt += 1
-                    continue
-                raise
-            except urllib.error.URLError:
-                if attempt < self.max_retries:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    attempt += 1
-                    continue
-                raise
+    # endpoint is unused here; it keeps the signature of jira_async.AsyncJiraClient,
+    # which sizes its concurrency per endpoint.
+    def _request(self, endpoint, url, params=None, data=None):
+        headers, body = json_payload(self.headers, data)
+        return request_json(
+            url,
+            headers,
+            params=params,
+            data=body,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            limiter=self.limiter,
+        )
+
+    def _cached(self, endpoint, key, url, params):
+        return cached_request_json(
+            self.cache,
+            url,
+            self.headers,
+            params=params,
+            updated=self.updated.get(key),
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            limiter=self.limiter,
+        )
+
+    def remember(self, issues):
+        if self.cache is None:
+            return
+        for item in issues:
+            updated = (item.get("fields") or {}).get("updated") or item.get("updated")
+            if item.get("key") and updated:
+                self.updated[item["key"]] = updated
 
     def search(self, jql, start_at=0, max_results=100):
         return self._request(
+            "search",
             f"{self.base_url}/rest/api/3/search/jql",
             {
                 "jql": jql,
-                "fields": "key",
+                "fields": "key,updated" if self.cache is not None else "key",
                 "startAt": str(start_at),
                 "maxResults": str(max_results),
             },
@@ -143,6 +166,7 @@ class JiraClient:
 
     def search_with_fields(self, jql, fields, start_at=0, max_results=100):
         return self._request(
+            "search",
             f"{self.base_url}/rest/api/3/search/jql",
             {
                 "jql": jql,
@@ -153,72 +177,58 @@ class JiraClient:
         )
 
     def issue(self, key, fields):
-        return self._request(
+        return self._cached(
+            "issue",
+            key,
             f"{self.base_url}/rest/api/3/issue/{key}",
             {"fields": ",".join(fields)},
         )
 
-    def comments(self, key, start_at=0, max_results=100):
+    def bulk_issues(self, keys, fields):
         return self._request(
+            "issue",
+            f"{self.base_url}/rest/api/3/issue/bulkfetch",
+            data={"issueIdsOrKeys": list(keys), "fields": list(fields)},
+        )
+
+    def comments(self, key, start_at=0, max_results=100):
+        return self._cached(
+            "comment",
+            key,
             f"{self.base_url}/rest/api/3/issue/{key}/comment",
             {"startAt": str(start_at), "maxResults": str(max_results)},
         )
 
     def myself(self):
-        return self._request(f"{self.base_url}/rest/api/3/myself")
-
-
-def paginate_search(client, jql, max_results, max_pages=0):
-    keys = []
-    start_at = 0
-    pages = 0
-    while True:
-        resp = client.search(jql, start_at=start_at, max_results=max_results)
-        issues = resp.get("issues", [])
-        keys.extend([item.get("key") for item in issues if item.get("key")])
-        total = resp.get("total")
-        pages += 1
-        if max_pages and pages >= max_pages:
-            break
-        if isinstance(total, int):
-            start_at += max_results
-            if start_at >= total:
-                break
-        else:
-            if len(issues) < max_results:
-                break
-            start_at += max_results
-    return keys
+        return self._request("myself", f"{self.base_url}/rest/api/3/myself")
+
+
+def search_issues(jql, fields, max_results, sink, max_pages=0, width=1, journal=None):
+    yield from paginate(
+        lambda start_at: journaled(
+            journal,
+            "page",
+            [jql, fields, start_at, max_results],
+            call("search_with_fields", jql, fields, start_at, max_results),
+        ),
+        max_results,
+        lambda resp: sink(resp.get("issues", [])),
+        max_pages,
+        width,
+    )
 
 
-def paginate_search_with_fields(client, jql, max_results, fields, max_pages=0):
+def collect_issues(jql, fields, max_results, max_pages=0, width=1):
     issues = []
-    start_at = 0
-    pages = 0
-    while True:
-        resp = client.search_with_fields(jql, fields, start_at=start_at, max_results=max_results)
-        page = resp.get("issues", [])
-        issues.extend(page)
-        total = resp.get("total")
-        pages += 1
-        if max_pages and pages >= max_pages:
-            break
-        if isinstance(total, int):
-            start_at += max_results
-            if start_at >= total:
-                break
-        else:
-            if len(page) < max_results:
-                break
-            start_at += max_results
+    yield from search_issues(jql, fields, max_results, issues.extend, max_pages, width)
     return issues
 
 
-def comment_match(client, key, account_ids, author_names, start_ts, end_ts):
+def comment_match(key, account_ids, author_names, start_ts, end_ts):
     start_at = 0
     max_results = 100
     while True:
-        resp = client.comments(key, start_at=start_at, max_results=max_results)
+        resp = yield from call("comments", key, start_at, max_results)
         comments = resp.get("comments", [])
         for comment in comments:
             author = comment.get("author", {})
@@ -241,6 +251,36 @@ def comment_match(client, key, account_ids, author_names, start_ts, end_ts):
     return False
 
 
+def plan_field_searches(match_mode, comment_jql, assignee_jql):
+    if match_mode == "assignee":
+        return [("assignee", assignee_jql)]
+    if match_mode == "comment":
+        return [("comment", comment_jql)]
+    combined = combine_jql(comment_jql, assignee_jql, "OR" if match_mode == "any" else "AND")
+    if combined:
+        return [(match_mode, combined)]
+    return [("comment", comment_jql), ("assignee", assignee_jql)]
+
+
+def merge_planned_results(match_mode, searched):
+    by_key = {}
+    if len(searched) == 1:
+        for item in searched[0][1]:
+            by_key.setdefault(item.get("issue_key"), item)
+        return list(by_key.values())
+    found = dict(searched)
+    assignee_keys = {item.get("issue_key") for item in found["assignee"]}
+    for item in found["comment"]:
+        key = item.get("issue_key")
+        if match_mode == "both" and key not in assignee_keys:
+            continue
+        by_key.setdefault(key, item)
+    if match_mode == "any":
+        for item in found["assignee"]:
+            by_key.setdefault(item.get("issue_key"), item)
+    return list(by_key.values())
+
+
 def normalize_issue(issue):
     fields = issue.get("fields", {})
     issuelinks = []
@@ -273,12 +313,223 @@ def normalize_issue(issue):
     }
 
 
-def fetch_issue(client, key):
-    issue = client.issue(
-        key,
-        ["summary", "description", "issuetype", "project", "parent", "issuelinks"],
+def chunked(items, size):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def fetch_issue_chunk(keys, fields, journal=None):
+    return journaled(journal, "issues", [keys, fields], fetch_issues(keys, fields))
+
+
+def search_key_chunk(keys, fields):
+    jql = "key in (" + ", ".join(keys) + ")"
+    try:
+        return (yield from collect_issues(jql, fields, len(keys)))
+    except urllib.error.HTTPError as err:
+        # Jira rejects the whole query when one key no longer exists; split the
+        # chunk until the stale keys are isolated and skip them.
+        if err.code != 400:
+            raise
+    if len(keys) == 1:
+        return []
+    mid = len(keys) // 2
+    halves = yield Batch([search_key_chunk(keys[:mid], fields), search_key_chunk(keys[mid:], fields)], 2)
+    return halves[0] + halves[1]
+
+
+def fetch_issues(keys, fields):
+    try:
+        resp = yield from call("bulk_issues", keys, fields)
+    except urllib.error.HTTPError as err:
+        if err.code not in (404, 405):
+            raise
+        return (yield from search_key_chunk(keys, fields))
+    return resp.get("issues", [])
+
+
+def fetch_chunks(keys, fields, bulk_size, width):
+    chunks = yield Batch(
+        [fetch_issue_chunk(chunk, fields) for chunk in chunked(keys, bulk_size)], width
+    )
+    return [issue for issues in chunks for issue in issues]
+
+
+def write_chunks(writer, keys, bulk_size, width, journal=None):
+    def write(issues):
+        writer.write_many(normalize_issue(issue) for issue in issues)
+        return writer.full
+
+    yield Batch(
+        [fetch_issue_chunk(chunk, SOURCE_FIELDS, journal) for chunk in chunked(keys, bulk_size)],
+        width,
+        write,
+    )
+
+
+def scan_comment_matches(
+    keys, width, account_ids, author_names, start_ts, end_ts, journal=None
+):
+    found = yield Batch(
+        [
+            journaled(
+                journal,
+                "comments",
+                key,
+                comment_match(key, account_ids, author_names, start_ts, end_ts),
+            )
+            for key in keys
+        ],
+        width,
+    )
+    return [key for key, ok in zip(keys, found) if ok]
+
+
+def load_seed_keys(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        return list(dict.fromkeys(line.strip() for line in handle if line.strip()))
+
+
+def export_matches(
+    client,
+    writer,
+    match_mode,
+    comment_jql,
+    assignee_jql,
+    comment_match_enabled,
+    account_ids,
+    author_names,
+    start_ts,
+    end_ts,
+    max_results,
+    max_pages,
+    max_issues,
+    bulk_size,
+    seed_keys,
+    concurrency,
+    page_concurrency,
+    journal=None,
+):
+    if seed_keys is not None:
+        yield from write_chunks(writer, seed_keys, bulk_size, concurrency, journal)
+        return
+
+    if not comment_match_enabled or match_mode == "assignee":
+        plans = plan_field_searches(match_mode, comment_jql, assignee_jql)
+        assignee_keys = None
+        if match_mode == "both" and len(plans) > 1:
+            print("search plan: assignee")
+            assignee_keys = set(
+                (
+                    yield from search_keys(
+                        client, assignee_jql, max_results, max_pages, page_concurrency, journal
+                    )
+                )
+            )
+            plans = plans[:1]
+
+        def write_page(issues):
+            for issue in issues:
+                if assignee_keys is not None and issue.get("key") not in assignee_keys:
+                    continue
+                writer.write(normalize_issue(issue))
+                if writer.full:
+                    return True
+            return False
+
+        for label, jql in plans:
+            print(f"search plan: {label}")
+            yield from search_issues(
+                jql, SOURCE_FIELDS, max_results, write_page, max_pages, page_concurrency, journal
+            )
+        return
+
+    searches = [
+        search_keys(client, comment_jql, max_results, max_pages, page_concurrency, journal)
+    ]
+    if match_mode in ("any", "both"):
+        searches.append(
+            search_keys(client, assignee_jql, max_results, max_pages, page_concurrency, journal)
+        )
+    found = yield Batch(searches, len(searches))
+    comment_candidates = found[0]
+    assignee_keys = found[1] if len(found) > 1 else []
+    comment_matches = yield from scan_comment_matches(
+        comment_candidates, concurrency, account_ids, author_names, start_ts, end_ts, journal
     )
-    return normalize_issue(issue)
+
+    if match_mode == "comment":
+        final_keys = sorted(set(comment_matches))
+    elif match_mode == "both":
+        final_keys = sorted(set(comment_matches).intersection(assignee_keys))
+    else:
+        final_keys = sorted(set(comment_matches).union(assignee_keys))
+    if max_issues:
+        final_keys = final_keys[:max_issues]
+    yield from write_chunks(writer, final_keys, bulk_size, concurrency, journal)
+
+
+def store_rows(issues):
+    return [(normalize_issue(issue), (issue.get("fields") or {}).get("updated")) for issue in issues]
+
+
+def sync_store(store, client, project, start_ts, max_results, page_concurrency):
+    start = parse_timestamp(start_ts)
+    synced = 0
+    with store.sync_lock():
+        since, watermark = store.sync_state(project)
+        now = dt.datetime.now(dt.timezone.utc)
+        clauses = []
+        if since is None:
+            clauses.append(f'updated >= "{jql_datetime(start - SYNC_OVERLAP)}"')
+            since = start
+        else:
+            if start < since:
+                clauses.append(
+                    f'updated >= "{jql_datetime(start - SYNC_OVERLAP)}" '
+                    f'AND updated < "{jql_datetime(since + SYNC_OVERLAP)}"'
+                )
+                since = start
+            clauses.append(f'updated >= "{jql_datetime(watermark - SYNC_OVERLAP)}"')
+        for clause in clauses:
+            issues = run(
+                collect_issues(
+                    f"project = {project} AND {clause}",
+                    SOURCE_FIELDS + ["updated"],
+                    max_results,
+                    0,
+                    page_concurrency,
+                ),
+                client,
+            )
+            synced += store.upsert(store_rows(issues))
+        store.set_sync_state(project, since, now)
+    return synced
+
+
+def store_lookup(store, client, keys, synced_projects, bulk_size, concurrency):
+    keys = list(dict.fromkeys(keys))
+    found = {
+        key: item
+        for key, item in store.get_many(keys).items()
+        if item.get("project_key") in synced_projects
+    }
+    missing = [key for key in keys if key not in found]
+    if missing:
+        fetched = run(
+            fetch_chunks(missing, SOURCE_FIELDS + ["updated"], bulk_size, concurrency), client
+        )
+        rows = store_rows(fetched)
+        store.upsert(rows)
+        found.update({item.get("issue_key"): item for item, _ in rows})
+    return [found[key] for key in keys if key in found]
+
+
+def client_from_env(concurrency):
+    base_url = get_env("JIRA_BASE_URL", required=True)
+    email = get_env("JIRA_EMAIL", required=True)
+    token = get_env("JIRA_API_TOKEN", required=True)
+    limiter = limiter_from_env(concurrency)
+    return JiraClient(base_url, email, token, limiter=limiter, cache=cache_from_env())
 
 
 def main():
@@ -287,174 +538,221 @@ def main():
     args = parser.parse_args()
 
     load_env_file(get_env("ENV_FILE", ""))
-
-    base_url = get_env("JIRA_BASE_URL", required=True)
-    email = get_env("JIRA_EMAIL", required=True)
-    token = get_env("JIRA_API_TOKEN", required=True)
-    projects = get_env("PROJECTS", "")
-    jql_extra = get_env("JQL_EXTRA", "")
-    match_mode = get_env("MATCH_MODE", "any")
-    max_results = int(get_env("MAX_RESULTS", "100"))
-    max_pages = int(get_env("MAX_PAGES", "0"))
-    max_issues = int(get_env("MAX_ISSUES", "0"))
-    concurrency = int(get_env("CONCURRENCY", "8"))
-
-    start_date, end_date, start_ts, end_ts = build_date_range()
-    no_date_filter = get_env("NO_DATE_FILTER", "")
+    export_source(args.output)
+
+
+def export_source(output, overrides=None, client=None):
+    def setting(name, default=None, required=False):
+        if overrides and name in overrides:
+            return overrides[name]
+        return get_env(name, default, required)
+
+    projects = setting("PROJECTS", "")
+    jql_extra = setting("JQL_EXTRA", "")
+    match_mode = setting("MATCH_MODE", "any")
+    max_results = int(setting("MAX_RESULTS", "100"))
+    max_pages = int(setting("MAX_PAGES", "0"))
+    max_issues = int(setting("MAX_ISSUES", "0"))
+    concurrency = int(setting("CONCURRENCY", "8"))
+    page_concurrency = int(setting("PAGE_CONCURRENCY", "4"))
+    bulk_size = max(1, min(100, int(setting("BULK_FETCH_SIZE", "100"))))
+    key_page_size = int(setting("KEY_PAGE_SIZE", "1000"))
+    store_path = setting("ISSUE_STORE", "")
+    seed_keys_file = setting("SEED_KEYS_FILE", "")
+    engine = setting("ENGINE", "thread")
+    async_concurrency = int(setting("ASYNC_CONCURRENCY", "64"))
+    fmt = output_format(output, setting("OUTPUT_FORMAT", ""))
+
+    start_date, end_date, start_ts, end_ts = build_date_range(setting)
+    no_date_filter = setting("NO_DATE_FILTER", "")
     if no_date_filter and no_date_filter != "0":
         start_date = "1970/01/01"
         end_date = "2100/01/01"
         start_ts = "1970-01-01T00:00:00.000+0000"
         end_ts = "2100-01-01T00:00:00.000+0000"
 
-    client = JiraClient(base_url, email, token)
-    account_id = get_env("JIRA_ACCOUNT_ID", "")
-    if not account_id:
+    owned = client is None
+    if owned:
+        client = client_from_env(concurrency)
+    limiter = client.limiter
+    if limiter is not None:
+        concurrency = limiter.ceiling
+    cache = client.cache
+    account_id = setting("JIRA_ACCOUNT_ID", "")
+    if not account_id and not seed_keys_file:
         account_id = client.myself().get("accountId")
         if not account_id:
             raise SystemExit("Failed to resolve accountId from /myself.")
     author_names = set()
-    display_names = get_env("COMMENT_AUTHOR_DISPLAY", "")
+    display_names = setting("COMMENT_AUTHOR_DISPLAY", "")
     if display_names:
         author_names.update(
             {name.strip() for name in display_names.split(",") if name.strip()}
         )
     if not author_names:
-        display_name = get_env("JIRA_DISPLAY_NAME", "")
+        display_name = setting("JIRA_DISPLAY_NAME", "")
         if display_name:
             author_names.add(display_name)
     account_ids = {account_id} if account_id else set()
 
-    comment_jql = f'updated >= "{start_date}" AND updated < "{end_date}"'
-    if account_id:
-        assignee_jql = (
-            f'assignee WAS accountId("{account_id}") DURING ("{start_date}","{end_date}")'
-        )
-    else:
-        assignee_jql = f'assignee WAS currentUser() DURING ("{start_date}","{end_date}")'
-    comment_override = get_env("COMMENT_JQL", "")
-    comment_template = get_env("COMMENT_JQL_TEMPLATE", "")
-    comment_match_enabled = get_env("COMMENT_MATCH", "0") != "0"
-    if projects:
-        project_list = [p.strip() for p in projects.split(",") if p.strip()]
-        project_filter = "project in (" + ", ".join(project_list) + ")"
-        comment_jql += f" AND {project_filter}"
-        assignee_jql += f" AND {project_filter}"
-    if jql_extra:
-        comment_jql += f" AND {jql_extra}"
-        assignee_jql += f" AND {jql_extra}"
-
-    if comment_template:
-        comment_jql = comment_template.format(start_date=start_date, end_date=end_date)
-        if projects:
-            comment_jql += f" AND {project_filter}"
-        if jql_extra:
-            comment_jql += f" AND {jql_extra}"
-    elif comment_override:
-        comment_jql = comment_override
-        if projects:
-            comment_jql += f" AND {project_filter}"
-        if jql_extra:
-            comment_jql += f" AND {jql_extra}"
+    comment_override = setting("COMMENT_JQL", "")
+    comment_template = setting("COMMENT_JQL_TEMPLATE", "")
+    comment_match_enabled = setting("COMMENT_MATCH", "0") != "0"
+    project_list = [p.strip() for p in projects.split(",") if p.strip()]
+    comment_jql, assignee_jql = match_jql(
+        start_date,
+        end_date,
+        account_id,
+        projects,
+        jql_extra,
+        comment_override,
+        comment_template,
+    )
 
-    assignee_override = get_env("ASSIGNEE_JQL", "")
+    assignee_override = setting("ASSIGNEE_JQL", "")
     if assignee_override:
         assignee_jql = assignee_override
 
     if match_mode not in ("any", "comment", "assignee", "both"):
         raise SystemExit("MATCH_MODE must be one of: any, comment, assignee, both.")
+    if seed_keys_file and store_path:
+        raise SystemExit("SEED_KEYS_FILE cannot be combined with ISSUE_STORE.")
 
     print(f"date range: {start_date} to {end_date}")
+    if seed_keys_file:
+        match_mode = "seed"
     print(f"match mode: {match_mode}")
 
-    comment_candidates = []
-    assignee_keys = []
-    if match_mode in ("any", "comment", "both"):
-        comment_candidates = paginate_search(client, comment_jql, max_results, max_pages)
-    if match_mode in ("any", "assignee", "both"):
-        assignee_keys = paginate_search(client, assignee_jql, max_results, max_pages)
-
-    comment_matches = []
-    comment_results = []
-    if match_mode in ("any", "comment", "both"):
-        if not comment_match_enabled:
-            comment_issues = paginate_search_with_fields(
+    if engine not in ("thread", "async"):
+        raise SystemExit("ENGINE must be one of: thread, async.")
+    if engine == "async" and store_path:
+        raise SystemExit("ENGINE=async cannot be combined with ISSUE_STORE; use ENGINE=thread.")
+
+    seed_keys = None
+    if seed_keys_file:
+        seed_keys = load_seed_keys(seed_keys_file)
+        if max_issues:
+            seed_keys = seed_keys[:max_issues]
+        print(f"seed keys: {len(seed_keys)} ({len(chunked(seed_keys, bulk_size))} chunks)")
+
+    store = None
+    if store_path:
+        if not project_list:
+            raise SystemExit("ISSUE_STORE requires PROJECTS.")
+        if jql_extra:
+            raise SystemExit("ISSUE_STORE cannot be combined with JQL_EXTRA; use a separate export.")
+        store = IssueStore(store_path)
+        for project in project_list:
+            synced = sync_store(store, client, project, start_ts, max_results, page_concurrency)
+            print(f"store sync {project}: {synced} issues")
+
+    journal = journal_from_env(
+        output,
+        {
+            "match_mode": match_mode,
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+            "comment_jql": comment_jql,
+            "assignee_jql": assignee_jql,
+            "comment_match": comment_match_enabled,
+            "account_ids": sorted(account_ids),
+            "author_names": sorted(author_names),
+            "seed_keys": seed_keys,
+            "max_issues": max_issues,
+            "issue_store": store_path,
+        },
+        setting,
+    )
+
+    with journal or contextlib.nullcontext(), IssueWriter(output, fmt, limit=max_issues) as writer:
+        if store is not None:
+            searched = []
+            if match_mode in ("any", "comment", "both"):
+                if comment_override or comment_template:
+                    keys = run(
+                        search_keys(
+                            client, comment_jql, key_page_size, max_pages, page_concurrency, journal
+                        ),
+                        client,
+                    )
+                    comment_items = store_lookup(
+                        store, client, keys, project_list, bulk_size, concurrency
+                    )
+                else:
+                    comment_items = store.window(project_list, start_ts, end_ts)
+                if comment_match_enabled:
+                    candidates = [item.get("issue_key") for item in comment_items]
+                    if cache is not None:
+                        client.updated.update(store.updated_many(candidates))
+                    matched = set(
+                        run(
+                            scan_comment_matches(
+                                candidates,
+                                concurrency,
+                                account_ids,
+                                author_names,
+                                start_ts,
+                                end_ts,
+                                journal,
+                            ),
+                            client,
+                        )
+                    )
+                    comment_items = [item for item in comment_items if item.get("issue_key") in matched]
+                searched.append(("comment", comment_items))
+            if match_mode in ("any", "assignee", "both"):
+                keys = run(
+                    search_keys(
+                        client, assignee_jql, key_page_size, max_pages, page_concurrency, journal
+                    ),
+                    client,
+                )
+                searched.append(
+                    ("assignee", store_lookup(store, client, keys, project_list, bulk_size, concurrency))
+                )
+            writer.write_many(merge_planned_results(match_mode, searched))
+            store.close()
+        else:
+            steps = export_matches(
                 client,
+                writer,
+                match_mode,
                 comment_jql,
+                assignee_jql,
+                comment_match_enabled,
+                account_ids,
+                author_names,
+                start_ts,
+                end_ts,
                 max_results,
-                ["summary", "description", "issuetype", "project", "parent", "issuelinks"],
                 max_pages,
+                max_issues,
+                bulk_size,
+                seed_keys,
+                concurrency,
+                page_concurrency,
+                journal,
             )
-            comment_results = [normalize_issue(issue) for issue in comment_issues]
-            comment_matches = [item.get("issue_key") for item in comment_results if item.get("issue_key")]
-        else:
-            with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
-                tasks = {
-                    pool.submit(
-                        comment_match, client, key, account_ids, author_names, start_ts, end_ts
-                    ): key
-                    for key in comment_candidates
+            if engine == "async":
+                limits = {
+                    "search": page_concurrency,
+                    "comment": async_concurrency,
+                    "issue": async_concurrency,
                 }
-                for future in futures.as_completed(tasks):
-                    key = tasks[future]
-                    if future.result():
-                        comment_matches.append(key)
-
-    if match_mode == "comment":
-        final_keys = sorted(set(comment_matches))
-    elif match_mode == "assignee":
-        final_keys = sorted(set(assignee_keys))
-    elif match_mode == "both":
-        final_keys = sorted(set(comment_matches).intersection(assignee_keys))
-    else:
-        final_keys = sorted(set(comment_matches).union(assignee_keys))
-
-    results = []
-    if match_mode == "assignee":
-        issues = paginate_search_with_fields(
-            client,
-            assignee_jql,
-            max_results,
-            ["summary", "description", "issuetype", "project", "parent", "issuelinks"],
-            max_pages,
-        )
-        results = [normalize_issue(issue) for issue in issues]
-    elif match_mode == "comment" and not comment_match_enabled:
-        results = comment_results
-    elif match_mode in ("any", "both") and not comment_match_enabled:
-        assignee_issues = paginate_search_with_fields(
-            client,
-            assignee_jql,
-            max_results,
-            ["summary", "description", "issuetype", "project", "parent", "issuelinks"],
-            max_pages,
-        )
-        assignee_results = [normalize_issue(issue) for issue in assignee_issues]
-        by_key = {item.get("issue_key"): item for item in comment_results if item.get("issue_key")}
-        for item in assignee_results:
-            key = item.get("issue_key")
-            if not key:
-                continue
-            if match_mode == "both" and key not in comment_matches:
-                continue
-            if key not in by_key:
-                by_key[key] = item
-        results = list(by_key.values())
-    else:
-        with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
-            if max_issues:
-                final_keys = final_keys[:max_issues]
-            tasks = {pool.submit(fetch_issue, client, key): key for key in final_keys}
-            for future in futures.as_completed(tasks):
-                results.append(future.result())
-
-    if max_issues:
-        results = results[:max_issues]
-
-    with open(args.output, "w", encoding="utf-8") as handle:
-        json.dump(results, handle, ensure_ascii=True, indent=2)
-
-    print(f"Wrote: {args.output}")
+                asyncio.run(run_session(steps, client, limits))
+            else:
+                run(steps, client)
+
+    print(f"Wrote: {output}")
+    if journal is not None:
+        print(journal.summary())
+    if not owned:
+        return
+    if limiter is not None:
+        print(limiter.summary())
+    if cache is not None:
+        print(cache.summary())
+        cache.close()
 
 
 if __name__ == "__main__":
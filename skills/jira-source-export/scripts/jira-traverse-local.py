@@ -1,68 +1,41 @@
 #!/usr/bin/env python3
 import argparse
 import json
-from collections import deque, defaultdict
+from collections import deque
 
+from jira_graph import load_graph
 
-def load_data(path):
-    with open(path, "r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    index = {}
-    for item in data:
-        key = item.get("issue_key")
-        if key:
-            index[key] = item
-    return index
 
-
-def neighbors(issue):
-    rels = []
-    parent = issue.get("parent_key")
-    if parent:
-        rels.append((parent, "parent"))
-    for link in issue.get("issuelinks", []) or []:
-        link_key = link.get("issue_key")
-        if link_key:
-            rels.append((link_key, "relates"))
-    return rels
-
-
-def infer_project_key(issue_key):
-    if not issue_key or "-" not in issue_key:
-        return None
-    return issue_key.split("-", 1)[0]
-
-
-def traverse(index, root_key, max_depth):
+def traverse(graph, root_key, max_depth):
     results = []
     missing = set()
-    visited = set()
-    queue = deque([(root_key, 0)])
-    visited.add(root_key)
+    root = graph.find(root_key)
+    if root < 0:
+        return results, {root_key}
+    visited = {root}
+    queue = deque([(root, 0)])
 
     while queue:
         current, depth = queue.popleft()
-        issue = index.get(current)
-        if not issue:
-            missing.add(current)
+        if not graph.node_present[current]:
+            missing.add(graph.keys[current])
             continue
         if depth >= max_depth:
             continue
-        for nxt, relation in neighbors(issue):
+        current_key = graph.keys[current]
+        for nxt, relation in graph.neighbors(current):
             if nxt in visited:
                 continue
             visited.add(nxt)
-            to_project_key = (index.get(nxt) or {}).get("project_key")
-            if not to_project_key:
-                to_project_key = infer_project_key(nxt)
-                if nxt not in index:
-                    missing.add(nxt)
+            nxt_key = graph.keys[nxt]
+            if not graph.node_present[nxt]:
+                missing.add(nxt_key)
             results.append(
                 {
-                    "from_key": current,
-                    "to_key": nxt,
+                    "from_key": current_key,
+                    "to_key": nxt_key,
                     "relation_type": relation,
-                    "to_project_key": to_project_key,
+                    "to_project_key": graph.project_key(nxt),
                     "depth": depth + 1,
                 }
             )
@@ -72,7 +45,7 @@ def traverse(index, root_key, max_depth):
 
 def main():
     parser = argparse.ArgumentParser(description="Traverse local Jira JSON graph.")
-    parser.add_argument("input_json", help="Path to jira-source JSON file")
+    parser.add_argument("input_json", help="Path to jira-source JSON/NDJSON or compiled .jgraph file")
     parser.add_argument("root_key", help="Root issue key (e.g., MGTT-14108)")
     parser.add_argument("--max-depth", type=int, default=5)
     parser.add_argument("--only-itpt", action="store_true")
@@ -82,7 +55,7 @@ def main():
     parser.add_argument("--missing-output", default="")
     args = parser.parse_args()
 
-    index = load_data(args.input_json)
+    graph = load_graph(args.input_json)
     root_keys = []
     if args.batch_file:
         with open(args.batch_file, "r", encoding="utf-8") as handle:
@@ -95,7 +68,7 @@ def main():
 
     all_outputs = []
     for root_key in root_keys:
-        edges, missing = traverse(index, root_key, args.max_depth)
+        edges, missing = traverse(graph, root_key, args.max_depth)
         if args.only_itpt:
             edges = [e for e in edges if e.get("to_project_key") == "ITPT"]
         all_outputs.append({"root_key": root_key, "edges": edges, "missing_keys": sorted(missing)})
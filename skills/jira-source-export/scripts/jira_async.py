@@ -0,0 +1,462 @@
+import asyncio
+import http.client
+import io
+import ssl
+import time
+import types
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from jira_http import (
+    Response,
+    get_budget,
+    get_cassette,
+    get_inflight,
+    json_payload,
+    parse_retry_after,
+    record,
+    replay,
+)
+
+NO_BODY_STATUSES = (204, 304)
+
+
+class AsyncHTTPClient:
+    def __init__(self, max_connections=100):
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle = {}
+        self.context = ssl.create_default_context()
+        self.proxies = urllib.request.getproxies()
+
+    def _proxy_for(self, scheme, host):
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parsed = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        return parsed.hostname, parsed.port or 8080
+
+    async def _open(self, scheme, host, port):
+        proxy = self._proxy_for(scheme, host)
+        if proxy is None:
+            if scheme == "https":
+                return await asyncio.open_connection(
+                    host, port, ssl=self.context, server_hostname=host
+                )
+            return await asyncio.open_connection(host, port)
+        reader, writer = await asyncio.open_connection(*proxy)
+        if scheme == "http":
+            return reader, writer
+        writer.write(f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        status_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or parts[1] != b"200":
+            writer.close()
+            raise urllib.error.URLError(f"proxy CONNECT failed: {status_line!r}")
+        await writer.start_tls(self.context, server_hostname=host)
+        return reader, writer
+
+    async def _read_response(self, reader, method):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        parts = status_line.decode("latin-1").rstrip("\r\n").split(None, 2)
+        if len(parts) < 2:
+            raise http.client.BadStatusLine(status_line)
+        version, status = parts[0], int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ""
+        headers = http.client.HTTPMessage()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip()] = value.strip()
+        connection = (headers.get("Connection") or "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        if method == "HEAD" or status < 200 or status in NO_BODY_STATUSES:
+            return status, reason, headers, b"", keep_alive
+        if "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+                if not size:
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return status, reason, headers, b"".join(chunks), keep_alive
+        length = headers.get("Content-Length")
+        if length is not None:
+            return status, reason, headers, await reader.readexactly(int(length)), keep_alive
+        return status, reason, headers, await reader.read(), False
+
+    async def request(self, method, url, headers=None, body=None, timeout=30):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unsupported scheme: {scheme}")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if scheme == "http" and self._proxy_for(scheme, host):
+            target = url
+        default_port = 443 if scheme == "https" else 80
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {host}" + ("" if port == default_port else f":{port}"),
+            "Connection: keep-alive",
+        ]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+        pool_key = (scheme, host, port)
+        async with self.slots:
+            while True:
+                idle = self.idle.get(pool_key)
+                reused = bool(idle)
+                if reused:
+                    reader, writer = idle.pop()
+                else:
+                    try:
+                        reader, writer = await asyncio.wait_for(
+                            self._open(scheme, host, port), timeout
+                        )
+                    except (OSError, asyncio.TimeoutError) as err:
+                        raise urllib.error.URLError(err)
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    status, reason, resp_headers, data, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader, method), timeout
+                    )
+                except (
+                    OSError,
+                    asyncio.IncompleteReadError,
+                    asyncio.TimeoutError,
+                    http.client.HTTPException,
+                    ValueError,
+                ) as err:
+                    writer.close()
+                    if reused and not isinstance(err, asyncio.TimeoutError):
+                        continue
+                    raise urllib.error.URLError(err)
+                if keep_alive:
+                    self.idle.setdefault(pool_key, []).append((reader, writer))
+                else:
+                    writer.close()
+                return Response(status, reason, resp_headers, data)
+
+    async def close(self):
+        for conns in self.idle.values():
+            for _, writer in conns:
+                writer.close()
+        self.idle = {}
+
+
+async def reserve_budget():
+    budget = get_budget()
+    if budget is None:
+        return None
+    loop = asyncio.get_running_loop()
+    while True:
+        wait = await loop.run_in_executor(None, budget.reserve)
+        if not wait:
+            return budget
+        await asyncio.sleep(wait)
+
+
+async def acquire_blocking(acquire, undo):
+    acquired = asyncio.get_running_loop().run_in_executor(None, acquire)
+    try:
+        await asyncio.shield(acquired)
+    except asyncio.CancelledError:
+        acquired.add_done_callback(lambda _: undo())
+        raise
+
+
+async def acquire_inflight():
+    gate = get_inflight()
+    if gate is None:
+        return None
+    if not gate.acquire(blocking=False):
+        await acquire_blocking(gate.acquire, gate.release)
+    return gate
+
+
+async def transfer(client, method, url, headers, body, timeout, limiter):
+    if limiter is None:
+        return await client.request(method, url, headers=headers, body=body, timeout=timeout)
+    if not limiter.acquire(blocking=False):
+        await acquire_blocking(limiter.acquire, limiter.abandon)
+    started = time.monotonic()
+    throttled = False
+    try:
+        resp = await client.request(method, url, headers=headers, body=body, timeout=timeout)
+        throttled = resp.status in (429, 503)
+        return resp
+    finally:
+        limiter.release(time.monotonic() - started, throttled)
+
+
+async def request(client, method, url, headers=None, body=None, timeout=30, limiter=None):
+    loop = asyncio.get_running_loop()
+    cassette = get_cassette() is not None
+    resp = await loop.run_in_executor(None, replay, method, url, body) if cassette else None
+    if resp is None:
+        budget = await reserve_budget()
+        gate = await acquire_inflight()
+        try:
+            resp = await transfer(client, method, url, headers, body, timeout, limiter)
+        finally:
+            if gate is not None:
+                gate.release()
+        if budget is not None:
+            await loop.run_in_executor(None, budget.observe, resp.status, resp.headers)
+        if cassette:
+            await loop.run_in_executor(None, record, method, url, body, resp)
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            url, resp.status, resp.reason, resp.headers, io.BytesIO(resp.body)
+        )
+    return resp
+
+
+async def send(
+    client,
+    url,
+    headers,
+    params=None,
+    data=None,
+    timeout=30,
+    max_retries=5,
+    backoff=2.0,
+    method=None,
+    limiter=None,
+):
+    if params:
+        url = url + "?" + urllib.parse.urlencode(params, doseq=True)
+    if method is None:
+        method = "POST" if data is not None else "GET"
+    attempt = 0
+    delay = backoff
+    while True:
+        try:
+            return await request(
+                client, method, url, headers=headers, body=data, timeout=timeout, limiter=limiter
+            )
+        except urllib.error.HTTPError as err:
+            if err.code in (429, 503) and attempt < max_retries:
+                retry_after = parse_retry_after(err.headers.get("Retry-After"))
+                await asyncio.sleep(retry_after if retry_after is not None else delay)
+                if retry_after is None:
+                    delay *= 2
+                attempt += 1
+                continue
+            raise
+        except urllib.error.URLError:
+            if attempt < max_retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+                attempt += 1
+                continue
+            raise
+
+
+async def request_json(
+    client,
+    url,
+    headers,
+    params=None,
+    data=None,
+    timeout=30,
+    max_retries=5,
+    backoff=2.0,
+    method=None,
+    limiter=None,
+):
+    resp = await send(
+        client, url, headers, params, data, timeout, max_retries, backoff, method, limiter
+    )
+    return resp.json()
+
+
+async def cached_request_json(
+    client,
+    cache,
+    url,
+    headers,
+    params=None,
+    updated=None,
+    timeout=30,
+    max_retries=5,
+    backoff=2.0,
+    limiter=None,
+):
+    if cache is None:
+        return await request_json(
+            client,
+            url,
+            headers,
+            params,
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff=backoff,
+            limiter=limiter,
+        )
+    if params:
+        url = url + "?" + urllib.parse.urlencode(params, doseq=True)
+    loop = asyncio.get_running_loop()
+    entry = await loop.run_in_executor(None, cache.lookup, url)
+    if entry is not None and updated and entry["updated"] == updated:
+        return await loop.run_in_executor(None, cache.hit, url, entry, updated)
+    resp = await send(
+        client,
+        url,
+        {**headers, **cache.conditional_headers(entry)},
+        timeout=timeout,
+        max_retries=max_retries,
+        backoff=backoff,
+        limiter=limiter,
+    )
+    if resp.status == 304 and entry is not None:
+        return await loop.run_in_executor(None, cache.hit, url, entry, updated, True)
+    await loop.run_in_executor(None, cache.store, url, resp, updated)
+    return resp.json()
+
+
+class AsyncJiraSession:
+    def __init__(self, headers, limits, timeout=30, max_retries=5, backoff=2.0, limiter=None):
+        self.headers = headers
+        self.limiter = limiter
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.client = AsyncHTTPClient(max(1, sum(limits.values())))
+        self.semaphores = {name: asyncio.Semaphore(max(1, size)) for name, size in limits.items()}
+        self.started = time.monotonic()
+        self.counts = {name: 0 for name in limits}
+
+    async def call(self, endpoint, url, params=None, data=None, headers=None):
+        async with self.semaphores[endpoint]:
+            self.counts[endpoint] += 1
+            return await request_json(
+                self.client,
+                url,
+                headers or self.headers,
+                params=params,
+                data=data,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                backoff=self.backoff,
+                limiter=self.limiter,
+            )
+
+    async def cached_call(self, endpoint, cache, url, params=None, updated=None):
+        async with self.semaphores[endpoint]:
+            self.counts[endpoint] += 1
+            return await cached_request_json(
+                self.client,
+                cache,
+                url,
+                self.headers,
+                params=params,
+                updated=updated,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                backoff=self.backoff,
+                limiter=self.limiter,
+            )
+
+    async def close(self):
+        await self.client.close()
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        calls = ", ".join(f"{name}={count}" for name, count in self.counts.items() if count)
+        return f"async engine: {calls or 'no calls'} in {elapsed:.1f}s"
+
+
+class AsyncJiraClient:
+    def __init__(self, client, limits):
+        self.client = client
+        self.session = AsyncJiraSession(
+            client.headers,
+            limits,
+            client.timeout,
+            client.max_retries,
+            client.backoff,
+            client.limiter,
+        )
+
+    def __getattr__(self, name):
+        method = getattr(type(self.client), name, None)
+        if callable(method):
+            return types.MethodType(method, self)
+        return getattr(self.client, name)
+
+    def _request(self, endpoint, url, params=None, data=None):
+        headers, body = json_payload(self.client.headers, data)
+        return self.session.call(endpoint, url, params=params, data=body, headers=headers)
+
+    def _cached(self, endpoint, key, url, params):
+        return self.session.cached_call(
+            endpoint, self.client.cache, url, params, self.client.updated.get(key)
+        )
+
+    async def close(self):
+        await self.session.close()
+
+
+async def perform(client, request):
+    if isinstance(request, tuple):
+        name, args = request
+        return await getattr(client, name)(*args)
+    return await run(request, client)
+
+
+async def run_batch(batch, client):
+    tasks = [asyncio.ensure_future(perform(client, request)) for request in batch.requests]
+    try:
+        if batch.sink is None:
+            return list(await asyncio.gather(*tasks))
+        for task in tasks:
+            if batch.sink(await task):
+                break
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run(steps, client):
+    resume = steps.send
+    value = None
+    while True:
+        try:
+            batch = resume(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value = await run_batch(batch, client)
+            resume = steps.send
+        except Exception as err:
+            value = err
+            resume = steps.throw
+
+
+async def run_session(steps, client, limits):
+    session_client = AsyncJiraClient(client, limits)
+    try:
+        return await run(steps, session_client)
+    finally:
+        await session_client.close()
+        print(session_client.session.summary())
@@ -0,0 +1,117 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    updated TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_used ON responses (used);
+"""
+
+
+class ResponseCache:
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "evicted": 0}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, updated, body FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, updated, body = row
+        return {"etag": etag, "last_modified": last_modified, "updated": updated, "body": body}
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def payload(self, entry):
+        return json.loads(zlib.decompress(entry["body"]).decode("utf-8"))
+
+    def hit(self, url, entry, updated, revalidated=False):
+        with self.lock:
+            self.stats["revalidated" if revalidated else "fresh"] += 1
+            self.conn.execute(
+                "UPDATE responses SET used = ?, updated = COALESCE(?, updated) WHERE url = ?",
+                (time.time(), updated, url),
+            )
+            self.conn.commit()
+        return self.payload(entry)
+
+    def store(self, url, resp, updated):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not (etag or last_modified or updated):
+            with self.lock:
+                self.stats["fetched"] += 1
+            return
+        body = zlib.compress(resp.body or b"{}", 6)
+        with self.lock:
+            self.stats["fetched"] += 1
+            # Other processes may share the file, so the size is summed inside
+            # the write transaction rather than tracked per process.
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, etag, last_modified, updated, body, size, used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, updated, body, len(body), time.time()),
+            )
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(total)
+            self.conn.commit()
+
+    def _evict(self, total):
+        target = self.max_bytes * 0.9
+        victims = []
+        for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY used"):
+            if total <= target:
+                break
+            victims.append((url,))
+            total -= size
+        self.conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+        self.stats["evicted"] += len(victims)
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        return (
+            f"http cache: {stats['fresh']} fresh, {stats['revalidated']} revalidated (304), "
+            f"{stats['fetched']} fetched, {stats['evicted']} evicted ({self.path})"
+        )
+
+
+def cache_from_env():
+    path = os.environ.get("HTTP_CACHE", "")
+    if not path:
+        return None
+    max_mb = float(os.environ.get("HTTP_CACHE_MAX_MB", "512"))
+    return ResponseCache(os.path.expanduser(path), int(max_mb * 1024 * 1024))
@@ -0,0 +1,149 @@
+import hashlib
+import http.client
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+
+MODES = ("record", "replay", "auto")
+TRANSIENT_STATUSES = (429, 502, 503, 504)
+SKIPPED_HEADERS = ("set-cookie", "date", "connection", "keep-alive", "transfer-encoding")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    request_key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    reason TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded_at REAL NOT NULL
+);
+"""
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def normalize_url(url):
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    return urllib.parse.urlunsplit(
+        (
+            parts.scheme.lower(),
+            (parts.hostname or "").lower() + (f":{parts.port}" if parts.port else ""),
+            parts.path.rstrip("/") or "/",
+            urllib.parse.urlencode(query),
+            "",
+        )
+    )
+
+
+def normalize_body(body):
+    if not body:
+        return b""
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        return body
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def request_key(method, url, body=None):
+    digest = hashlib.sha256()
+    digest.update(method.upper().encode("ascii"))
+    digest.update(b"\0")
+    digest.update(normalize_url(url).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_body(body))
+    return digest.hexdigest()
+
+
+class Cassette:
+    def __init__(self, path, mode="auto"):
+        if mode not in MODES:
+            raise SystemExit("JIRA_CASSETTE_MODE must be one of: record, replay, auto.")
+        if mode == "replay" and not os.path.exists(path):
+            raise SystemExit(f"Cassette not found: {path}")
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        if mode != "replay":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def get(self, method, url, body=None):
+        if self.mode == "record":
+            return None
+        key = request_key(method, url, body)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, reason, headers, body FROM responses WHERE request_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            if self.mode == "replay":
+                raise CassetteMiss(f"{method} {normalize_url(url)} is not in cassette {self.path}")
+            return None
+        status, reason, headers, data = row
+        message = http.client.HTTPMessage()
+        for name, value in json.loads(headers):
+            message[name] = value
+        return status, reason, message, zlib.decompress(data)
+
+    def put(self, method, url, body, status, reason, headers, data):
+        if self.mode == "replay" or status == 304 or status in TRANSIENT_STATUSES:
+            return
+        pairs = [
+            [name, value] for name, value in headers.items() if name.lower() not in SKIPPED_HEADERS
+        ]
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(request_key, method, url, status, reason, headers, body, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request_key(method, url, body),
+                    method.upper(),
+                    normalize_url(url),
+                    status,
+                    reason,
+                    json.dumps(pairs),
+                    zlib.compress(data or b"", 6),
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+            self.recorded += 1
+
+    def summary(self):
+        return (
+            f"cassette {self.mode}: {self.hits} replayed, {self.recorded} recorded, "
+            f"{self.misses} missed ({self.path})"
+        )
+
+
+def cassette_from_env():
+    path = os.environ.get("JIRA_CASSETTE", "")
+    if not path:
+        return None
+    mode = os.environ.get("JIRA_CASSETTE_MODE", "auto").strip().lower() or "auto"
+    return Cassette(os.path.expanduser(path), mode)
@@ -0,0 +1,278 @@
+import array
+import mmap
+import os
+import struct
+import sys
+
+from jira_records import iter_issues
+
+MAGIC = b"JGRAPH01"
+RELATIONS = ("parent", "relates")
+SECTIONS = (
+    ("key_offsets", "I"),
+    ("key_blob", "B"),
+    ("node_present", "B"),
+    ("node_project", "i"),
+    ("project_offsets", "I"),
+    ("project_blob", "B"),
+    ("edge_offsets", "I"),
+    ("edge_targets", "I"),
+    ("edge_relations", "B"),
+    ("reverse_offsets", "I"),
+    ("reverse_sources", "I"),
+    ("summary_offsets", "I"),
+    ("summary_blob", "B"),
+    ("description_offsets", "I"),
+    ("description_blob", "B"),
+)
+HEADER = struct.Struct("<8sBII")
+SECTION_ENTRY = struct.Struct("<QQ")
+
+
+def infer_project_key(issue_key):
+    if not issue_key or "-" not in issue_key:
+        return None
+    return issue_key.split("-", 1)[0]
+
+
+def is_compiled(path):
+    with open(path, "rb") as handle:
+        return handle.read(len(MAGIC)) == MAGIC
+
+
+def string_table(values):
+    offsets = array.array("I", [0])
+    blob = bytearray()
+    for value in values:
+        blob.extend((value or "").encode("utf-8"))
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def compile_graph(issues):
+    index = {}
+    for item in issues:
+        key = item.get("issue_key")
+        if key:
+            index[key] = item
+    nodes = set(index)
+    for issue in index.values():
+        parent = issue.get("parent_key")
+        if parent:
+            nodes.add(parent)
+        for link in issue.get("issuelinks", []) or []:
+            if link.get("issue_key"):
+                nodes.add(link["issue_key"])
+    keys = sorted(nodes)
+    ids = {key: i for i, key in enumerate(keys)}
+
+    projects = []
+    project_ids = {}
+    node_present = array.array("B")
+    node_project = array.array("i")
+    for key in keys:
+        issue = index.get(key)
+        node_present.append(1 if issue is not None else 0)
+        project = (issue or {}).get("project_key") or infer_project_key(key)
+        if project is None:
+            node_project.append(-1)
+            continue
+        if project not in project_ids:
+            project_ids[project] = len(projects)
+            projects.append(project)
+        node_project.append(project_ids[project])
+
+    edge_offsets = array.array("I", [0])
+    edge_targets = array.array("I")
+    edge_relations = array.array("B")
+    reverse = [[] for _ in keys]
+    for node, key in enumerate(keys):
+        issue = index.get(key)
+        if issue is not None:
+            parent = issue.get("parent_key")
+            if parent:
+                edge_targets.append(ids[parent])
+                edge_relations.append(0)
+                reverse[ids[parent]].append(node)
+            for link in issue.get("issuelinks", []) or []:
+                link_key = link.get("issue_key")
+                if link_key:
+                    edge_targets.append(ids[link_key])
+                    edge_relations.append(1)
+                    reverse[ids[link_key]].append(node)
+        edge_offsets.append(len(edge_targets))
+    reverse_offsets = array.array("I", [0])
+    reverse_sources = array.array("I")
+    for sources in reverse:
+        reverse_sources.extend(sources)
+        reverse_offsets.append(len(reverse_sources))
+
+    key_offsets, key_blob = string_table(keys)
+    project_offsets, project_blob = string_table(projects)
+    summary_offsets, summary_blob = string_table(
+        (index.get(key) or {}).get("summary") for key in keys
+    )
+    description_offsets, description_blob = string_table(
+        (index.get(key) or {}).get("description_summary") for key in keys
+    )
+    sections = {
+        "key_offsets": key_offsets,
+        "key_blob": key_blob,
+        "node_present": node_present,
+        "node_project": node_project,
+        "project_offsets": project_offsets,
+        "project_blob": project_blob,
+        "edge_offsets": edge_offsets,
+        "edge_targets": edge_targets,
+        "edge_relations": edge_relations,
+        "reverse_offsets": reverse_offsets,
+        "reverse_sources": reverse_sources,
+        "summary_offsets": summary_offsets,
+        "summary_blob": summary_blob,
+        "description_offsets": description_offsets,
+        "description_blob": description_blob,
+    }
+
+    byteorder = 0 if sys.byteorder == "little" else 1
+    table_size = HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+    payload = bytearray()
+    entries = []
+    for name, _ in SECTIONS:
+        data = sections[name]
+        raw = data.tobytes() if isinstance(data, array.array) else data
+        while (table_size + len(payload)) % 8:
+            payload.append(0)
+        entries.append((table_size + len(payload), len(raw)))
+        payload.extend(raw)
+    out = bytearray(HEADER.pack(MAGIC, byteorder, len(keys), len(edge_targets)))
+    for offset, length in entries:
+        out.extend(SECTION_ENTRY.pack(offset, length))
+    out.extend(payload)
+    return bytes(out)
+
+
+def write_graph(issues, path):
+    data = compile_graph(issues)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+class Strings:
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i] : self.offsets[i + 1]]).decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class Graph:
+    def __init__(self, buffer, handle=None):
+        self._buffer = buffer
+        self._handle = handle
+        view = memoryview(buffer)
+        magic, byteorder, node_count, edge_count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a compiled Jira graph.")
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            raise ValueError("Compiled Jira graph has a different byte order; recompile it.")
+        self.node_count = node_count
+        self.edge_count = edge_count
+        sections = {}
+        for i, (name, code) in enumerate(SECTIONS):
+            offset, length = SECTION_ENTRY.unpack_from(view, HEADER.size + i * SECTION_ENTRY.size)
+            raw = view[offset : offset + length]
+            sections[name] = raw if code == "B" and name.endswith("_blob") else raw.cast(code)
+        self.keys = Strings(sections["key_offsets"], sections["key_blob"])
+        self.projects = Strings(sections["project_offsets"], sections["project_blob"])
+        self.summaries = Strings(sections["summary_offsets"], sections["summary_blob"])
+        self.descriptions = Strings(sections["description_offsets"], sections["description_blob"])
+        self.node_present = sections["node_present"]
+        self.node_project = sections["node_project"]
+        self.edge_offsets = sections["edge_offsets"]
+        self.edge_targets = sections["edge_targets"]
+        self.edge_relations = sections["edge_relations"]
+        self.reverse_offsets = sections["reverse_offsets"]
+        self.reverse_sources = sections["reverse_sources"]
+        self._project_ids = {self.projects[i]: i for i in range(len(self.projects))}
+
+    @classmethod
+    def open(cls, path):
+        handle = open(path, "rb")
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, handle)
+
+    @classmethod
+    def from_issues(cls, issues):
+        return cls(compile_graph(issues))
+
+    def __len__(self):
+        return self.node_count
+
+    def find(self, key):
+        lo, hi = 0, self.node_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.keys[mid] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.node_count and self.keys[lo] == key:
+            return lo
+        return -1
+
+    def project_id(self, project):
+        return self._project_ids.get(project, -1)
+
+    def project_key(self, node):
+        project = self.node_project[node]
+        return self.projects[project] if project >= 0 else None
+
+    def neighbors(self, node):
+        start = self.edge_offsets[node]
+        end = self.edge_offsets[node + 1]
+        return [
+            (self.edge_targets[i], RELATIONS[self.edge_relations[i]]) for i in range(start, end)
+        ]
+
+    def predecessors(self, node):
+        return self.reverse_sources[self.reverse_offsets[node] : self.reverse_offsets[node + 1]]
+
+    def __contains__(self, key):
+        node = self.find(key)
+        return node >= 0 and bool(self.node_present[node])
+
+    def get(self, key, default=None):
+        node = self.find(key)
+        if node < 0 or not self.node_present[node]:
+            return default
+        return self.issue(node)
+
+    def issue(self, node):
+        parent_key = None
+        links = []
+        for target, relation in self.neighbors(node):
+            if relation == "parent" and parent_key is None:
+                parent_key = self.keys[target]
+            else:
+                links.append({"issue_key": self.keys[target]})
+        return {
+            "issue_key": self.keys[node],
+            "summary": self.summaries[node],
+            "description_summary": self.descriptions[node],
+            "project_key": self.project_key(node),
+            "parent_key": parent_key,
+            "issuelinks": links,
+        }
+
+
+def load_graph(path):
+    if is_compiled(path):
+        return Graph.open(path)
+    return Graph.from_issues(iter_issues(path))
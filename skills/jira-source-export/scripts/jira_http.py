@@ -0,0 +1,550 @@
+import atexit
+import datetime as dt
+import email.utils
+import fcntl
+import http.client
+import io
+import json
+import os
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from jira_cassette import cassette_from_env
+
+STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    http.client.CannotSendRequest,
+    http.client.ResponseNotReady,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class Response:
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        if not self.body:
+            return {}
+        return json.loads(self.body.decode("utf-8"))
+
+
+class _SessionHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, host, port=None, timeout=30, context=None, sessions=None, lock=None):
+        super().__init__(host, port=port, timeout=timeout, context=context)
+        self._sessions = sessions if sessions is not None else {}
+        self._sessions_lock = lock or threading.Lock()
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        server_hostname = self._tunnel_host or self.host
+        with self._sessions_lock:
+            session = self._sessions.get(server_hostname)
+        try:
+            self.sock = self._context.wrap_socket(
+                self.sock, server_hostname=server_hostname, session=session
+            )
+        except ssl.SSLError:
+            if session is None:
+                raise
+            with self._sessions_lock:
+                self._sessions.pop(server_hostname, None)
+            self.sock.close()
+            http.client.HTTPConnection.connect(self)
+            self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname)
+        if self.sock.session is not None:
+            with self._sessions_lock:
+                self._sessions[server_hostname] = self.sock.session
+
+
+class ConnectionPool:
+    def __init__(self):
+        self._local = threading.local()
+        self._context = ssl.create_default_context()
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self._proxies = urllib.request.getproxies()
+
+    def _connections(self):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = {}
+            self._local.conns = conns
+        return conns
+
+    def _proxy_for(self, scheme, host):
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parsed = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        return parsed.hostname, parsed.port or 8080
+
+    def _new_connection(self, scheme, host, port, timeout):
+        proxy = self._proxy_for(scheme, host)
+        if scheme == "https":
+            if proxy:
+                conn = _SessionHTTPSConnection(
+                    proxy[0],
+                    proxy[1],
+                    timeout=timeout,
+                    context=self._context,
+                    sessions=self._sessions,
+                    lock=self._sessions_lock,
+                )
+                conn.set_tunnel(host, port)
+                return conn
+            return _SessionHTTPSConnection(
+                host,
+                port,
+                timeout=timeout,
+                context=self._context,
+                sessions=self._sessions,
+                lock=self._sessions_lock,
+            )
+        if proxy:
+            conn = http.client.HTTPConnection(proxy[0], proxy[1], timeout=timeout)
+            conn.set_tunnel(host, port)
+            return conn
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _get(self, scheme, host, port, timeout):
+        conns = self._connections()
+        pool_key = (scheme, host, port)
+        conn = conns.get(pool_key)
+        if conn is None:
+            conn = self._new_connection(scheme, host, port, timeout)
+            conns[pool_key] = conn
+            return conn, False
+        if conn.timeout != timeout:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn, conn.sock is not None
+
+    def _drop(self, scheme, host, port):
+        conn = self._connections().pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+    def request(self, method, url, headers=None, body=None, timeout=30):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unsupported scheme: {scheme}")
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        send_headers = dict(headers or {})
+        send_headers.setdefault("Connection", "keep-alive")
+        while True:
+            conn, reused = self._get(scheme, host, port, timeout)
+            try:
+                conn.request(method, path, body=body, headers=send_headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except STALE_ERRORS as err:
+                self._drop(scheme, host, port)
+                if reused:
+                    continue
+                raise urllib.error.URLError(err)
+            except (OSError, http.client.HTTPException) as err:
+                self._drop(scheme, host, port)
+                raise urllib.error.URLError(err)
+            if resp.will_close:
+                self._drop(scheme, host, port)
+            return Response(resp.status, resp.reason, resp.headers, data)
+
+    def close(self):
+        for conn in self._connections().values():
+            conn.close()
+        self._local.conns = {}
+
+
+def parse_retry_after(value, now=None):
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            when = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=dt.timezone.utc)
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+class RateBudget:
+    RECOVERY_SECONDS = 20.0
+    CUT_INTERVAL = 1.0
+
+    def __init__(self, path, rate, burst=None, min_rate=0.5):
+        self.path = path
+        self.max_rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.min_rate = min(min_rate, rate)
+
+    def _update(self, change):
+        with open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    state = json.loads(handle.read() or "{}")
+                except json.JSONDecodeError:
+                    state = {}
+                now = time.time()
+                rate = float(state.get("rate", self.max_rate))
+                updated = float(state.get("updated", now))
+                elapsed = max(0.0, now - updated)
+                rate = min(self.max_rate, rate + elapsed * self.max_rate / self.RECOVERY_SECONDS)
+                state["rate"] = rate
+                state["tokens"] = min(self.burst, float(state.get("tokens", self.burst)) + elapsed * rate)
+                state["updated"] = now
+                state.setdefault("blocked_until", 0.0)
+                result = change(state, now)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def reserve(self):
+        def take(state, now):
+            if now < state["blocked_until"]:
+                return state["blocked_until"] - now
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0.0
+            return (1 - state["tokens"]) / state["rate"]
+
+        return self._update(take)
+
+    def acquire(self):
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def penalize(self, delay, factor=0.5):
+        def block(state, now):
+            if now - state.get("cut_at", 0.0) >= self.CUT_INTERVAL:
+                state["rate"] = max(self.min_rate, state["rate"] * factor)
+                state["cut_at"] = now
+            state["tokens"] = min(state["tokens"], 0.0)
+            if delay:
+                state["blocked_until"] = max(state["blocked_until"], now + delay)
+
+        self._update(block)
+
+    def observe(self, status, headers):
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if status in (429, 503):
+            self.penalize(retry_after if retry_after is not None else 1.0)
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.strip() in ("0", "0.0"):
+            self.penalize(retry_after or parse_retry_after(headers.get("X-RateLimit-Reset")))
+        elif (headers.get("X-RateLimit-NearLimit") or "").lower() == "true":
+            self.penalize(retry_after, factor=0.9)
+
+
+class AdaptiveLimiter:
+    CUT_INTERVAL = 1.0
+    HOLD_AFTER_CUT = 3.0
+    LATENCY_TOLERANCE = 2.0
+
+    def __init__(self, initial, floor, ceiling):
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = float(min(self.ceiling, max(self.floor, initial)))
+        self.in_flight = 0
+        self.cond = threading.Condition()
+        self.cut_at = 0.0
+        self.min_latency = None
+        self.avg_latency = None
+        self.peak = self.limit
+
+    def acquire(self, blocking=True):
+        with self.cond:
+            while self.in_flight >= int(self.limit):
+                if not blocking:
+                    return False
+                self.cond.wait()
+            self.in_flight += 1
+            return True
+
+    def abandon(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def _cut(self, factor):
+        now = time.monotonic()
+        if now - self.cut_at >= self.CUT_INTERVAL:
+            self.limit = max(self.floor, self.limit * factor)
+            self.cut_at = now
+
+    def release(self, latency, throttled=False):
+        with self.cond:
+            self.in_flight -= 1
+            if throttled:
+                self._cut(0.5)
+            else:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if self.avg_latency is None:
+                    self.avg_latency = latency
+                else:
+                    self.avg_latency = 0.9 * self.avg_latency + 0.1 * latency
+                if self.avg_latency > self.min_latency * self.LATENCY_TOLERANCE + 0.05:
+                    self._cut(0.9)
+                elif time.monotonic() - self.cut_at >= self.HOLD_AFTER_CUT:
+                    self.limit = min(self.ceiling, self.limit + 1.0 / self.limit)
+            self.peak = max(self.peak, self.limit)
+            self.cond.notify_all()
+
+    def summary(self):
+        with self.cond:
+            return (
+                f"adaptive concurrency: settled at {int(self.limit)} "
+                f"(peak {int(self.peak)}, floor {self.floor}, ceiling {self.ceiling})"
+            )
+
+
+def limiter_from_env(concurrency):
+    enabled = os.environ.get("ADAPTIVE_CONCURRENCY", "0")
+    if not enabled or enabled == "0":
+        return None
+    floor = int(os.environ.get("CONCURRENCY_MIN", "2"))
+    ceiling = int(os.environ.get("CONCURRENCY_MAX", str(concurrency * 4)))
+    return AdaptiveLimiter(concurrency, floor, ceiling)
+
+
+def inflight_from_env():
+    limit = int(os.environ.get("JIRA_MAX_INFLIGHT", "0") or 0)
+    if limit <= 0:
+        return None
+    return threading.BoundedSemaphore(limit)
+
+
+def budget_from_env():
+    path = os.environ.get("JIRA_RATE_BUDGET", "")
+    if not path:
+        return None
+    rate = float(os.environ.get("JIRA_RATE_LIMIT", "10"))
+    burst = float(os.environ.get("JIRA_RATE_BURST", "0")) or None
+    return RateBudget(os.path.expanduser(path), rate, burst)
+
+
+_POOL = ConnectionPool()
+_BUDGET = None
+_BUDGET_LOCK = threading.Lock()
+_BUDGET_LOADED = False
+_CASSETTE = None
+_CASSETTE_LOADED = False
+_INFLIGHT = None
+_INFLIGHT_LOADED = False
+
+
+def get_pool():
+    return _POOL
+
+
+def get_budget():
+    global _BUDGET, _BUDGET_LOADED
+    if not _BUDGET_LOADED:
+        with _BUDGET_LOCK:
+            if not _BUDGET_LOADED:
+                _BUDGET = budget_from_env()
+                _BUDGET_LOADED = True
+    return _BUDGET
+
+
+def get_inflight():
+    global _INFLIGHT, _INFLIGHT_LOADED
+    if not _INFLIGHT_LOADED:
+        with _BUDGET_LOCK:
+            if not _INFLIGHT_LOADED:
+                _INFLIGHT = inflight_from_env()
+                _INFLIGHT_LOADED = True
+    return _INFLIGHT
+
+
+def get_cassette():
+    global _CASSETTE, _CASSETTE_LOADED
+    if not _CASSETTE_LOADED:
+        with _BUDGET_LOCK:
+            if not _CASSETTE_LOADED:
+                _CASSETTE = cassette_from_env()
+                _CASSETTE_LOADED = True
+                if _CASSETTE is not None:
+                    atexit.register(lambda: print(_CASSETTE.summary(), file=sys.stderr))
+    return _CASSETTE
+
+
+def replay(method, url, body=None):
+    cassette = get_cassette()
+    if cassette is None:
+        return None
+    cached = cassette.get(method, url, body)
+    return Response(*cached) if cached is not None else None
+
+
+def record(method, url, body, resp):
+    cassette = get_cassette()
+    if cassette is not None:
+        cassette.put(method, url, body, resp.status, resp.reason, resp.headers, resp.body)
+
+
+def _transfer(method, url, headers, body, timeout, limiter):
+    if limiter is None:
+        return _POOL.request(method, url, headers=headers, body=body, timeout=timeout)
+    limiter.acquire()
+    started = time.monotonic()
+    throttled = False
+    try:
+        resp = _POOL.request(method, url, headers=headers, body=body, timeout=timeout)
+        throttled = resp.status in (429, 503)
+        return resp
+    finally:
+        limiter.release(time.monotonic() - started, throttled)
+
+
+def request(method, url, headers=None, body=None, timeout=30, limiter=None):
+    resp = replay(method, url, body)
+    if resp is None:
+        budget = get_budget()
+        if budget is not None:
+            budget.acquire()
+        gate = get_inflight()
+        if gate is not None:
+            gate.acquire()
+        try:
+            resp = _transfer(method, url, headers, body, timeout, limiter)
+        finally:
+            if gate is not None:
+                gate.release()
+        if budget is not None:
+            budget.observe(resp.status, resp.headers)
+        record(method, url, body, resp)
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            url, resp.status, resp.reason, resp.headers, io.BytesIO(resp.body)
+        )
+    return resp
+
+
+def json_payload(headers, data):
+    if data is None:
+        return headers, None
+    return {**headers, "Content-Type": "application/json"}, json.dumps(data).encode("utf-8")
+
+
+def send(
+    url,
+    headers,
+    params=None,
+    data=None,
+    timeout=30,
+    max_retries=5,
+    backoff=2.0,
+    method=None,
+    limiter=None,
+):
+    if params:
+        url = url + "?" + urllib.parse.urlencode(params, doseq=True)
+    if method is None:
+        method = "POST" if data is not None else "GET"
+    attempt = 0
+    delay = backoff
+    while True:
+        try:
+            return request(method, url, headers=headers, body=data, timeout=timeout, limiter=limiter)
+        except urllib.error.HTTPError as err:
+            if err.code in (429, 503) and attempt < max_retries:
+                retry_after = parse_retry_after(err.headers.get("Retry-After"))
+                sleep_for = retry_after if retry_after is not None else delay
+                time.sleep(sleep_for)
+                if retry_after is None:
+                    delay *= 2
+                attempt += 1
+                continue
+            raise
+        except urllib.error.URLError:
+            if attempt < max_retries:
+                time.sleep(delay)
+                delay *= 2
+                attempt += 1
+                continue
+            raise
+
+
+def request_json(
+    url,
+    headers,
+    params=None,
+    data=None,
+    timeout=30,
+    max_retries=5,
+    backoff=2.0,
+    method=None,
+    limiter=None,
+):
+    return send(url, headers, params, data, timeout, max_retries, backoff, method, limiter).json()
+
+
+def cached_request_json(
+    cache,
+    url,
+    headers,
+    params=None,
+    updated=None,
+    timeout=30,
+    max_retries=5,
+    backoff=2.0,
+    limiter=None,
+):
+    if cache is None:
+        return request_json(
+            url, headers, params, timeout=timeout, max_retries=max_retries, backoff=backoff, limiter=limiter
+        )
+    if params:
+        url = url + "?" + urllib.parse.urlencode(params, doseq=True)
+    entry = cache.lookup(url)
+    if entry is not None and updated and entry["updated"] == updated:
+        return cache.hit(url, entry, updated)
+    resp = send(
+        url,
+        {**headers, **cache.conditional_headers(entry)},
+        timeout=timeout,
+        max_retries=max_retries,
+        backoff=backoff,
+        limiter=limiter,
+    )
+    if resp.status == 304 and entry is not None:
+        return cache.hit(url, entry, updated, revalidated=True)
+    cache.store(url, resp, updated)
+    return resp.json()
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+
+MISSING = object()
+
+
+def fingerprint(params):
+    text = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def entry_key(kind, key):
+    return kind + "\0" + json.dumps(key, sort_keys=True, separators=(",", ":"))
+
+
+class ExportJournal:
+    def __init__(self, path, params):
+        self.path = path
+        self.fingerprint = fingerprint(params)
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.replayed = 0
+        self.recorded = 0
+        self.handle = None
+        self.resumed = self._load()
+        self._rewrite()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.close()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "r", encoding="utf-8") as handle:
+            lines = iter(handle)
+            try:
+                header = json.loads(next(lines))
+            except (StopIteration, ValueError):
+                return 0
+            if header.get("fingerprint") != self.fingerprint:
+                print(f"journal: discarding {self.path} (written for different export settings)")
+                return 0
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.entries[entry_key(record["kind"], record["key"])] = record
+        return len(self.entries)
+
+    def _rewrite(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps({"fingerprint": self.fingerprint}) + "\n")
+            for record in self.entries.values():
+                handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.path)
+        self.handle = open(self.path, "a", encoding="utf-8")
+
+    def get(self, kind, key):
+        record = self.entries.get(entry_key(kind, key))
+        if record is None:
+            return MISSING
+        with self.lock:
+            self.replayed += 1
+        return record["value"]
+
+    def put(self, kind, key, value):
+        line = json.dumps({"kind": kind, "key": key, "value": value}, separators=(",", ":")) + "\n"
+        with self.lock:
+            self.handle.write(line)
+            self.handle.flush()
+            self.recorded += 1
+
+    def close(self):
+        with self.lock:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+
+    def finish(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def summary(self):
+        return f"journal: {self.replayed} replayed, {self.recorded} recorded ({self.path})"
+
+
+def journaled(journal, kind, key, steps):
+    if journal is None:
+        return (yield from steps)
+    value = journal.get(kind, key)
+    if value is MISSING:
+        value = yield from steps
+        journal.put(kind, key, value)
+    return value
+
+
+def journal_from_env(output, params, setting=None):
+    value = (setting or os.environ.get)("EXPORT_JOURNAL", "0") or "0"
+    if value == "0":
+        return None
+    journal = ExportJournal(output + ".journal", params)
+    if journal.resumed:
+        print(f"journal: resuming with {journal.resumed} completed steps from {journal.path}")
+    return journal
@@ -0,0 +1,41 @@
+import re
+
+ORDER_BY_RE = re.compile(r"\border\s+by\b", re.IGNORECASE)
+
+
+def combine_jql(left, right, operator):
+    if ORDER_BY_RE.search(left) or ORDER_BY_RE.search(right):
+        return ""
+    return f"({left}) {operator} ({right})"
+
+
+def match_jql(
+    start_date,
+    end_date,
+    account_id="",
+    projects="",
+    jql_extra="",
+    comment_override="",
+    comment_template="",
+):
+    comment_jql = f'updated >= "{start_date}" AND updated < "{end_date}"'
+    if account_id:
+        assignee_jql = (
+            f'assignee WAS accountId("{account_id}") DURING ("{start_date}","{end_date}")'
+        )
+    else:
+        assignee_jql = f'assignee WAS currentUser() DURING ("{start_date}","{end_date}")'
+    if comment_template:
+        comment_jql = comment_template.format(start_date=start_date, end_date=end_date)
+    elif comment_override:
+        comment_jql = comment_override
+    filters = []
+    project_list = [p.strip() for p in projects.split(",") if p.strip()]
+    if project_list:
+        filters.append("project in (" + ", ".join(project_list) + ")")
+    if jql_extra:
+        filters.append(jql_extra)
+    for clause in filters:
+        comment_jql += f" AND {clause}"
+        assignee_jql += f" AND {clause}"
+    return comment_jql, assignee_jql
@@ -0,0 +1,60 @@
+import csv
+import json
+import os
+
+from jira_records import iter_issues
+
+
+def merge_issue(dst, src):
+    for k, v in src.items():
+        if k not in dst or dst[k] in (None, "", [], {}):
+            dst[k] = v
+    if "issuelinks" in src:
+        dst_links = dst.get("issuelinks") or []
+        seen = {(l.get("issue_key"), l.get("type"), l.get("inward"), l.get("outward")) for l in dst_links}
+        for l in src.get("issuelinks") or []:
+            sig = (l.get("issue_key"), l.get("type"), l.get("inward"), l.get("outward"))
+            if sig not in seen:
+                dst_links.append(l)
+                seen.add(sig)
+        dst["issuelinks"] = dst_links
+
+
+def merge_sources(out, paths):
+    by_key = {}
+    for path in paths:
+        for issue in iter_issues(str(path)):
+            key = issue.get("issue_key")
+            if not key:
+                continue
+            if key not in by_key:
+                by_key[key] = issue
+            else:
+                merge_issue(by_key[key], issue)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(list(by_key.values()), f, ensure_ascii=False, indent=2)
+
+
+def merge_report_csvs(out, paths):
+    rows = []
+    seen = set()
+    fieldnames = None
+    for path in paths:
+        if not os.path.exists(path):
+            raise SystemExit(f"Missing quarter report: {path}")
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames and fieldnames is None:
+                fieldnames = reader.fieldnames
+            for row in reader:
+                key = (row.get("root_key") or "").strip()
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                rows.append(row)
+    if not fieldnames:
+        raise SystemExit("No CSV headers found in quarter reports.")
+    with open(out, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
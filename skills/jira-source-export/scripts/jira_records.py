@@ -0,0 +1,101 @@
+import json
+import os
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+OUTPUT_FORMATS = ("json", "ndjson")
+
+
+def output_format(path, requested=""):
+    requested = (requested or "").strip().lower()
+    if requested:
+        if requested not in OUTPUT_FORMATS:
+            raise SystemExit("OUTPUT_FORMAT must be one of: json, ndjson.")
+        return requested
+    return "ndjson" if path.endswith(NDJSON_SUFFIXES) else "json"
+
+
+def iter_issues(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        head = handle.read(4096)
+        first = head.lstrip()[:1]
+        if first == "[":
+            handle.seek(0)
+            yield from json.load(handle)
+            return
+        handle.seek(0)
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def read_issues(path):
+    return list(iter_issues(path))
+
+
+def write_issues(path, issues, fmt="json", ensure_ascii=True):
+    with IssueWriter(path, fmt, ensure_ascii=ensure_ascii) as writer:
+        writer.write_many(issues)
+    return writer.count
+
+
+class IssueWriter:
+    def __init__(self, path, fmt="json", limit=0, ensure_ascii=True):
+        self.path = path
+        self.fmt = fmt
+        self.limit = limit
+        self.ensure_ascii = ensure_ascii
+        self.count = 0
+        self.seen = set()
+        if fmt == "ndjson":
+            self.handle = open(path, "w", encoding="utf-8")
+        else:
+            self.tmp_path = path + ".tmp"
+            self.handle = open(self.tmp_path, "w", encoding="utf-8")
+            self.handle.write("[")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def full(self):
+        return bool(self.limit) and self.count >= self.limit
+
+    def write(self, item):
+        key = item.get("issue_key")
+        if self.full or (key is not None and key in self.seen):
+            return False
+        self.seen.add(key)
+        if self.fmt == "ndjson":
+            self.handle.write(json.dumps(item, ensure_ascii=self.ensure_ascii) + "\n")
+            self.handle.flush()
+        else:
+            text = json.dumps(item, ensure_ascii=self.ensure_ascii, indent=2)
+            self.handle.write(("\n  " if not self.count else ",\n  ") + text.replace("\n", "\n  "))
+        self.count += 1
+        return True
+
+    def write_many(self, items):
+        for item in items:
+            if self.full:
+                break
+            self.write(item)
+
+    def close(self):
+        if self.fmt == "ndjson":
+            self.handle.close()
+            return
+        self.handle.write("\n]" if self.count else "]")
+        self.handle.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.handle.close()
+        if self.fmt != "ndjson" and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from jira_journal import journaled
+
+
+class Batch:
+    def __init__(self, requests, width=1, sink=None):
+        self.requests = requests
+        self.width = width
+        self.sink = sink
+
+
+def call(name, *args):
+    results = yield Batch([(name, args)])
+    return results[0]
+
+
+def paginate(fetch_page, max_results, sink, max_pages=0, width=1):
+    first = yield from fetch_page(0)
+    if sink(first) or max_pages == 1:
+        return
+    step = first.get("maxResults") or max_results
+    total = first.get("total")
+    if isinstance(total, int):
+        offsets = list(range(step, total, step))
+        if max_pages:
+            offsets = offsets[: max_pages - 1]
+        if offsets:
+            yield Batch([fetch_page(offset) for offset in offsets], width, sink)
+        return
+    start_at = 0
+    pages = 1
+    page = first
+    while len(page.get("issues", [])) >= step:
+        if max_pages and pages >= max_pages:
+            break
+        start_at += step
+        page = yield from fetch_page(start_at)
+        pages += 1
+        if sink(page):
+            break
+
+
+def search_keys(client, jql, max_results, max_pages=0, width=1, journal=None, limit=0):
+    keys = []
+
+    def collect(resp):
+        issues = resp.get("issues", [])
+        client.remember(issues)
+        keys.extend([item.get("key") for item in issues if item.get("key")])
+        return bool(limit) and len(keys) >= limit
+
+    yield from paginate(
+        lambda start_at: journaled(
+            journal,
+            "keys",
+            [jql, start_at, max_results],
+            call("search", jql, start_at, max_results),
+        ),
+        max_results,
+        collect,
+        max_pages,
+        width,
+    )
+    return keys[:limit] if limit else keys
+
+
+def perform(client, request):
+    if isinstance(request, tuple):
+        name, args = request
+        return getattr(client, name)(*args)
+    return run(request, client)
+
+
+def run_batch(batch, client):
+    requests = batch.requests
+    if batch.width <= 1 or len(requests) <= 1:
+        results = (perform(client, request) for request in requests)
+        if batch.sink is None:
+            return list(results)
+        for result in results:
+            if batch.sink(result):
+                break
+        return None
+    pool = ThreadPoolExecutor(max_workers=min(batch.width, len(requests)))
+    try:
+        results = pool.map(lambda request: perform(client, request), requests)
+        if batch.sink is None:
+            return list(results)
+        for result in results:
+            if batch.sink(result):
+                break
+        return None
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run(steps, client):
+    resume = steps.send
+    value = None
+    while True:
+        try:
+            batch = resume(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value = run_batch(batch, client)
+            resume = steps.send
+        except Exception as err:
+            value = err
+            resume = steps.throw
@@ -0,0 +1,161 @@
+import contextlib
+import datetime as dt
+import fcntl
+import json
+import sqlite3
+import threading
+
+SYNC_OVERLAP = dt.timedelta(days=1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    issue_key TEXT PRIMARY KEY,
+    project_key TEXT,
+    updated TEXT,
+    updated_utc TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_project_updated ON issues (project_key, updated_utc);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    since TEXT NOT NULL,
+    watermark TEXT NOT NULL
+);
+"""
+
+
+def parse_timestamp(value):
+    if not value:
+        return None
+    raw = value.strip()
+    for fmt in (
+        "%Y-%m-%dT%H:%M:%S.%f%z",
+        "%Y-%m-%dT%H:%M:%S%z",
+        "%Y-%m-%dT%H:%M:%S.%fZ",
+        "%Y-%m-%dT%H:%M:%SZ",
+    ):
+        try:
+            parsed = dt.datetime.strptime(raw, fmt)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=dt.timezone.utc)
+            return parsed.astimezone(dt.timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def format_utc(value):
+    return value.astimezone(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + (
+        f"{value.microsecond // 1000:03d}+0000"
+    )
+
+
+def jql_datetime(value):
+    return value.astimezone(dt.timezone.utc).strftime("%Y/%m/%d %H:%M")
+
+
+class IssueStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    @contextlib.contextmanager
+    def sync_lock(self):
+        with open(self.path + ".lock", "a", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def sync_state(self, scope):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT since, watermark FROM sync_state WHERE scope = ?", (scope,)
+            ).fetchone()
+        if not row:
+            return None, None
+        return parse_timestamp(row[0]), parse_timestamp(row[1])
+
+    def set_sync_state(self, scope, since, watermark):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO sync_state (scope, since, watermark) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET since = excluded.since, watermark = excluded.watermark",
+                (scope, format_utc(since), format_utc(watermark)),
+            )
+            self.conn.commit()
+
+    def upsert(self, items):
+        rows = []
+        for item, updated in items:
+            key = item.get("issue_key")
+            if not key:
+                continue
+            parsed = parse_timestamp(updated)
+            rows.append(
+                (
+                    key,
+                    item.get("project_key"),
+                    updated or "",
+                    format_utc(parsed) if parsed else "",
+                    json.dumps(item, ensure_ascii=True),
+                )
+            )
+        if not rows:
+            return 0
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO issues (issue_key, project_key, updated, updated_utc, data) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(issue_key) DO UPDATE SET "
+                "project_key = excluded.project_key, updated = excluded.updated, "
+                "updated_utc = excluded.updated_utc, data = excluded.data",
+                rows,
+            )
+            self.conn.commit()
+        return len(rows)
+
+    def get_many(self, keys):
+        found = {}
+        keys = list(keys)
+        with self.lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                marks = ", ".join("?" for _ in chunk)
+                for key, data in self.conn.execute(
+                    f"SELECT issue_key, data FROM issues WHERE issue_key IN ({marks})", chunk
+                ):
+                    found[key] = json.loads(data)
+        return found
+
+    def updated_many(self, keys):
+        found = {}
+        keys = list(keys)
+        with self.lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                marks = ", ".join("?" for _ in chunk)
+                for key, updated in self.conn.execute(
+                    f"SELECT issue_key, updated FROM issues WHERE issue_key IN ({marks})", chunk
+                ):
+                    if updated:
+                        found[key] = updated
+        return found
+
+    def window(self, projects, start_ts, end_ts):
+        marks = ", ".join("?" for _ in projects)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT data FROM issues WHERE project_key IN ({marks}) "
+                "AND updated_utc >= ? AND updated_utc < ? ORDER BY issue_key",
+                [*projects, start_ts, end_ts],
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
@@ -6,14 +6,14 @@ import json
 from pathlib import Path
 
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Generate evaluation report from Jira CSVs.")
     parser.add_argument("--year", type=int, required=True)
     parser.add_argument("--base-dir", required=True)
     parser.add_argument("--out", dest="out_path", required=False)
     parser.add_argument("--insights-json", dest="insights_path", required=False)
     parser.add_argument("--top-n", type=int, default=10)
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def load_csv(path):
@@ -258,8 +258,8 @@ def fmt_issue(row):
     return " / ".join([p for p in parts if p])
 
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
     base = Path(args.base_dir)
     merged = base / "itpt-links.csv"
     if not merged.exists():
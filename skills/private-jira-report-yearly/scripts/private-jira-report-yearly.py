@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+import datetime as dt
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent import futures
+from pathlib import Path
+
+SKILLS = Path(__file__).resolve().parents[2]
+SHARED_SCRIPTS = SKILLS / "jira-source-export" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
+
+from jira_merge import merge_report_csvs, merge_sources
+
+STAGE_SCRIPTS = {
+    "export": SHARED_SCRIPTS / "jira-source-export-fast.py",
+    "graph": SHARED_SCRIPTS / "jira-compile-graph.py",
+    "csv_export": SKILLS / "jira-itpt-report" / "scripts" / "jira-export-csv-seed.py",
+    "seed": SKILLS / "jira-itpt-report" / "scripts" / "jira-seed-from-csv.py",
+    "plan": SKILLS / "jira-itpt-report" / "scripts" / "jira-plan-windows.py",
+    "roots": SKILLS / "jira-itpt-report" / "scripts" / "jira-build-roots.py",
+    "traverse": SKILLS / "jira-itpt-report" / "scripts" / "jira-traverse-root-itpt.py",
+    "insights": SKILLS
+    / "private-jira-strengths-insights"
+    / "scripts"
+    / "generate-strengths-insights.py",
+    "evaluation": SKILLS
+    / "private-jira-evaluation-report"
+    / "scripts"
+    / "generate-evaluation-report.py",
+}
+MCP_CONNECT = SKILLS / "atlassian-mcp-connect" / "scripts" / "atlassian_mcp_connect.sh"
+
+
+def env(name, default=""):
+    return os.environ.get(name) or default
+
+
+def load_env_file(path):
+    if not path:
+        return
+    if not os.path.exists(path):
+        raise SystemExit(f"ENV_FILE not found: {path}")
+    with open(path, "r", encoding="utf-8") as handle:
+        for raw_line in handle:
+            line = raw_line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            env_key = key.strip()
+            env_value = value.strip().strip('"').strip("'")
+            if env_key and env_key not in os.environ:
+                os.environ[env_key] = env_value
+
+
+def load_stages():
+    stages = {}
+    for name, path in STAGE_SCRIPTS.items():
+        spec = importlib.util.spec_from_file_location(f"pipeline_{name}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        stages[name] = module
+    return stages
+
+
+def timestamp():
+    return time.strftime("%Y%m%d-%H%M%S")
+
+
+def quarters(year, selected):
+    rows = [
+        ("Q1", f"{year}/01/01", f"{year}/04/01"),
+        ("Q2", f"{year}/04/01", f"{year}/07/01"),
+        ("Q3", f"{year}/07/01", f"{year}/10/01"),
+        ("Q4", f"{year}/10/01", f"{year + 1}/01/01"),
+    ]
+    keep = {q for q in selected.split(",") if q}
+    return [row for row in rows if not keep or row[0] in keep]
+
+
+def fixed_windows(start, end, days):
+    cur = dt.datetime.strptime(start, "%Y/%m/%d").date()
+    last = dt.datetime.strptime(end, "%Y/%m/%d").date()
+    windows = []
+    while cur < last:
+        nxt = min(cur + dt.timedelta(days=days), last)
+        windows.append((cur.strftime("%Y/%m/%d"), nxt.strftime("%Y/%m/%d")))
+        cur = nxt
+    return windows
+
+
+def read_windows(path):
+    windows = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            windows.append((parts[0], parts[1]))
+    return windows
+
+
+def week_dir(output_dir, start, end):
+    return output_dir / f"week-{start.replace('/', '')}-{end.replace('/', '')}"
+
+
+class ReportJob:
+    def __init__(self, name, output_dir, range_start, range_end, merge_start, merge_end):
+        self.name = name
+        self.output_dir = Path(output_dir)
+        self.range_start = range_start
+        self.range_end = range_end
+        self.merge_start = merge_start
+        self.merge_end = merge_end
+        self.export_only = False
+        self.shared_source = ""
+        self.parallel_ranges = 1
+        self.windows = []
+        self.seed_merge_done = False
+        self.devstatus_cache = env("DEVSTATUS_CACHE", str(self.output_dir / "devstatus-cache.json"))
+
+
+class StageScheduler:
+    def __init__(self, net_tasks, cpu_tasks):
+        self.pools = {
+            "net": futures.ThreadPoolExecutor(max_workers=max(1, net_tasks)),
+            "cpu": futures.ThreadPoolExecutor(max_workers=max(1, cpu_tasks)),
+        }
+        self.lock = threading.Lock()
+        self.tasks = {}
+        self.waiting = {}
+        self.done = set()
+        self.running = {}
+
+    def add(self, name, fn, deps=(), kind="cpu"):
+        with self.lock:
+            if name in self.tasks:
+                raise SystemExit(f"Duplicate pipeline task: {name}")
+            self.tasks[name] = (fn, kind)
+            self.waiting[name] = set(deps) - self.done
+
+    def _submit_ready(self):
+        for name in [name for name, deps in self.waiting.items() if not deps]:
+            del self.waiting[name]
+            fn, kind = self.tasks[name]
+            self.running[self.pools[kind].submit(fn)] = name
+
+    def run(self):
+        try:
+            while True:
+                with self.lock:
+                    self._submit_ready()
+                    pending = list(self.running)
+                if not pending:
+                    if self.waiting:
+                        raise SystemExit(
+                            "Pipeline tasks with unmet dependencies: " + ", ".join(sorted(self.waiting))
+                        )
+                    return
+                finished, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+                    with self.lock:
+                        name = self.running.pop(future)
+                        self.done.add(name)
+                        for deps in self.waiting.values():
+                            deps.discard(name)
+        finally:
+            for pool in self.pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
+
+
+class Pipeline:
+    def __init__(self, cfg, stages, client, scheduler):
+        self.cfg = cfg
+        self.stages = stages
+        self.client = client
+        self.scheduler = scheduler
+        self.seed_deps = []
+        self.shared_devstatus = None
+
+    def add(self, job, stage, fn, deps=(), kind="cpu"):
+        name = f"{job.name}:{stage}"
+        self.scheduler.add(name, fn, deps, kind)
+        return name
+
+    def schedule(self, job, source_deps=()):
+        job.output_dir.mkdir(parents=True, exist_ok=True)
+        if job.shared_source:
+            copied = self.add(job, "copy", lambda: self.copy_shared(job), source_deps)
+            self.schedule_traverse(job, [copied], [copied])
+            return
+        if env("WINDOW_PLAN", "fixed") == "density" and self.cfg["csv_seed"]:
+            self.add(job, "plan", lambda: self.plan(job), self.seed_deps)
+        else:
+            kind = "net" if env("WINDOW_PLAN", "fixed") == "density" else "cpu"
+            self.add(job, "plan", lambda: self.plan(job), kind=kind)
+
+    def copy_shared(self, job):
+        shared = Path(job.shared_source)
+        for name in ("jira-source.json", "jira-source.jgraph", "roots.txt"):
+            if not (shared / name).is_file():
+                raise SystemExit(f"SHARED_SOURCE is missing {name}: {job.shared_source}")
+        for name in ("jira-source.json", "jira-source.jgraph", "roots.txt"):
+            shutil.copyfile(shared / name, job.output_dir / name)
+
+    def plan(self, job):
+        cfg = self.cfg
+        ranges_file = job.output_dir / "weekly-ranges.txt"
+        split_days = int(env("SPLIT_DAYS", "7"))
+        if env("WINDOW_PLAN", "fixed") == "density":
+            plan_args = [
+                "--start", job.range_start, "--end", job.range_end, "--out", str(ranges_file),
+                "--env-file", cfg["env_file"], "--projects", cfg["projects"],
+                "--target", env("WINDOW_TARGET", "400"), "--initial-days", str(split_days),
+                "--max-days", env("WINDOW_MAX_DAYS", "31"),
+            ]
+            plan_args += [
+                "--match-mode", "assignee" if cfg["csv_seed"] else cfg["match_mode"],
+                "--jql-extra", env("JQL_EXTRA"), "--comment-jql", env("COMMENT_JQL"),
+            ]
+            if env("COMMENT_JQL_TEMPLATE"):
+                plan_args += ["--jql-template", env("COMMENT_JQL_TEMPLATE")]
+            if cfg["csv_seed"]:
+                plan_args += ["--seed-csv", cfg["csv_seed"], "--seed-mode", cfg["role_mode"]]
+            self.stages["plan"].main(plan_args)
+        else:
+            windows = fixed_windows(job.range_start, job.range_end, split_days)
+            ranges_file.write_text("".join(f"{s} {e}\n" for s, e in windows), encoding="utf-8")
+        job.windows = read_windows(ranges_file)
+
+        export_deps = []
+        if cfg["csv_seed"]:
+            job.seed_merge_done = cfg["role_mode"] == "dev"
+            export_deps.append(
+                self.add(job, "seed", lambda: self.partition(job, ranges_file), self.seed_deps)
+            )
+        exports = [
+            self.add(
+                job,
+                f"export:{start}-{end}",
+                lambda start=start, end=end: self.export_week(job, start, end),
+                export_deps,
+                "net",
+            )
+            for start, end in job.windows
+        ]
+        merged = self.add(job, "merge", lambda: self.merge(job), exports)
+        roots = self.add(job, "roots", lambda: self.roots(job), [merged])
+        graph = self.add(job, "graph", lambda: self.graph(job), [merged])
+        if job.export_only:
+            source = job.output_dir / "jira-source.json"
+            self.add(job, "exported", lambda: print(f"Source exported: {source}"), [roots, graph])
+        else:
+            self.schedule_traverse(job, [roots], [roots, graph])
+
+    def partition(self, job, ranges_file):
+        cfg = self.cfg
+        partition_args = [
+            "--csv", cfg["csv_seed"], "--projects", cfg["projects"], "--mode", cfg["role_mode"],
+            "--ranges-file", str(ranges_file), "--partition-dir", str(job.output_dir),
+        ]
+        if job.seed_merge_done:
+            partition_args += [
+                "--start", job.merge_start, "--end", job.merge_end,
+                "--out-keys", str(job.output_dir / "seed-keys-merge.txt"),
+                "--out-merge", job.devstatus_cache,
+            ]
+        self.stages["seed"].main(partition_args)
+
+    def export_week(self, job, start, end):
+        cfg = self.cfg
+        out_dir = week_dir(job.output_dir, start, end)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        source = out_dir / "jira-source.json"
+        csv_seed = cfg["csv_seed"]
+        if job.parallel_ranges > 1 and source.exists() and source.stat().st_size:
+            if not csv_seed or source.stat().st_mtime > os.stat(csv_seed).st_mtime:
+                return
+        overrides = {
+            "START_DATE": start,
+            "END_DATE": end,
+            "PROJECTS": cfg["projects"],
+            "MATCH_MODE": "assignee" if csv_seed else cfg["match_mode"],
+            "CONCURRENCY": cfg["concurrency"],
+            "MAX_PAGES": env("MAX_PAGES", "0"),
+            "MAX_RESULTS": env("MAX_RESULTS", "100"),
+            "NO_DATE_FILTER": env("NO_DATE_FILTER"),
+            "COMMENT_AUTHOR_DISPLAY": env("COMMENT_AUTHOR_DISPLAY"),
+            "COMMENT_JQL_TEMPLATE": env("COMMENT_JQL_TEMPLATE"),
+            "COMMENT_JQL": env("COMMENT_JQL"),
+            "COMMENT_MATCH": env("COMMENT_MATCH"),
+            "EXPORT_JOURNAL": env("EXPORT_JOURNAL", "1"),
+            "SEED_KEYS_FILE": "",
+            "ASSIGNEE_JQL": "",
+        }
+        if csv_seed:
+            keys = out_dir / "seed-keys.txt"
+            if not keys.exists() or not keys.stat().st_size:
+                source.write_text("[]\n", encoding="utf-8")
+                return
+            overrides["SEED_KEYS_FILE"] = str(keys)
+        else:
+            overrides["ASSIGNEE_JQL"] = env("ASSIGNEE_JQL")
+        self.stages["export"].export_source(str(source), overrides, self.client)
+
+    def merge(self, job):
+        out = job.output_dir
+        merge_sources(out / "jira-source.json", [week_dir(out, s, e) / "jira-source.json" for s, e in job.windows])
+
+    def roots(self, job):
+        out = job.output_dir
+        self.stages["roots"].main(
+            [str(out / "jira-source.json"), str(out / "roots.txt"), "--prefixes", env("ROOT_PREFIXES", "MGTT-,ITPT-")]
+        )
+
+    def graph(self, job):
+        out = job.output_dir
+        self.stages["graph"].main([str(out / "jira-source.json"), str(out / "jira-source.jgraph")])
+
+    def traverse_args(self, job):
+        cfg = self.cfg
+        out = job.output_dir
+        args = [
+            str(out / "jira-source.jgraph"), "--batch-file", str(out / "roots.txt"),
+            "--max-depth", env("MAX_DEPTH", "5"), "--csv-output", str(out / "itpt-links.csv"),
+            "--env-file", cfg["env_file"], "--role-mode", cfg["role_mode"],
+        ]
+        if cfg["role_mode"] == "dev":
+            args += ["--include-master-merge", "--merge-start", job.merge_start, "--merge-end", job.merge_end]
+            if cfg["csv_seed"]:
+                args += ["--merge-map", job.devstatus_cache]
+            else:
+                args += [
+                    "--devstatus-cache", job.devstatus_cache,
+                    "--devstatus-concurrency", env("DEVSTATUS_CONCURRENCY", "8"),
+                ]
+        return args
+
+    def schedule_traverse(self, job, roots_deps, source_deps):
+        cfg = self.cfg
+        deps = list(source_deps)
+        if cfg["role_mode"] == "dev" and cfg["csv_seed"] and not job.seed_merge_done:
+            deps.append(self.add(job, "seed-merge", lambda: self.seed_merge(job), self.seed_deps))
+        elif cfg["role_mode"] == "dev" and not cfg["csv_seed"]:
+            deps.append(self.prefetch_devstatus(job, roots_deps))
+        self.add(job, "traverse", lambda: self.traverse(job), deps)
+
+    def prefetch_devstatus(self, job, roots_deps):
+        def prefetch():
+            self.stages["traverse"].main(self.traverse_args(job) + ["--prefetch-only"])
+
+        if not job.shared_source:
+            return self.add(job, "devstatus", prefetch, roots_deps, "net")
+        # Every quarter copies the same roots and shares one cache, so the
+        # first quarter prefetches for all of them.
+        if self.shared_devstatus is None:
+            self.shared_devstatus = "shared:devstatus"
+            self.scheduler.add(self.shared_devstatus, prefetch, roots_deps, "net")
+        return self.shared_devstatus
+
+    def seed_merge(self, job):
+        cfg = self.cfg
+        self.stages["seed"].main(
+            [
+                "--csv", cfg["csv_seed"], "--start", job.merge_start, "--end", job.merge_end,
+                "--projects", cfg["projects"], "--mode", cfg["role_mode"],
+                "--out-keys", str(job.output_dir / "seed-keys-merge.txt"), "--out-merge", job.devstatus_cache,
+            ]
+        )
+
+    def traverse(self, job):
+        csv_out = job.output_dir / "itpt-links.csv"
+        self.stages["traverse"].main(self.traverse_args(job))
+        if env("OUTPUT_TIMESTAMP", "1") == "1" and csv_out.exists() and csv_out.stat().st_size:
+            shutil.copyfile(csv_out, job.output_dir / f"itpt-links-{timestamp()}.csv")
+        missing = job.output_dir / "missing-keys.txt"
+        if missing.exists() and missing.stat().st_size:
+            print(
+                "Missing keys detected. Use MCP to fetch and merge before final report:\n"
+                f"  missing-keys: {missing}\n"
+                f"  source-json:  {job.output_dir / 'jira-source.json'}\n"
+                f"  csv:          {csv_out} (partial)\n"
+                "Next: fetch missing via MCP, create jira-source-supplement.json, then merge with "
+                "jira-merge-source.py and re-run traverse on merged JSON.",
+                file=sys.stderr,
+            )
+        else:
+            print(f"Report generated: {csv_out}")
+
+
+def connect_mcp(env_file):
+    base_url = os.environ["JIRA_BASE_URL"]
+    domain = env("ATLASSIAN_DOMAIN", base_url.removeprefix("https://"))
+    domain = domain.removeprefix("http://").split("/", 1)[0]
+    email = env("ATLASSIAN_EMAIL", os.environ["JIRA_EMAIL"])
+    token = env("ATLASSIAN_API_TOKEN", os.environ["JIRA_API_TOKEN"])
+    os.environ.update(
+        {"ATLASSIAN_DOMAIN": domain, "ATLASSIAN_EMAIL": email, "ATLASSIAN_API_TOKEN": token}
+    )
+    config = env("ATLASSIAN_MCP_CONFIG", os.path.expanduser("~/.atlassian-mcp.json"))
+    with open(config, "w", encoding="utf-8") as handle:
+        handle.write(
+            "{\n"
+            f'  "domain": "{domain}",\n'
+            f'  "email": "{email}",\n'
+            f'  "apiToken": "{token}"\n'
+            "}\n"
+        )
+    subprocess.run(
+        [str(MCP_CONNECT)], env=dict(os.environ, ENV_FILE=env_file), stdout=subprocess.DEVNULL, check=True
+    )
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help"):
+        print("Usage: YEAR=YYYY [env as in private-jira-report-yearly.sh --help] private-jira-report-yearly.py")
+        return
+    year_raw = env("YEAR")
+    if not year_raw:
+        raise SystemExit("Missing required env: YEAR")
+    year = int(year_raw)
+
+    projects = env("PROJECTS", "MGTT,ITPT")
+    env_file = env("ENV_FILE", os.path.expanduser("~/.codex/jira_env"))
+    output_dir = env("OUTPUT_DIR")
+    account_ids = env("ASSIGNEE_ACCOUNT_IDS", env("ASSIGNEE_ACCOUNT_ID"))
+    if not output_dir:
+        output_dir = os.path.expanduser(f"~/Downloads/itpt-{year}")
+        if account_ids:
+            suffix = account_ids
+            for ch in " '\"":
+                suffix = suffix.replace(ch, "")
+            output_dir += "-acct-" + suffix.replace(",", "-").replace("/", "-")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    export_start = env("EXPORT_START")
+    export_end = env("EXPORT_END")
+    range_auto = env("EXPORT_RANGE_AUTO", "0")
+    if not export_start or not export_end:
+        range_auto = "1"
+        export_start, export_end = f"{year}/01/01", f"{year + 1}/01/01"
+    quarter_parallel = int(env("QUARTER_PARALLEL", "4"))
+    parallel_ranges = int(env("PARALLEL_RANGES", "4"))
+
+    if not os.path.isfile(env_file):
+        raise SystemExit(f"Missing ENV_FILE: {env_file}")
+    load_env_file(env_file)
+    if not (env("JIRA_BASE_URL") and env("JIRA_EMAIL") and env("JIRA_API_TOKEN")):
+        raise SystemExit(
+            f"Missing JIRA_* in {env_file} (JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN)."
+        )
+    if account_ids and "," not in account_ids and not env("JIRA_ACCOUNT_ID"):
+        os.environ["JIRA_ACCOUNT_ID"] = account_ids
+    os.environ["ENV_FILE"] = env_file
+
+    selected = quarters(year, env("QUARTERS"))
+    if not selected:
+        raise SystemExit(f"No quarters selected. QUARTERS={env('QUARTERS')}")
+
+    stages = load_stages()
+    cfg = {
+        "env_file": env_file,
+        "projects": projects,
+        "role_mode": env("ROLE_MODE", "dev"),
+        "match_mode": env("MATCH_MODE", "assignee"),
+        "concurrency": env("CONCURRENCY", "8"),
+        "csv_seed": env("CSV_SEED"),
+    }
+    csv_seed_auto = not cfg["csv_seed"] and env("CSV_SEED_AUTO", "1") == "1"
+    if csv_seed_auto:
+        cfg["csv_seed"] = str(output_dir / "jira-seed.csv")
+    elif cfg["csv_seed"] and not os.path.isfile(cfg["csv_seed"]):
+        raise SystemExit(f"CSV_SEED not found: {cfg['csv_seed']}")
+
+    connect_mcp(env_file)
+
+    os.environ["JIRA_MAX_INFLIGHT"] = env("JIRA_MAX_INFLIGHT", "32")
+    net_tasks = int(env("PIPELINE_NET_TASKS", str(max(1, parallel_ranges * quarter_parallel))))
+    cpu_tasks = int(env("PIPELINE_CPU_TASKS", str(os.cpu_count() or 4)))
+    client = stages["export"].client_from_env(int(cfg["concurrency"]))
+    scheduler = StageScheduler(net_tasks, cpu_tasks)
+    pipeline = Pipeline(cfg, stages, client, scheduler)
+
+    if csv_seed_auto:
+        def export_csv_seed():
+            seed_path = Path(cfg["csv_seed"])
+            if not seed_path.exists() or not seed_path.stat().st_size:
+                stages["csv_export"].main(
+                    ["--out", cfg["csv_seed"], "--env-file", env_file, "--projects", projects]
+                )
+            if not seed_path.is_file():
+                raise SystemExit(f"CSV_SEED not found: {cfg['csv_seed']}")
+
+        scheduler.add("csv-seed", export_csv_seed, kind="net")
+        pipeline.seed_deps = ["csv-seed"]
+
+    shared_source = env("SHARED_SOURCE")
+    source_deps = []
+    if not shared_source and env("SHARED_EXPORT", "0") == "1" and range_auto != "1":
+        shared_source = str(output_dir / "shared")
+        shared = ReportJob("shared", shared_source, export_start, export_end, export_start, export_end)
+        shared.export_only = True
+        shared.parallel_ranges = int(env("SHARED_PARALLEL_RANGES", str(parallel_ranges * quarter_parallel)))
+        pipeline.schedule(shared)
+        source_deps = ["shared:exported"]
+
+    shared_devstatus_cache = env("DEVSTATUS_CACHE", str(output_dir / "shared" / "devstatus-cache.json"))
+    if shared_source and not cfg["csv_seed"]:
+        Path(shared_devstatus_cache).parent.mkdir(parents=True, exist_ok=True)
+
+    for name, merge_start, merge_end in selected:
+        job = ReportJob(
+            name,
+            output_dir / name,
+            merge_start if range_auto == "1" else export_start,
+            merge_end if range_auto == "1" else export_end,
+            merge_start,
+            merge_end,
+        )
+        job.shared_source = shared_source
+        job.parallel_ranges = parallel_ranges
+        if shared_source and not cfg["csv_seed"]:
+            job.devstatus_cache = shared_devstatus_cache
+        pipeline.schedule(job, source_deps)
+
+    merged_csv = output_dir / "itpt-links.csv"
+    output_timestamp = env("OUTPUT_TIMESTAMP", "1") == "1"
+
+    def annual():
+        merge_report_csvs(merged_csv, [str(output_dir / name / "itpt-links.csv") for name, _, _ in selected])
+        print(f"Annual report generated: {merged_csv}")
+        if output_timestamp and merged_csv.stat().st_size:
+            shutil.copyfile(merged_csv, output_dir / f"itpt-links-{timestamp()}.csv")
+
+    def evaluation():
+        insights_json = output_dir / "strengths-insights.json"
+        stages["insights"].main(["--base-dir", str(output_dir), "--out", str(insights_json)])
+        eval_out = output_dir / f"evaluation-{year}.md"
+        stages["evaluation"].main(
+            [
+                "--year", str(year), "--base-dir", str(output_dir),
+                "--out", str(eval_out), "--insights-json", str(insights_json),
+            ]
+        )
+        if output_timestamp and eval_out.exists() and eval_out.stat().st_size:
+            shutil.copyfile(eval_out, output_dir / f"evaluation-{year}-{timestamp()}.md")
+
+    scheduler.add("annual", annual, [f"{name}:traverse" for name, _, _ in selected])
+    if env("EVALUATION_REPORT", "1") == "1":
+        scheduler.add("evaluation", evaluation, ["annual"])
+    scheduler.run()
+
+    if client.limiter is not None:
+        print(client.limiter.summary())
+    if client.cache is not None:
+        print(client.cache.summary())
+        client.cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,14 @@ import argparse
 import json
 import os
 import re
+import sys
 import urllib.request
 from pathlib import Path
 
+SHARED_SCRIPTS = Path(__file__).resolve().parents[2] / "jira-source-export" / "scripts"
+sys.path.insert(0, str(SHARED_SCRIPTS))
 
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+from jira_records import iter_issues
 
 
 def find_source_files(base_dir):
@@ -135,13 +136,13 @@ def heuristic_fallback(themes):
     }
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Generate strengths insights from Jira source JSON.")
     parser.add_argument("--base-dir", required=True)
     parser.add_argument("--out", dest="out_path", required=False)
     parser.add_argument("--max-issues", type=int, default=200)
     parser.add_argument("--llm-prompt-only", default="0")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     base_dir = Path(args.base_dir)
     out_path = Path(args.out_path) if args.out_path else base_dir / "strengths-insights.json"
@@ -152,8 +153,7 @@ def main():
     issues = []
     seen = set()
     for path in files:
-        data = load_json(path)
-        for issue in data:
+        for issue in iter_issues(path):
             key = issue.get("issue_key")
             if not key or key in seen:
                 continue
@@ -0,0 +1,125 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+SKILLS = Path(__file__).resolve().parents[1] / "skills"
+EXPORT_SCRIPTS = SKILLS / "jira-source-export" / "scripts"
+REPORT_SCRIPTS = SKILLS / "jira-itpt-report" / "scripts"
+sys.path.insert(0, str(EXPORT_SCRIPTS))
+
+from jira_records import read_issues
+
+
+class FakeJira:
+    def __init__(self, *args):
+        self.proc = subprocess.Popen(
+            [sys.executable, str(EXPORT_SCRIPTS / "jira-fake-server.py"), "--port", "0", *args],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError("fake Jira server did not start")
+        self.url = line.split()[4]
+
+    def stats(self):
+        with urllib.request.urlopen(self.url + "/__stats") as resp:
+            return json.load(resp)["endpoints"]
+
+    def stop(self):
+        self.proc.terminate()
+        self.proc.wait(timeout=10)
+        self.proc.stdout.close()
+
+
+@pytest.fixture(scope="session")
+def fake_jira():
+    server = FakeJira("--issues", "400")
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def full_export(fake_jira, tmp_path_factory):
+    out = tmp_path_factory.mktemp("full") / "jira-source.json"
+    return out, export(fake_jira, out, START_DATE="2024/01/01", END_DATE="2026/01/01")
+
+
+@pytest.fixture
+def start_fake_jira():
+    servers = []
+
+    def start(*args):
+        server = FakeJira(*args)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        if server.proc.poll() is None:
+            server.stop()
+
+
+def script_env(server, home, **overrides):
+    env = {
+        "PATH": os.environ.get("PATH", ""),
+        "HOME": str(home),
+        "JIRA_BASE_URL": server.url,
+        "JIRA_EMAIL": "me@example.com",
+        "JIRA_API_TOKEN": "x",
+        "JIRA_ACCOUNT_ID": "acct-me",
+        "PROJECTS": "MGTT,ITPT",
+        "START_DATE": "2025/01/01",
+        "END_DATE": "2025/04/01",
+    }
+    env.update({name: str(value) for name, value in overrides.items()})
+    return env
+
+
+def run_script(path, args, env):
+    proc = subprocess.run(
+        [sys.executable, str(path), *[str(arg) for arg in args]],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise AssertionError(f"{Path(path).name} failed ({proc.returncode}):\n{proc.stderr}")
+    return proc
+
+
+def export(server, out, script="jira-source-export-fast.py", **overrides):
+    run_script(EXPORT_SCRIPTS / script, [out], script_env(server, Path(out).parent, **overrides))
+    return read_issues(str(out))
+
+
+def canonical(issues):
+    return sorted(json.dumps(issue, sort_keys=True) for issue in issues)
+
+
+def load_script(path):
+    spec = importlib.util.spec_from_file_location(Path(path).stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def export_seed_csv(server, out):
+    env_file = Path(out).parent / ".env"
+    env_file.write_text("", encoding="utf-8")
+    run_script(
+        REPORT_SCRIPTS / "jira-export-csv-seed.py",
+        ["--out", out, "--env-file", env_file, "--projects", "MGTT,ITPT"],
+        script_env(server, Path(out).parent),
+    )
+    return out
+
+
+def read_ranges(path):
+    return [tuple(line.split()) for line in Path(path).read_text(encoding="utf-8").splitlines()]
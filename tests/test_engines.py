@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import EXPORT_SCRIPTS, canonical, export, run_script, script_env
+from jira_records import read_issues
+
+SMALL_PAGES = {"MAX_RESULTS": 20, "BULK_FETCH_SIZE": 7, "ASYNC_CONCURRENCY": 4}
+
+
+def compare_engines(server, tmp_path, script="jira-source-export-fast.py", **overrides):
+    overrides = {**SMALL_PAGES, **overrides}
+    thread = export(server, tmp_path / "thread.json", script, ENGINE="thread", **overrides)
+    async_ = export(server, tmp_path / "async.json", script, ENGINE="async", **overrides)
+    assert thread
+    assert canonical(async_) == canonical(thread)
+
+
+@pytest.mark.parametrize("match_mode", ["any", "comment", "assignee", "both"])
+def test_match_modes(fake_jira, tmp_path, match_mode):
+    compare_engines(fake_jira, tmp_path, MATCH_MODE=match_mode)
+
+
+def test_comment_author_match(fake_jira, tmp_path):
+    compare_engines(fake_jira, tmp_path, COMMENT_MATCH=1)
+
+
+def test_seed_keys(fake_jira, full_export, tmp_path):
+    _, issues = full_export
+    seed = tmp_path / "seed-keys.txt"
+    seed.write_text("\n".join(item["issue_key"] for item in issues) + "\n")
+    compare_engines(fake_jira, tmp_path, SEED_KEYS_FILE=seed)
+
+
+@pytest.mark.parametrize("scan", ["tail", "forward"])
+def test_activity(fake_jira, tmp_path, scan):
+    compare_engines(fake_jira, tmp_path, "jira-source-export-activity.py", CHANGELOG_SCAN=scan)
+
+
+def test_async_engine_honors_adaptive_limiter(start_fake_jira, tmp_path):
+    server = start_fake_jira("--issues", "400", "--throttle-every", "7", "--retry-after", "0")
+    overrides = {
+        **SMALL_PAGES,
+        "ADAPTIVE_CONCURRENCY": 1,
+        "CONCURRENCY": 2,
+        "CONCURRENCY_MAX": 4,
+        "ASYNC_CONCURRENCY": 16,
+        "COMMENT_MATCH": 1,
+    }
+    expected = export(server, tmp_path / "thread.json", ENGINE="thread", **overrides)
+    proc = run_script(
+        EXPORT_SCRIPTS / "jira-source-export-fast.py",
+        [tmp_path / "async.json"],
+        script_env(server, tmp_path, ENGINE="async", **overrides),
+    )
+    assert "adaptive concurrency: settled at" in proc.stdout
+    assert canonical(read_issues(str(tmp_path / "async.json"))) == canonical(expected)
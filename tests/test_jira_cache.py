@@ -0,0 +1,107 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+
+import pytest
+
+from conftest import EXPORT_SCRIPTS, FakeJira, canonical, export, run_script, script_env
+from jira_cache import ResponseCache
+from jira_http import cached_request_json
+
+CAP = 200 * 1024
+
+
+class FakeResponse:
+    def __init__(self, body, headers):
+        self.body = body
+        self.headers = headers
+
+
+def fill_cache(path, tag):
+    cache = ResponseCache(path, CAP)
+    for i in range(60):
+        cache.store(f"https://jira/{tag}/{i}", FakeResponse(os.urandom(8 * 1024), {"ETag": "x"}), None)
+    cache.close()
+
+
+def test_eviction_holds_cap_across_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(path, CAP).close()
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=fill_cache, args=(path, tag)) for tag in "ab"]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    total, rows = sqlite3.connect(path).execute("SELECT SUM(size), COUNT(*) FROM responses").fetchone()
+    assert 0 < total <= CAP
+    assert rows < 120
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    def response(tag):
+        return FakeResponse(json.dumps({"v": os.urandom(1000).hex()}).encode(), {"ETag": tag})
+
+    cache = ResponseCache(str(tmp_path / "cache.db"), CAP)
+    for i in range(3):
+        cache.store(f"u{i}", response(str(i)), None)
+    cache.max_bytes = cache.conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    cache.hit("u0", cache.lookup("u0"), None)
+    cache.store("u3", response("3"), None)
+    assert cache.lookup("u1") is None
+    assert cache.lookup("u0") is not None
+    assert cache.lookup("u3") is not None
+    assert cache.stats["evicted"] >= 1
+    cache.close()
+
+
+def test_unversioned_response_is_not_stored(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), CAP)
+    cache.store("u", FakeResponse(b"{}", {}), None)
+    assert cache.lookup("u") is None
+    assert cache.stats["fetched"] == 1
+    cache.close()
+
+
+@pytest.fixture(scope="module")
+def etag_jira():
+    server = FakeJira("--issues", "400", "--etag")
+    yield server
+    server.stop()
+
+
+def test_revalidation_and_fresh_hits(etag_jira, tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), CAP)
+    headers = {"Accept": "application/json"}
+    url = etag_jira.url + "/rest/api/3/issue/MGTT-1/comment"
+    params = {"startAt": 0, "maxResults": 100}
+    before = etag_jira.stats().get("comment", 0)
+
+    first = cached_request_json(cache, url, headers, params)
+    assert cached_request_json(cache, url, headers, params) == first
+    assert cached_request_json(cache, url, headers, params, updated="u1") == first
+    assert cached_request_json(cache, url, headers, params, updated="u1") == first
+
+    assert cache.stats == {"fresh": 1, "revalidated": 2, "fetched": 1, "evicted": 0}
+    assert etag_jira.stats()["comment"] - before == 3
+    cache.close()
+
+
+@pytest.mark.parametrize("script", ["jira-source-export-fast.py", "jira-source-export-activity.py"])
+def test_cached_rerun_matches_uncached_export(etag_jira, tmp_path, script):
+    overrides = {"COMMENT_MATCH": 1}
+    plain = export(etag_jira, tmp_path / "plain.json", script, **overrides)
+    cached = {"HTTP_CACHE": tmp_path / "cache.db", **overrides}
+    first = export(etag_jira, tmp_path / "first.json", script, **cached)
+    proc = run_script(
+        EXPORT_SCRIPTS / script, [tmp_path / "second.json"], script_env(etag_jira, tmp_path, **cached)
+    )
+    second = export(etag_jira, tmp_path / "third.json", script, HTTP_CACHE_MAX_MB=0.01, **cached)
+
+    assert plain
+    assert canonical(first) == canonical(plain)
+    assert canonical(second) == canonical(plain)
+    summary = proc.stdout.strip().splitlines()[-1]
+    assert summary.startswith("http cache:") and " 0 fetched" in summary
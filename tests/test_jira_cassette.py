@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import EXPORT_SCRIPTS, canonical, export, script_env
+from jira_cassette import Cassette, CassetteMiss, request_key
+
+
+def test_request_key_ignores_query_and_body_order():
+    assert request_key("get", "https://Jira.example.com/rest/api/3/search/?b=2&a=1") == request_key(
+        "GET", "https://jira.example.com/rest/api/3/search?a=1&b=2"
+    )
+    assert request_key("POST", "https://x/search", b'{"a": 1, "b": [2]}') == request_key(
+        "POST", "https://x/search", b'{"b":[2],"a":1}'
+    )
+    assert request_key("POST", "https://x/search", b'{"a": 1}') != request_key(
+        "POST", "https://x/search", b'{"a": 2}'
+    )
+
+
+def test_transient_responses_are_not_recorded(tmp_path):
+    cassette = Cassette(str(tmp_path / "c.db"), "auto")
+    cassette.put("GET", "https://x/a", None, 429, "Too Many Requests", {}, b"")
+    cassette.put("GET", "https://x/b", None, 200, "OK", {"Set-Cookie": "s=1", "ETag": "e"}, b"{}")
+    assert cassette.get("GET", "https://x/a") is None
+    status, _, headers, body = cassette.get("GET", "https://x/b")
+    assert (status, headers.get("ETag"), headers.get("Set-Cookie"), body) == (200, "e", None, b"{}")
+    cassette.close()
+
+    replay = Cassette(str(tmp_path / "c.db"), "replay")
+    with pytest.raises(CassetteMiss):
+        replay.get("GET", "https://x/a")
+    replay.close()
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_replay_matches_recording_without_server(start_fake_jira, tmp_path, engine):
+    server = start_fake_jira("--issues", "300")
+    cassette = tmp_path / "jira.cassette"
+    overrides = {"ENGINE": engine, "JIRA_CASSETTE": cassette, "MAX_RESULTS": 25}
+    recorded = export(server, tmp_path / "recorded.json", JIRA_CASSETTE_MODE="record", **overrides)
+    activity = export(
+        server,
+        tmp_path / "activity.json",
+        "jira-source-export-activity.py",
+        JIRA_CASSETTE_MODE="record",
+        **overrides,
+    )
+    server.stop()
+
+    replayed = export(server, tmp_path / "replayed.json", JIRA_CASSETTE_MODE="replay", **overrides)
+    replayed_activity = export(
+        server,
+        tmp_path / "replayed-activity.json",
+        "jira-source-export-activity.py",
+        JIRA_CASSETTE_MODE="replay",
+        **overrides,
+    )
+    assert recorded
+    assert canonical(replayed) == canonical(recorded)
+    assert canonical(replayed_activity) == canonical(activity)
+
+    env = script_env(server, tmp_path, JIRA_CASSETTE_MODE="replay", END_DATE="2025/05/01", **overrides)
+    proc = subprocess.run(
+        [sys.executable, str(EXPORT_SCRIPTS / "jira-source-export-fast.py"), str(tmp_path / "miss.json")],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode != 0
+    assert "is not in cassette" in proc.stderr
@@ -0,0 +1,101 @@
+from collections import deque
+
+import pytest
+
+from conftest import EXPORT_SCRIPTS, load_script, run_script
+from jira_graph import Graph, infer_project_key, load_graph, write_graph
+
+traverse_local = load_script(EXPORT_SCRIPTS / "jira-traverse-local.py")
+
+
+def dict_traverse(index, root_key, max_depth):
+    # The dict-based traversal jira-traverse-local.py used before the CSR index.
+    results = []
+    missing = set()
+    visited = {root_key}
+    queue = deque([(root_key, 0)])
+    while queue:
+        current, depth = queue.popleft()
+        issue = index.get(current)
+        if not issue:
+            missing.add(current)
+            continue
+        if depth >= max_depth:
+            continue
+        rels = []
+        if issue.get("parent_key"):
+            rels.append((issue["parent_key"], "parent"))
+        for link in issue.get("issuelinks", []) or []:
+            if link.get("issue_key"):
+                rels.append((link["issue_key"], "relates"))
+        for nxt, relation in rels:
+            if nxt in visited:
+                continue
+            visited.add(nxt)
+            to_project_key = (index.get(nxt) or {}).get("project_key")
+            if not to_project_key:
+                to_project_key = infer_project_key(nxt)
+                if nxt not in index:
+                    missing.add(nxt)
+            results.append(
+                {
+                    "from_key": current,
+                    "to_key": nxt,
+                    "relation_type": relation,
+                    "to_project_key": to_project_key,
+                    "depth": depth + 1,
+                }
+            )
+            queue.append((nxt, depth + 1))
+    return results, missing
+
+
+@pytest.fixture(scope="module")
+def source(full_export, tmp_path_factory):
+    out, issues = full_export
+    graph_path = tmp_path_factory.mktemp("graph") / "jira-source.jgraph"
+    write_graph(issues, str(graph_path))
+    return out, graph_path, issues
+
+
+def test_csr_traversal_matches_dict_traversal(source):
+    _, graph_path, issues = source
+    index = {item["issue_key"]: item for item in issues}
+    graph = Graph.open(str(graph_path))
+    roots = sorted(index) + ["ZZZ-1"]
+    linked = 0
+    for root in roots:
+        for depth in (1, 5):
+            assert traverse_local.traverse(graph, root, depth) == dict_traverse(index, root, depth)
+        linked += bool(dict_traverse(index, root, 5)[0])
+    assert linked
+
+
+def test_compiled_graph_keeps_issue_fields(source):
+    _, graph_path, issues = source
+    graph = load_graph(str(graph_path))
+    for item in issues:
+        node = graph.get(item["issue_key"])
+        assert node["summary"] == (item.get("summary") or "")
+        assert node["project_key"] == item["project_key"]
+        assert node["parent_key"] == item.get("parent_key")
+        assert [link["issue_key"] for link in node["issuelinks"]] == [
+            link["issue_key"] for link in item.get("issuelinks", []) if link.get("issue_key")
+        ]
+
+
+def test_traverse_cli_same_for_json_and_jgraph(source, tmp_path):
+    source_json, graph_path, issues = source
+    batch = tmp_path / "roots.txt"
+    batch.write_text("\n".join(item["issue_key"] for item in issues) + "\n")
+    outputs = []
+    for path in (source_json, graph_path):
+        csv_out = tmp_path / (path.suffix[1:] + ".csv")
+        missing_out = tmp_path / (path.suffix[1:] + ".missing")
+        run_script(
+            EXPORT_SCRIPTS / "jira-traverse-local.py",
+            [path, "-", "--batch-file", batch, "--csv-output", csv_out, "--missing-output", missing_out],
+            {},
+        )
+        outputs.append((csv_out.read_text(), missing_out.read_text()))
+    assert outputs[0] == outputs[1]
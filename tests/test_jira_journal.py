@@ -0,0 +1,118 @@
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import EXPORT_SCRIPTS, canonical, export, run_script, script_env
+from jira_journal import MISSING, ExportJournal, journal_from_env, journaled
+
+PARAMS = {"jql": "updated >= 2025/01/01", "fields": ["summary"]}
+
+
+def steps(value, calls):
+    calls.append(value)
+    return value
+    yield
+
+
+def test_journaled_replays_after_reopen(tmp_path):
+    path = str(tmp_path / "out.json.journal")
+    calls = []
+    with pytest.raises(RuntimeError):
+        with ExportJournal(path, PARAMS) as journal:
+            assert list(journaled(journal, "page", {"start": 0}, steps([1, 2], calls))) == []
+            raise RuntimeError("killed")
+
+    journal = ExportJournal(path, PARAMS)
+    assert journal.resumed == 1
+    result = journaled(journal, "page", {"start": 0}, steps([9], calls))
+    with pytest.raises(StopIteration) as stop:
+        next(result)
+    assert stop.value.value == [1, 2]
+    assert calls == [[1, 2]]
+    assert journal.get("page", {"start": 100}) is MISSING
+    journal.finish()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_put_is_not_kept_in_memory(tmp_path):
+    journal = ExportJournal(str(tmp_path / "j"), PARAMS)
+    journal.put("issues", ["MGTT-1"], [{"issue_key": "MGTT-1"}])
+    assert journal.entries == {}
+    assert journal.get("issues", ["MGTT-1"]) is MISSING
+    assert journal.recorded == 1
+    journal.close()
+    assert ExportJournal(str(tmp_path / "j"), PARAMS).get("issues", ["MGTT-1"]) == [{"issue_key": "MGTT-1"}]
+
+
+def test_torn_tail_and_changed_settings(tmp_path):
+    path = tmp_path / "j"
+    journal = ExportJournal(str(path), PARAMS)
+    journal.put("keys", "a", ["MGTT-1"])
+    journal.put("keys", "b", ["MGTT-2"])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write('{"kind": "keys", "key": "c", "val')
+
+    assert ExportJournal(str(path), PARAMS).resumed == 2
+    assert ExportJournal(str(path), {**PARAMS, "fields": ["status"]}).resumed == 0
+    assert ExportJournal(str(path), PARAMS).resumed == 0
+
+
+def test_journal_from_env_is_opt_in(tmp_path):
+    output = str(tmp_path / "out.json")
+    assert journal_from_env(output, PARAMS, {"EXPORT_JOURNAL": "0"}.get) is None
+    journal = journal_from_env(output, PARAMS, {"EXPORT_JOURNAL": "1"}.get)
+    assert journal.path == output + ".journal"
+    journal.finish()
+
+
+def kill_when_journaled(server, out, script, min_entries, overrides):
+    env = script_env(server, out.parent, EXPORT_JOURNAL=1, **overrides)
+    proc = subprocess.Popen(
+        [sys.executable, str(EXPORT_SCRIPTS / script), str(out)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    journal = out.parent / (out.name + ".journal")
+    deadline = time.monotonic() + 60
+    try:
+        while time.monotonic() < deadline and proc.poll() is None:
+            if journal.exists() and len(journal.read_text(encoding="utf-8").splitlines()) > min_entries:
+                break
+            time.sleep(0.02)
+    finally:
+        proc.kill()
+        proc.wait()
+    assert proc.returncode < 0, "export finished before it could be killed"
+    return journal
+
+
+@pytest.mark.parametrize(
+    "script, overrides",
+    [
+        ("jira-source-export-fast.py", {"MATCH_MODE": "both", "COMMENT_MATCH": 1}),
+        ("jira-source-export-fast.py", {"COMMENT_MATCH": 1, "ENGINE": "async"}),
+        ("jira-source-export-activity.py", {}),
+    ],
+)
+def test_resume_after_kill(start_fake_jira, tmp_path, script, overrides):
+    server = start_fake_jira("--issues", "400", "--latency", "40")
+    overrides = {"CONCURRENCY": 2, "ASYNC_CONCURRENCY": 2, "MAX_RESULTS": 10, **overrides}
+    full = export(server, tmp_path / "full.json", script, **overrides)
+
+    out = tmp_path / "resumed.json"
+    journal = kill_when_journaled(server, out, script, 3, overrides)
+    assert not out.exists()
+    header = json.loads(journal.read_text(encoding="utf-8").splitlines()[0])
+    assert "fingerprint" in header
+
+    proc = run_script(
+        EXPORT_SCRIPTS / script, [out], script_env(server, tmp_path, EXPORT_JOURNAL=1, **overrides)
+    )
+    assert "journal: resuming with" in proc.stdout
+    assert not journal.exists()
+    assert canonical(json.loads(out.read_text(encoding="utf-8"))) == canonical(full)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from conftest import canonical, export
+from jira_records import IssueWriter, output_format, read_issues, write_issues
+
+ISSUES = [
+    {"issue_key": "MGTT-1", "summary": "배포 자동화", "issuelinks": [{"issue_key": "ITPT-9"}]},
+    {"issue_key": "MGTT-2", "summary": "line\nbreak \"quoted\"", "parent_key": "MGTT-1"},
+    {"issue_key": "MGTT-1", "summary": "duplicate"},
+    {"issue_key": "ITPT-9", "summary": "", "issuelinks": []},
+]
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_writer_round_trip(tmp_path, fmt, ensure_ascii):
+    path = str(tmp_path / f"issues.{fmt}")
+    assert write_issues(path, ISSUES, fmt, ensure_ascii=ensure_ascii) == 3
+    assert read_issues(path) == [ISSUES[0], ISSUES[1], ISSUES[3]]
+    if fmt == "json":
+        with open(path, encoding="utf-8") as handle:
+            assert json.load(handle) == read_issues(path)
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_writer_limit_and_empty(tmp_path, fmt):
+    path = str(tmp_path / "limited")
+    with IssueWriter(path, fmt, limit=2) as writer:
+        writer.write_many(ISSUES)
+        assert writer.full
+    assert [item["issue_key"] for item in read_issues(path)] == ["MGTT-1", "MGTT-2"]
+
+    empty = str(tmp_path / "empty")
+    write_issues(empty, [], fmt)
+    assert read_issues(empty) == []
+
+
+def test_json_writer_abort_leaves_no_output(tmp_path):
+    path = tmp_path / "aborted.json"
+    with pytest.raises(RuntimeError):
+        with IssueWriter(str(path)) as writer:
+            writer.write(ISSUES[0])
+            raise RuntimeError("boom")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_output_format():
+    assert output_format("out.ndjson") == "ndjson"
+    assert output_format("out.jsonl") == "ndjson"
+    assert output_format("out.json") == "json"
+    assert output_format("out.json", "NDJSON") == "ndjson"
+    with pytest.raises(SystemExit):
+        output_format("out.json", "csv")
+
+
+@pytest.mark.parametrize("script", ["jira-source-export-fast.py", "jira-source-export-activity.py"])
+def test_ndjson_export_matches_json_export(fake_jira, tmp_path, script):
+    as_json = export(fake_jira, tmp_path / "out.json", script)
+    as_ndjson = export(fake_jira, tmp_path / "out.ndjson", script)
+    assert as_json
+    assert canonical(as_ndjson) == canonical(as_json)
+    lines = (tmp_path / "out.ndjson").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(as_json)
@@ -0,0 +1,53 @@
+import datetime as dt
+
+from conftest import canonical, export
+from jira_store import IssueStore, format_utc, parse_timestamp
+
+
+def test_upsert_and_window(tmp_path):
+    store = IssueStore(str(tmp_path / "issues.db"))
+    store.upsert(
+        [
+            ({"issue_key": "MGTT-2", "project_key": "MGTT"}, "2025-01-05T09:00:00.000+0900"),
+            ({"issue_key": "MGTT-1", "project_key": "MGTT"}, "2025-01-10T00:00:00.000+0000"),
+            ({"issue_key": "ITPT-1", "project_key": "ITPT"}, "2025-01-06T00:00:00.000+0000"),
+            ({"project_key": "MGTT"}, "2025-01-06T00:00:00.000+0000"),
+        ]
+    )
+    store.upsert([({"issue_key": "MGTT-2", "project_key": "MGTT", "title": "new"}, "2025-02-01T00:00:00.000+0000")])
+
+    window = store.window(["MGTT"], "2025-01-01T00:00:00.000+0000", "2025-01-31T00:00:00.000+0000")
+    assert [item["issue_key"] for item in window] == ["MGTT-1"]
+    assert store.get_many(["MGTT-2", "NOPE-1"]) == {
+        "MGTT-2": {"issue_key": "MGTT-2", "project_key": "MGTT", "title": "new"}
+    }
+    assert store.updated_many(["MGTT-1"]) == {"MGTT-1": "2025-01-10T00:00:00.000+0000"}
+    store.close()
+
+
+def test_sync_state_round_trip(tmp_path):
+    store = IssueStore(str(tmp_path / "issues.db"))
+    assert store.sync_state("MGTT") == (None, None)
+    since = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+    watermark = parse_timestamp("2025-03-01T12:30:00.250+0900")
+    store.set_sync_state("MGTT", since, watermark)
+    assert store.sync_state("MGTT") == (since, watermark)
+    assert format_utc(watermark) == "2025-03-01T03:30:00.250+0000"
+    store.close()
+
+
+def test_store_export_matches_live_export(fake_jira, tmp_path):
+    def searches():
+        return fake_jira.stats().get("search", 0)
+
+    live = export(fake_jira, tmp_path / "live.json")
+    store = tmp_path / "issues.db"
+    start = searches()
+    first = export(fake_jira, tmp_path / "first.json", ISSUE_STORE=store)
+    synced = searches()
+    second = export(fake_jira, tmp_path / "second.json", ISSUE_STORE=store)
+
+    assert live
+    assert canonical(first) == canonical(live)
+    assert canonical(second) == canonical(live)
+    assert searches() - synced < synced - start
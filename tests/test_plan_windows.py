@@ -0,0 +1,130 @@
+import datetime as dt
+
+import pytest
+
+from conftest import REPORT_SCRIPTS, export, export_seed_csv, load_script, read_ranges, run_script, script_env
+
+PLANNER = REPORT_SCRIPTS / "jira-plan-windows.py"
+planner = load_script(PLANNER)
+
+
+def plan(server, tmp_path, *args, end="2025/07/01"):
+    out = tmp_path / "ranges.txt"
+    env_file = tmp_path / ".env"
+    env_file.write_text("", encoding="utf-8")
+    proc = run_script(
+        PLANNER,
+        [
+            *("--start", "2025/01/01", "--end", end, "--out", out),
+            *("--env-file", env_file, "--projects", "MGTT,ITPT"),
+            *args,
+        ],
+        script_env(server, tmp_path),
+    )
+    counts = {}
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if line.startswith("  ") and len(parts) == 3:
+            counts[(parts[0], parts[1])] = int(parts[2])
+    ranges = read_ranges(out)
+    assert list(counts) == ranges
+    assert ranges[0][0] == "2025/01/01" and ranges[-1][1] == end
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    return counts
+
+
+@pytest.mark.parametrize("match_mode", ["any", "assignee", "comment"])
+def test_window_counts_match_exported_population(fake_jira, tmp_path, match_mode):
+    weekly = plan(
+        fake_jira, tmp_path, "--match-mode", match_mode, "--target", 100000, "--max-days", 7, end="2025/04/01"
+    )
+    assert any(count for count in weekly.values())
+    for (start, end), count in weekly.items():
+        issues = export(
+            fake_jira, tmp_path / "window.json", START_DATE=start, END_DATE=end, MATCH_MODE=match_mode
+        )
+        assert len(issues) == count, (start, end)
+
+    # Assignee history overlaps windows, so a merged window's summed count is an upper bound.
+    merged = plan(fake_jira, tmp_path, "--match-mode", match_mode, "--target", 40, end="2025/04/01")
+    for (start, end), count in merged.items():
+        issues = export(
+            fake_jira, tmp_path / "window.json", START_DATE=start, END_DATE=end, MATCH_MODE=match_mode
+        )
+        assert len(issues) <= count, (start, end)
+
+
+def test_dense_windows_are_split_to_target(fake_jira, tmp_path):
+    weekly = plan(fake_jira, tmp_path, "--match-mode", "comment", "--target", 100000, "--max-days", 7)
+    dense = plan(fake_jira, tmp_path, "--match-mode", "comment", "--target", 6)
+    assert max(weekly.values()) > 6
+    assert len(dense) > len(weekly)
+    assert sum(dense.values()) == sum(weekly.values())
+    for (start, end), count in dense.items():
+        one_day = dt.datetime.strptime(end, "%Y/%m/%d") - dt.datetime.strptime(start, "%Y/%m/%d")
+        assert count <= 6 or one_day == dt.timedelta(days=1)
+
+
+@pytest.mark.parametrize("mode", ["dev", "plan_qa"])
+def test_seed_counts_match_partition(fake_jira, tmp_path, mode):
+    csv_path = export_seed_csv(fake_jira, tmp_path / "seed.csv")
+    counts = plan(fake_jira, tmp_path, "--seed-csv", csv_path, "--seed-mode", mode, "--target", 10)
+    assert sum(counts.values())
+    partition = tmp_path / "partition"
+    run_script(
+        REPORT_SCRIPTS / "jira-seed-from-csv.py",
+        [
+            *("--csv", csv_path, "--mode", mode, "--projects", "MGTT,ITPT"),
+            *("--ranges-file", tmp_path / "ranges.txt", "--partition-dir", partition),
+        ],
+        script_env(fake_jira, tmp_path),
+    )
+    for (start, end), count in counts.items():
+        keys_file = partition / f"week-{start.replace('/', '')}-{end.replace('/', '')}" / "seed-keys.txt"
+        assert len(keys_file.read_text(encoding="utf-8").split()) == count
+
+
+def day_counter(days):
+    counter = object.__new__(planner.SeedCounter)
+    counter.days = {dt.date(2025, 1, day): set(keys) for day, keys in days.items()}
+    counter.counts = {}
+    return counter
+
+
+def window(start, end):
+    return dt.date(2025, 1, start), dt.date(2025, 1, end)
+
+
+def test_refine_bisects_only_dense_windows():
+    counter = day_counter({1: "ab", 2: "cd", 3: "e", 9: "f"})
+    windows = planner.refine(counter, [window(1, 5), window(5, 13)], 2)
+    assert windows == [window(1, 2), window(2, 3), window(3, 5), window(5, 13)]
+    assert [counter.counts[w] for w in windows] == [2, 2, 1, 1]
+
+
+def test_refine_keeps_single_day_windows_over_target():
+    counter = day_counter({1: "abc"})
+    assert planner.refine(counter, [window(1, 3)], 1) == [window(1, 2), window(2, 3)]
+
+
+def test_merge_sparse_respects_target_and_max_days():
+    windows = [window(1, 3), window(3, 5), window(5, 7), window(7, 9)]
+    counts = dict(zip(windows, [1, 1, 3, 1]))
+    assert planner.merge_sparse(windows, counts, 3, 30) == [
+        (window(1, 5), 2),
+        (window(5, 7), 3),
+        (window(7, 9), 1),
+    ]
+    assert planner.merge_sparse(windows, dict.fromkeys(windows, 0), 3, 4) == [
+        (window(1, 5), 0),
+        (window(5, 9), 0),
+    ]
+
+
+def test_merge_sparse_counts_keys_spanning_windows_once():
+    # "a" and "b" have rows on both days: summing says 4, the union is 2.
+    counter = day_counter({1: "ab", 3: "ab"})
+    windows = [window(1, 3), window(3, 5)]
+    counter.count(windows)
+    assert planner.merge_sparse(windows, counter.counts, 2, 30) == [(window(1, 3), 2), (window(3, 5), 2)]
+    assert planner.merge_sparse(windows, counter.counts, 2, 30, counter.count_one) == [(window(1, 5), 2)]
@@ -0,0 +1,109 @@
+import datetime as dt
+import json
+
+import pytest
+
+from conftest import REPORT_SCRIPTS, export_seed_csv, load_script, run_script, script_env
+
+SEED = REPORT_SCRIPTS / "jira-seed-from-csv.py"
+seed_module = load_script(SEED)
+RANGES = [
+    ("2025/01/01", "2025/01/20"),
+    ("2025/01/20", "2025/02/01"),
+    ("2025/02/01", "2025/04/01"),
+    ("2025/05/01", "2025/05/08"),
+    ("2025/05/08", "2026/01/01"),
+]
+
+
+@pytest.fixture(scope="module")
+def seed_csv(fake_jira, tmp_path_factory):
+    return export_seed_csv(fake_jira, tmp_path_factory.mktemp("seed") / "seed.csv")
+
+
+def seed(server, tmp_path, *args):
+    return run_script(SEED, ["--csv", *args], script_env(server, tmp_path))
+
+
+def read_keys(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+@pytest.mark.parametrize("mode", ["dev", "plan_qa"])
+def test_partition_matches_single_window_runs(fake_jira, tmp_path, seed_csv, mode):
+    ranges_file = tmp_path / "ranges.txt"
+    ranges_file.write_text("".join(f"{start} {end}\n" for start, end in reversed(RANGES)))
+    partition = tmp_path / "partition"
+    seed(
+        fake_jira,
+        tmp_path,
+        *(seed_csv, "--mode", mode, "--projects", "MGTT,ITPT"),
+        *("--ranges-file", ranges_file, "--partition-dir", partition),
+    )
+
+    total = 0
+    for start, end in RANGES:
+        single = tmp_path / "single.txt"
+        seed(
+            fake_jira,
+            tmp_path,
+            *(seed_csv, "--mode", mode, "--projects", "MGTT,ITPT"),
+            *("--start", start, "--end", end, "--out-keys", single),
+        )
+        window = partition / f"week-{start.replace('/', '')}-{end.replace('/', '')}"
+        assert read_keys(window / "seed-keys.txt") == read_keys(single)
+        assert sorted(path.name for path in window.iterdir()) == ["seed-keys.txt"]
+        total += len(read_keys(single))
+    assert total
+
+
+def test_single_window_merge_map(fake_jira, tmp_path, seed_csv):
+    keys = tmp_path / "keys.txt"
+    merge = tmp_path / "merge.json"
+    seed(
+        fake_jira,
+        tmp_path,
+        *(seed_csv, "--start", "2025/01/01", "--end", "2026/01/01"),
+        *("--out-keys", keys, "--out-merge", merge),
+    )
+    merge_map = json.loads(merge.read_text(encoding="utf-8"))
+    assert merge_map
+    assert set(merge_map) <= set(read_keys(keys))
+
+
+def test_partition_flags_must_be_paired(fake_jira, tmp_path, seed_csv):
+    with pytest.raises(AssertionError, match="must be used together"):
+        seed(fake_jira, tmp_path, seed_csv, "--ranges-file", tmp_path / "ranges.txt")
+
+
+@pytest.mark.parametrize("state", ["MERGED", "merged", "Merged"])
+def test_merge_state_is_case_insensitive(state):
+    overall = {"state": state, "lastUpdated": "2025-01-02T03:04:05.000+0000"}
+    field = "{pullrequest={dataType=pullrequest, state=%s}, json=%s}" % (
+        state,
+        json.dumps({"cachedValue": {"summary": {"pullrequest": {"overall": overall}}}}),
+    )
+    assert seed_module.extract_merge_last_updated(field) == overall["lastUpdated"]
+    assert seed_module.extract_merge_last_updated(field.replace(state, "OPEN")) == ""
+
+
+def test_window_for_uses_half_open_ranges(tmp_path):
+    ranges = tmp_path / "ranges.txt"
+    ranges.write_text("\n".join(f"{start} {end}" for start, end in reversed(RANGES)) + "\n", encoding="utf-8")
+    windows = seed_module.read_ranges(ranges)
+    starts = [window.start_date for window in windows]
+
+    def lookup(day):
+        window = seed_module.window_for(windows, starts, dt.datetime.strptime(day, "%Y/%m/%d").date())
+        return window and window.start_date.strftime("%Y/%m/%d")
+
+    assert lookup("2024/12/31") is None
+    assert lookup("2025/01/01") == "2025/01/01"
+    assert lookup("2025/01/19") == "2025/01/01"
+    assert lookup("2025/01/20") == "2025/01/20"
+    assert lookup("2025/03/31") == "2025/02/01"
+    assert lookup("2025/04/01") is None
+    assert lookup("2025/04/30") is None
+    assert lookup("2025/05/08") == "2025/05/08"
+    assert lookup("2025/12/31") == "2025/05/08"
+    assert lookup("2026/01/01") is None
@@ -0,0 +1,104 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import REPORT_SCRIPTS, load_script
+from jira_graph import Graph, infer_project_key
+
+traverse_root = load_script(REPORT_SCRIPTS / "jira-traverse-root-itpt.py")
+
+
+def test_stale_key_only_costs_its_own_lookup(fake_jira, full_export):
+    _, issues = full_export
+    keys = [item["issue_key"] for item in issues][:99] + ["MGTT-999999"]
+    before = fake_jira.stats()
+    cache = {}
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        traverse_root.resolve_issue_ids(keys, fake_jira.url, {}, 30, cache, pool)
+    after = fake_jira.stats()
+
+    assert sorted(cache) == sorted(keys[:99])
+    assert all(cache.values())
+    assert after.get("issue", 0) == before.get("issue", 0)
+    assert after["search"] - before["search"] <= 2 * 7 + 1
+
+
+def find_first_itpt(index, root_key, max_depth):
+    # The per-root BFS jira-traverse-root-itpt.py ran before label_nearest_itpt.
+    root_project = (index.get(root_key) or {}).get("project_key") or infer_project_key(root_key)
+    if root_project == "ITPT":
+        return root_key, "", "self", 0
+    visited = {root_key}
+    queue = deque([(root_key, 0)])
+    while queue:
+        current, depth = queue.popleft()
+        if depth >= max_depth or current not in index:
+            continue
+        issue = index[current]
+        rels = [(issue["parent_key"], "parent")] if issue.get("parent_key") else []
+        rels += [(link["issue_key"], "relates") for link in issue.get("issuelinks") or [] if link.get("issue_key")]
+        for nxt, relation in rels:
+            if nxt in visited:
+                continue
+            visited.add(nxt)
+            if ((index.get(nxt) or {}).get("project_key") or infer_project_key(nxt)) == "ITPT":
+                return nxt, current, relation, depth + 1
+            queue.append((nxt, depth + 1))
+    return "", "", "", ""
+
+
+def nearest_rows(issues, max_depth):
+    graph = Graph.from_issues(issues)
+    labels = traverse_root.label_nearest_itpt(graph, max_depth)
+    rows = {}
+    for key in graph.keys:
+        row = traverse_root.nearest_itpt_row(graph, key, labels)
+        rows[key] = (row["upper_key"], row["from_key"], row["relation_type"], row["depth"])
+    return rows
+
+
+def expected_rows(issues, max_depth):
+    index = {issue["issue_key"]: issue for issue in issues}
+    return {key: find_first_itpt(index, key, max_depth) for key in Graph.from_issues(issues).keys}
+
+
+def issue(key, parent=None, links=()):
+    return {
+        "issue_key": key,
+        "project_key": key.split("-")[0],
+        "parent_key": parent,
+        "issuelinks": [{"issue_key": link} for link in links],
+    }
+
+
+SMALL = [
+    issue("MGTT-1", parent="MGTT-2", links=["MGTT-3"]),
+    issue("MGTT-2", links=["ITPT-1"]),
+    issue("MGTT-3", links=["ITPT-2"]),
+    issue("MGTT-4", links=["MGTT-5", "MGTT-1"]),
+    issue("MGTT-5", parent="ITPT-9"),
+    issue("MGTT-6", links=["MGTT-7"]),
+    issue("MGTT-7", links=["MGTT-8"]),
+    issue("MGTT-8", links=["MGTT-9"]),
+    issue("MGTT-9", parent="ITPT-1"),
+    issue("MGTT-10", links=["MGTT-6"]),
+    issue("ITPT-1", links=["MGTT-1"]),
+    issue("ITPT-2"),
+]
+
+
+def test_nearest_itpt_labels_small_graph():
+    rows = nearest_rows(SMALL, 4)
+    assert rows == expected_rows(SMALL, 4)
+    assert rows["MGTT-1"] == ("ITPT-1", "MGTT-2", "relates", 2)
+    assert rows["MGTT-4"] == ("ITPT-9", "MGTT-5", "parent", 2)
+    assert rows["MGTT-6"] == ("ITPT-1", "MGTT-9", "parent", 4)
+    assert rows["MGTT-10"] == ("", "", "", "")
+    assert rows["ITPT-9"] == ("ITPT-9", "", "self", 0)
+
+
+@pytest.mark.parametrize("max_depth", [1, 2, 4])
+def test_nearest_itpt_labels_match_per_root_bfs(full_export, max_depth):
+    _, issues = full_export
+    assert nearest_rows(issues, max_depth) == expected_rows(issues, max_depth)